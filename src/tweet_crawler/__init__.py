@@ -1,17 +1,53 @@
+from .accounts import AccountPool, load_accounts
+from .cache import ResponseCache
 from .crawler import (
+    ResourceFilter,
+    TwitterCountersCrawler,
     TwitterFollowersCrawler,
     TwitterFollowingCrawler,
     TwitterStatusCrawler,
 )
-from .exception import NotAuthenticated, TwitterException
+from .decoder import Decoder
+from .exception import (
+    CrawlCancelled,
+    CrawlTimeout,
+    NotAuthenticated,
+    RateLimited,
+    TwitterException,
+)
+from .metrics import CrawlMetrics, MetricsRecorder
 from .model import Tweet, TwitterUser
+from .pool import CrawlerPool
+from .ratelimit import RateLimiter
+from .sink import JsonlSink
+from .snapshot import FollowerSnapshot
+from .store import TweetStore
+from .watch import CounterDelta, TweetWatcher
 
 __all__ = [
     "TwitterFollowersCrawler",
     "TwitterFollowingCrawler",
     "TwitterStatusCrawler",
+    "TwitterCountersCrawler",
+    "CrawlerPool",
+    "AccountPool",
+    "load_accounts",
+    "ResourceFilter",
+    "ResponseCache",
+    "RateLimiter",
+    "MetricsRecorder",
+    "CrawlMetrics",
+    "FollowerSnapshot",
+    "JsonlSink",
+    "TweetStore",
+    "TweetWatcher",
+    "CounterDelta",
+    "Decoder",
     "TwitterException",
     "NotAuthenticated",
+    "RateLimited",
+    "CrawlCancelled",
+    "CrawlTimeout",
     "Tweet",
     "TwitterUser",
 ]
@@ -0,0 +1,306 @@
+import asyncio
+import json
+import math
+import os
+import time
+from concurrent.futures import Executor
+from contextlib import aclosing, asynccontextmanager
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from playwright.async_api import Browser, Page
+from typing_extensions import Self
+
+from .crawler._base import BLANK_URL, CrawlerBase, ScrollableCrawler
+from .crawler.resource import ResourceFilter
+from .exception import NotAuthenticated, RateLimited, TwitterException
+from .metrics import MetricsRecorder
+from .pool import CrawlerPool, PoolSlot
+from .ratelimit import RateLimiter
+from .sink import JsonlSink
+from .store import TweetStore
+
+_T = TypeVar("_T")
+
+
+def account_cookies(
+    auth_token: str, ct0: str, expires: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """The ``auth_token`` and ``ct0`` cookies of a logged-in x.com session."""
+    cookies: List[Dict[str, Any]] = [
+        {
+            "name": "auth_token",
+            "value": auth_token,
+            "domain": ".x.com",
+            "path": "/",
+            "httpOnly": True,
+            "sameSite": "None",
+            "secure": True,
+        },
+        {
+            "name": "ct0",
+            "value": ct0,
+            "domain": ".x.com",
+            "path": "/",
+            "httpOnly": False,
+            "sameSite": "Lax",
+            "secure": True,
+        },
+    ]
+    if expires is not None:
+        for cookie in cookies:
+            cookie["expires"] = expires
+    return cookies
+
+
+def load_accounts(path: Union[str, os.PathLike]) -> Dict[str, List[Dict[str, Any]]]:
+    """Read cookie sets from a JSON file mapping account names to either
+    ``{"auth_token": ..., "ct0": ..., "expires": ...}`` or a list of cookies.
+    """
+    with open(path, "rb") as f:
+        data = json.load(f)
+    return {
+        name: value if isinstance(value, list) else account_cookies(**value)
+        for name, value in data.items()
+    }
+
+
+class Account:
+    name: str
+    cookies: List[Dict[str, Any]]
+    slots: List[PoolSlot]
+    idle: List[PoolSlot]
+    quarantined_until: float
+    crawls: int
+    failures: int
+
+    def __init__(self, name: str, cookies: Sequence[Dict[str, Any]]):
+        self.name = name
+        self.cookies = list(cookies)
+        self.slots = []
+        self.idle = []
+        self.quarantined_until = 0.0
+        self.crawls = 0
+        self.failures = 0
+
+    @property
+    def quarantined(self) -> bool:
+        return time.time() < self.quarantined_until
+
+
+class AccountPool(CrawlerPool):
+    """A ``CrawlerPool`` spreading crawls over several logged-in accounts.
+
+    Every account gets its own ``BrowserContext`` with ``pages_per_account``
+    pages. New crawls go to the account with the most rate limit budget left
+    for the crawler's endpoint, as tracked by the shared ``rate_limiter``. An
+    account that raises ``NotAuthenticated`` is taken out of rotation
+    for ``quarantine_time`` seconds, one that is ``RateLimited`` until the
+    limit resets, and the crawl is retried on another account. An account
+    whose context dies is quarantined for good.
+    """
+
+    accounts: Dict[str, Account]
+    pages_per_account: int
+    quarantine_time: float
+    rate_limiter: RateLimiter
+
+    _available: asyncio.Condition
+
+    def __init__(
+        self,
+        browser: Browser,
+        accounts: Mapping[str, Sequence[Dict[str, Any]]],
+        pages_per_account: int = 1,
+        quarantine_time: float = 3600.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        resource_filter: Optional[ResourceFilter] = None,
+        recorder: Optional[MetricsRecorder] = None,
+        executor: Optional[Executor] = None,
+        sink: Optional[JsonlSink] = None,
+        store: Optional[TweetStore] = None,
+        **context_options: Any,
+    ):
+        if not accounts or pages_per_account < 1:
+            raise ValueError("AccountPool needs at least one account and page")
+        super().__init__(
+            browser,
+            size=len(accounts) * pages_per_account,
+            resource_filter=resource_filter,
+            rate_limiter=rate_limiter or RateLimiter(),
+            recorder=recorder,
+            executor=executor,
+            sink=sink,
+            store=store,
+            **context_options,
+        )
+        self.accounts = {name: Account(name, c) for name, c in accounts.items()}
+        self.pages_per_account = pages_per_account
+        self.quarantine_time = quarantine_time
+        self._available = asyncio.Condition()
+
+    async def _start_account(self, account: Account) -> None:
+        context = await self.browser.new_context(**self.context_options)
+        await context.add_cookies(account.cookies)  # type: ignore
+        account.slots = [
+            PoolSlot(context, await self._new_page(context))
+            for _ in range(self.pages_per_account)
+        ]
+        account.idle = list(account.slots)
+
+    async def start(self) -> Self:
+        if self._slots:
+            return self
+        await asyncio.gather(*map(self._start_account, self.accounts.values()))
+        self._slots = [s for a in self.accounts.values() for s in a.slots]
+        return self
+
+    async def close(self) -> None:
+        for account in self.accounts.values():
+            if account.slots:
+                await account.slots[0].context.close()
+            account.slots, account.idle = [], []
+        self._slots.clear()
+
+    async def _reset(
+        self, slot: PoolSlot, account: Optional[Account] = None
+    ) -> PoolSlot:
+        try:
+            if slot.page.is_closed():
+                slot.page = await self._new_page(slot.context)
+            else:
+                await slot.page.goto(BLANK_URL)
+        except Exception:
+            try:
+                slot.page = await self._new_page(slot.context)
+            except Exception:
+                # The context is gone, and with it every page of the account.
+                if account is not None:
+                    self.quarantine(account, math.inf)
+        return slot
+
+    def quarantine(self, account: Account, until: Optional[float] = None) -> None:
+        if until is None:
+            until = time.time() + self.quarantine_time
+        account.failures += 1
+        account.quarantined_until = max(account.quarantined_until, until)
+
+    def _choose(self, endpoint: Optional[str]) -> Optional[Account]:
+        candidates = [a for a in self.accounts.values() if a.idle and not a.quarantined]
+        if not candidates:
+            return None
+
+        def rank(account: Account) -> Tuple[float, int, int]:
+            budget = (
+                self.rate_limiter.budget(account.name)
+                if endpoint is None
+                else self.rate_limiter.bucket(endpoint, account.name).budget
+            )
+            return budget, len(account.idle), -account.crawls
+
+        return max(candidates, key=rank)
+
+    @asynccontextmanager
+    async def lease_account(
+        self, endpoint: Optional[str] = None
+    ) -> AsyncGenerator[Tuple[Account, Page], None]:
+        if not self._slots:
+            raise RuntimeError("AccountPool is not started")
+        async with self._available:
+            while (account := self._choose(endpoint)) is None:
+                # Wake up when a page is returned or a quarantine ends.
+                quarantined = [
+                    a.quarantined_until for a in self.accounts.values() if a.quarantined
+                ]
+                timeout = None
+                if quarantined:
+                    if len(quarantined) == len(self.accounts):
+                        if min(quarantined) == math.inf:
+                            raise TwitterException("Every account is quarantined")
+                    timeout = max(min(quarantined) - time.time(), 0.01)
+                try:
+                    await asyncio.wait_for(self._available.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            slot = account.idle.pop()
+        try:
+            slot.crawls += 1
+            account.crawls += 1
+            yield account, slot.page
+        finally:
+            slot = await self._reset(slot, account)
+            async with self._available:
+                account.idle.append(slot)
+                self._available.notify_all()
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncGenerator[Page, None]:
+        async with self.lease_account() as (_, page):
+            yield page
+
+    async def crawl(self, crawler: Type[CrawlerBase[_T]], *args, **kwargs) -> _T:
+        """Run a crawl, retrying it on other accounts at most once per account."""
+        endpoint = getattr(crawler, "endpoint", None)
+        kwargs = self.crawler_options(kwargs)
+        attempts = len(self.accounts)
+        while True:
+            async with self.lease_account(endpoint) as (account, page):
+                instance = crawler(
+                    page,
+                    *args,
+                    **kwargs
+                    | {"rate_limiter": self.rate_limiter, "account": account.name},
+                )
+                instance.metrics.retries = len(self.accounts) - attempts
+                try:
+                    return await instance.run()
+                except (NotAuthenticated, RateLimited) as e:
+                    self.quarantine(
+                        account, e.reset if isinstance(e, RateLimited) else None
+                    )
+                    attempts -= 1
+                    if not attempts:
+                        raise
+                finally:
+                    instance.detach()
+
+    async def stream(
+        self, crawler: Type[ScrollableCrawler[_T]], *args, **kwargs
+    ) -> AsyncGenerator[List[_T], None]:
+        """Run a scrollable crawl on the best account, yielding its batches.
+
+        Unlike ``crawl``, failures are not retried, as batches may have been
+        consumed already. A crawl that runs out of time raises ``CrawlTimeout``
+        after its last batch.
+        """
+        async with self.lease_account(crawler.endpoint) as (account, page):
+            instance = crawler(
+                page,
+                *args,
+                **self.crawler_options(kwargs)
+                | {"rate_limiter": self.rate_limiter, "account": account.name},
+            )
+            try:
+                async with aclosing(instance.run_yield()) as batches:
+                    async for batch in batches:
+                        yield batch
+                if instance.timed_out:
+                    raise instance.timeout_error()
+            except (NotAuthenticated, RateLimited) as e:
+                self.quarantine(
+                    account, e.reset if isinstance(e, RateLimited) else None
+                )
+                raise
+            finally:
+                instance.detach()
@@ -0,0 +1,136 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+
+
+class ResponseCache:
+    """On-disk cache of raw GraphQL response bodies.
+
+    Entries are keyed by GraphQL endpoint (``TweetDetail``, ``Followers``, ...)
+    and a crawler-specific key: a tweet id, or for timelines ``url#cursor``
+    per page plus ``url`` for the manifest of its cursors.
+    An entry is fresh for ``ttl`` seconds after it was written; the total size
+    of the cache directory is bounded by ``max_bytes``, evicting the least
+    recently used entries first. Outcomes such as unavailable tweets can be
+    stored as negative entries with their own ``negative_ttl``.
+    """
+
+    directory: Path
+    ttl: float
+    negative_ttl: float
+    max_bytes: int
+
+    _entries: "OrderedDict[Path, int]"
+    _size: int
+
+    def __init__(
+        self,
+        directory: Union[str, os.PathLike],
+        ttl: float = 3600.0,
+        max_bytes: int = 256 * 1024 * 1024,
+        negative_ttl: Optional[float] = None,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        stats = []
+        for path in self.directory.glob("*.cache"):
+            try:
+                stats.append((path, path.stat()))
+            except FileNotFoundError:  # pragma: no cover
+                continue
+        for path, stat in sorted(stats, key=lambda x: x[1].st_atime):
+            self._entries[path] = stat.st_size
+            self._size += stat.st_size
+        self._evict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _path(self, endpoint: str, key: str, negative: bool = False) -> Path:
+        digest = hashlib.sha1(f"{endpoint}\0{key}".encode()).hexdigest()
+        suffix = ".neg.cache" if negative else ".cache"
+        return self.directory / f"{endpoint}-{digest}{suffix}"
+
+    def _forget(self, path: Path) -> None:
+        self._size -= self._entries.pop(path, 0)
+
+    def _remove(self, path: Path) -> None:
+        self._forget(path)
+        path.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+
+    def _touch(self, path: Path, ttl: float) -> bool:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self._forget(path)
+            return False
+        now = time.time()
+        if now - stat.st_mtime > ttl:
+            self._remove(path)
+            return False
+        # Access time records recency for LRU, modification time freshness.
+        os.utime(path, (now, stat.st_mtime))
+        self._size += stat.st_size - self._entries.get(path, 0)
+        self._entries[path] = stat.st_size
+        self._entries.move_to_end(path)
+        return True
+
+    def _read(self, path: Path, ttl: float) -> Optional[bytes]:
+        if not self._touch(path, ttl):
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:  # pragma: no cover
+            self._forget(path)
+            return None
+
+    def _write(self, path: Path, body: bytes) -> None:
+        temp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temp.write_bytes(body)
+        os.replace(temp, path)
+        self._forget(path)
+        self._entries[path] = len(body)
+        self._size += len(body)
+        self._evict()
+
+    def contains(self, endpoint: str, key: str) -> bool:
+        return self._touch(self._path(endpoint, key), self.ttl)
+
+    def get(self, endpoint: str, key: str) -> Optional[bytes]:
+        return self._read(self._path(endpoint, key), self.ttl)
+
+    def put(self, endpoint: str, key: str, body: bytes) -> None:
+        self._remove(self._path(endpoint, key, negative=True))
+        self._write(self._path(endpoint, key), body)
+
+    def get_unavailable(self, endpoint: str, key: str) -> Optional[str]:
+        body = self._read(self._path(endpoint, key, negative=True), self.negative_ttl)
+        return None if body is None else body.decode()
+
+    def put_unavailable(self, endpoint: str, key: str, reason: str) -> None:
+        self._remove(self._path(endpoint, key))
+        self._write(self._path(endpoint, key, negative=True), reason.encode())
+
+    def discard(self, endpoint: str, key: str) -> None:
+        self._remove(self._path(endpoint, key))
+        self._remove(self._path(endpoint, key, negative=True))
+
+    def clear(self) -> None:
+        for path in list(self._entries):
+            self._remove(path)
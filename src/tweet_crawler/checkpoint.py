@@ -0,0 +1,68 @@
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Optional, Set, Union
+
+
+class Checkpoint:
+    """Append-only progress log of a follower/following crawl.
+
+    The first line names the timeline URL; every parsed page appends its
+    bottom cursor and the ids it contained, and is flushed to disk before the
+    crawl moves on. A line cut short by a crash is dropped on load, so the
+    checkpoint always resumes from the last complete page.
+    """
+
+    path: Path
+    url: Optional[str]
+    cursor: Optional[str]
+    seen: Set[int]
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = Path(path)
+        self.url = None
+        self.cursor = None
+        self.seen = set()
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        lines = data.split(b"\n")
+        # The last element is either empty or an incomplete line, which is cut
+        # off so that the next record does not get appended to it.
+        if lines[-1]:
+            os.truncate(self.path, len(data) - len(lines[-1]))
+        for line in lines[:-1]:
+            record = json.loads(line)
+            if "url" in record:
+                self.url = record["url"]
+            else:
+                self.cursor = record["cursor"]
+                self.seen.update(record["ids"])
+
+    def _append(self, record: dict) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            f.write(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def start(self, url: str) -> None:
+        if self.url is None:
+            self._append({"url": url})
+            self.url = url
+        elif self.url != url:
+            raise ValueError(f"{self.path} is a checkpoint of {self.url}, not {url}")
+
+    def record(self, cursor: str, ids: Iterable[int]) -> None:
+        ids = list(ids)
+        self._append({"cursor": cursor, "ids": ids})
+        self.cursor = cursor
+        self.seen.update(ids)
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+        self.url = None
+        self.cursor = None
+        self.seen = set()
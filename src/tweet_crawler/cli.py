@@ -0,0 +1,451 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import queue
+import re
+import sys
+import time
+from contextlib import suppress
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Final,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+)
+
+from playwright.async_api import Browser, async_playwright
+from pydantic import BaseModel
+
+from .accounts import AccountPool, account_cookies, load_accounts
+from .crawler import (
+    ResourceFilter,
+    TwitterFollowersCrawler,
+    TwitterFollowingCrawler,
+    TwitterStatusCrawler,
+)
+from .crawler._base import ScrollableCrawler
+from .crawler.status import STATUS_ID_PATTERN
+from .exception import NotAuthenticated, TweetUnavailable
+from .pool import CrawlerPool
+from .ratelimit import RateLimiter
+from .sink import JsonlSink
+from .store import TweetStore
+
+SCROLLABLE: Final[Dict[str, Type[ScrollableCrawler]]] = {
+    "followers": TwitterFollowersCrawler,
+    "following": TwitterFollowingCrawler,
+}
+SCREEN_NAME_PATTERN: Final[re.Pattern] = re.compile(r"^@?(\w{1,15})$")
+# Failures that another attempt will not fix.
+PERMANENT_ERRORS: Final[Tuple[Type[Exception], ...]] = (
+    NotAuthenticated,
+    TweetUnavailable,
+    ValueError,
+)
+
+
+class Job(NamedTuple):
+    kind: str
+    target: str
+
+
+def parse_job(line: str) -> Optional[Job]:
+    """Read one line of a job file.
+
+    A line is a status URL, a screen name (whose followers are crawled), or
+    ``followers:<screen name>`` / ``following:<screen name>``. Blank lines
+    and lines starting with ``#`` are skipped.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if STATUS_ID_PATTERN.search(line):
+        return Job("status", line)
+    kind, _, name = line.rpartition(":")
+    if kind in SCROLLABLE and (match := SCREEN_NAME_PATTERN.match(name)):
+        return Job(kind, match[1])
+    if not kind and (match := SCREEN_NAME_PATTERN.match(name)):
+        return Job("followers", match[1])
+    raise ValueError(f"Not a status URL or screen name: {line!r}")
+
+
+def read_jobs(lines: Iterable[str]) -> List[Job]:
+    return [job for line in lines if (job := parse_job(line)) is not None]
+
+
+def shard(jobs: Sequence[Job], workers: int) -> List[List[Job]]:
+    """Deal the jobs round-robin, so every worker gets a similar mix."""
+    return [list(jobs[index::workers]) for index in range(workers)]
+
+
+class WorkerStats:
+    worker: int
+    total: int
+    done: int
+    failed: int
+    retries: int
+    items: int
+    elapsed: float
+    error: Optional[str]
+
+    _start: float
+
+    def __init__(self, worker: int, total: int):
+        self.worker = worker
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.retries = 0
+        self.items = 0
+        self.elapsed = 0.0
+        self.error = None
+        self._start = time.perf_counter()
+
+    def tick(self) -> "WorkerStats":
+        self.elapsed = time.perf_counter() - self._start
+        return self
+
+    def __str__(self) -> str:
+        elapsed = max(self.elapsed, 1e-9)
+        text = (
+            f"worker {self.worker}: {self.done + self.failed}/{self.total} jobs, "
+            f"{self.failed} failed, {self.retries} retries, {self.items} items "
+            f"in {self.elapsed:.1f}s ({self.done / elapsed:.2f} jobs/s, "
+            f"{self.items / elapsed:.1f} items/s)"
+        )
+        return text if self.error is None else f"{text}, crashed: {self.error}"
+
+
+def _record(job: Job, **fields: Any) -> str:
+    return json.dumps(
+        {"kind": job.kind, "target": job.target, **fields}, ensure_ascii=False
+    )
+
+
+def _data(model: BaseModel) -> Dict[str, Any]:
+    return model.model_dump(mode="json")
+
+
+def _pool(
+    browser: Browser, args: argparse.Namespace, store: Optional[TweetStore]
+) -> CrawlerPool:
+    resource_filter = ResourceFilter() if args.block_resources else None
+    if args.accounts is not None:
+        return AccountPool(
+            browser,
+            load_accounts(args.accounts),
+            pages_per_account=args.concurrency,
+            resource_filter=resource_filter,
+            store=store,
+        )
+    cookies = None
+    if args.cookies is not None:
+        with open(args.cookies, "rb") as f:
+            cookies = json.load(f)
+        if isinstance(cookies, dict):
+            cookies = account_cookies(**cookies)
+    return CrawlerPool(
+        browser,
+        size=args.concurrency,
+        cookies=cookies,
+        resource_filter=resource_filter,
+        rate_limiter=RateLimiter(),
+        store=store,
+    )
+
+
+async def run_job(
+    pool: CrawlerPool,
+    job: Job,
+    args: argparse.Namespace,
+    stats: WorkerStats,
+    emit: Callable[[str], None],
+) -> None:
+    """Crawl one job, retrying failures up to ``args.retries`` times.
+
+    Users are written as soon as their page is parsed; a retried
+    follower/following crawl skips the ids it already wrote.
+    """
+    emitted: Set[int] = set()
+    for attempt in range(args.retries + 1):
+        try:
+            if job.kind == "status":
+                tweet = await pool.crawl(
+                    TwitterStatusCrawler, job.target, timeout=args.timeout
+                )
+                emit(_record(job, type="tweet", data=_data(tweet)))
+                stats.items += 1
+            else:
+                async for batch in pool.stream(
+                    SCROLLABLE[job.kind],
+                    job.target,
+                    max_pages=args.max_pages,
+                    timeout=args.timeout,
+                ):
+                    for user in batch:
+                        if user.id not in emitted:
+                            emitted.add(user.id)
+                            emit(_record(job, type="user", data=_data(user)))
+                            stats.items += 1
+            stats.done += 1
+            return
+        except PERMANENT_ERRORS as e:
+            error: Exception = e
+            break
+        except Exception as e:
+            error = e
+            if attempt < args.retries:
+                stats.retries += 1
+                await asyncio.sleep(args.backoff * 2**attempt)
+    stats.failed += 1
+    emit(
+        _record(
+            job,
+            type="error",
+            error=f"{type(error).__name__}: {error}",
+            attempts=attempt + 1,
+        )
+    )
+
+
+async def _work(
+    jobs: List[Job],
+    args: argparse.Namespace,
+    results: "multiprocessing.Queue[Tuple[str, Any]]",
+    stats: WorkerStats,
+) -> None:
+    def emit(line: str) -> None:
+        results.put(("line", line))
+
+    async def report() -> None:
+        while True:
+            await asyncio.sleep(args.report_interval)
+            results.put(("stats", stats.tick()))
+
+    store = None
+    if args.store is not None:
+        store = TweetStore(args.store, max_age=args.max_age)
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=not args.headful)
+        reporter = asyncio.create_task(report())
+        try:
+            async with _pool(browser, args, store) as pool:
+                pending = iter(jobs)
+
+                async def consume() -> None:
+                    for job in pending:
+                        await run_job(pool, job, args, stats, emit)
+
+                await asyncio.gather(*(consume() for _ in range(pool.size)))
+        finally:
+            reporter.cancel()
+            await browser.close()
+            if store is not None:
+                store.close()
+
+
+def _worker(
+    index: int,
+    jobs: List[Job],
+    args: argparse.Namespace,
+    results: "multiprocessing.Queue[Tuple[str, Any]]",
+) -> None:
+    stats = WorkerStats(index, len(jobs))
+    try:
+        asyncio.run(_work(jobs, args, results, stats))
+    except BaseException as e:
+        message = str(e).strip().splitlines()
+        stats.error = f"{type(e).__name__}: {message[0] if message else ''}"
+    finally:
+        results.put(("done", stats.tick()))
+
+
+def parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="tweet-crawler",
+        description="Crawl status URLs and follower lists with several browsers.",
+    )
+    parser.add_argument(
+        "jobs",
+        type=argparse.FileType("r", encoding="utf-8"),
+        help="job file, one status URL, screen name, followers:<name> or "
+        "following:<name> per line ('-' for stdin)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="NDJSON file to append results to, gzipped if it ends in .gz "
+        "(default: stdout)",
+    )
+    parser.add_argument(
+        "--max-bytes",
+        type=int,
+        help="split the output into numbered files of about this size",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes, each with its own browser (default: CPU count)",
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=4,
+        help="pages per worker, or per account and worker with --accounts",
+    )
+    login = parser.add_mutually_exclusive_group()
+    login.add_argument(
+        "--cookies",
+        help="JSON file with a Playwright cookie list or {auth_token, ct0}",
+    )
+    login.add_argument(
+        "--accounts",
+        help="JSON file of named cookie sets to rotate (see load_accounts)",
+    )
+    parser.add_argument(
+        "--retries", type=int, default=2, help="attempts after the first one"
+    )
+    parser.add_argument(
+        "--backoff", type=float, default=5.0, help="seconds before the first retry"
+    )
+    parser.add_argument("--timeout", type=float, help="seconds allowed per crawl")
+    parser.add_argument(
+        "--max-pages", type=int, help="timeline pages per follower/following crawl"
+    )
+    parser.add_argument(
+        "--store",
+        help="SQLite database to upsert tweets and users into, shared by the workers",
+    )
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=3600.0,
+        help="seconds a stored tweet is fresh enough to skip (default: 3600)",
+    )
+    parser.add_argument(
+        "--block-resources", action="store_true", help="skip images, media and ads"
+    )
+    parser.add_argument(
+        "--report-interval",
+        type=float,
+        default=30.0,
+        help="seconds between throughput reports on stderr",
+    )
+    parser.add_argument("--headful", action="store_true", help=argparse.SUPPRESS)
+    return parser
+
+
+def _handle(
+    message: Tuple[str, Any],
+    sink: Optional[JsonlSink],
+    finished: Dict[int, WorkerStats],
+) -> None:
+    """Write a worker's result line, or report its progress or its end."""
+    kind, payload = message
+    if kind == "line":
+        if sink is None:
+            sys.stdout.write(payload + "\n")
+        else:
+            sink.write_line(payload)
+        return
+    if sink is not None:
+        sink.flush()
+    if kind == "done":
+        finished[payload.worker] = payload
+    print(payload, file=sys.stderr)
+
+
+def _reap(
+    results: "multiprocessing.Queue[Tuple[str, Any]]",
+    processes: Sequence[multiprocessing.process.BaseProcess],
+    shards: Sequence[Sequence[Job]],
+    sink: Optional[JsonlSink],
+    finished: Dict[int, WorkerStats],
+) -> None:
+    """Report the workers that exited without sending their ``done`` stats.
+
+    The last lines and stats of a worker can still be queued once it has
+    exited, so the queue is drained before deciding it crashed.
+    """
+    exited = [
+        index
+        for index, process in enumerate(processes)
+        if index not in finished and not process.is_alive()
+    ]
+    if not exited:
+        return
+    with suppress(queue.Empty):
+        while True:
+            _handle(results.get_nowait(), sink, finished)
+    for index in exited:
+        if index not in finished:
+            stats = WorkerStats(index, len(shards[index]))
+            stats.error = f"exited with code {processes[index].exitcode}"
+            finished[index] = stats
+            print(stats, file=sys.stderr)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parser().parse_args(argv)
+    with args.jobs:
+        try:
+            jobs = read_jobs(args.jobs)
+        except ValueError as e:
+            parser().error(str(e))
+    del args.jobs  # open files cannot be sent to the workers
+    if not jobs:
+        return 0
+    sink: Optional[JsonlSink] = None
+    if args.output != "-":
+        sink = JsonlSink(args.output, max_bytes=args.max_bytes)
+
+    context = multiprocessing.get_context("spawn")
+    results: "multiprocessing.Queue[Tuple[str, Any]]" = context.Queue()
+    shards = shard(jobs, max(1, min(args.workers, len(jobs))))
+    processes = [
+        context.Process(target=_worker, args=(index, part, args, results))
+        for index, part in enumerate(shards)
+    ]
+    for process in processes:
+        process.start()
+
+    finished: Dict[int, WorkerStats] = {}
+    try:
+        while len(finished) < len(processes):
+            try:
+                message = results.get(timeout=1.0)
+            except queue.Empty:
+                _reap(results, processes, shards, sink, finished)
+                continue
+            _handle(message, sink, finished)
+        sys.stdout.flush()
+    finally:
+        for process in processes:
+            process.join()
+        if sink is not None:
+            sink.close()
+
+    done = sum(stats.done for stats in finished.values())
+    items = sum(stats.items for stats in finished.values())
+    elapsed = max((stats.elapsed for stats in finished.values()), default=0.0)
+    print(
+        f"total: {done}/{len(jobs)} jobs, {items} items in {elapsed:.1f}s "
+        f"({done / max(elapsed, 1e-9):.2f} jobs/s)",
+        file=sys.stderr,
+    )
+    failed = any(s.failed or s.error for s in finished.values())
+    return 1 if failed else 0
@@ -1,5 +1,13 @@
+from .counters import TwitterCountersCrawler
 from .followers import TwitterFollowersCrawler
 from .following import TwitterFollowingCrawler
+from .resource import ResourceFilter
 from .status import TwitterStatusCrawler
 
-__all__ = ["TwitterFollowersCrawler", "TwitterFollowingCrawler", "TwitterStatusCrawler"]
+__all__ = [
+    "ResourceFilter",
+    "TwitterCountersCrawler",
+    "TwitterFollowersCrawler",
+    "TwitterFollowingCrawler",
+    "TwitterStatusCrawler",
+]
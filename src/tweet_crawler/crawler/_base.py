@@ -1,27 +1,282 @@
 import asyncio
-from typing import AsyncGenerator, Generic, List, TypeVar
+import json
+import re
+import time
+from collections import deque
+from concurrent.futures import Executor
+from contextlib import aclosing, contextmanager, suppress
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Final,
+    Generic,
+    Iterator,
+    List,
+    NoReturn,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
-from playwright.async_api import Frame, Page, Response
+from playwright.async_api import Frame, Page, Response, Route
+
+from ..cache import ResponseCache
+from ..checkpoint import Checkpoint
+from ..decoder import DEFAULT_DECODER, Decoder
+from ..exception import CrawlCancelled, CrawlTimeout, TwitterException
+from ..metrics import CrawlMetrics, MetricsRecorder, stopwatch
+from ..ratelimit import DEFAULT_ACCOUNT, RateLimiter, check_rate_limit
+from ..sink import JsonlSink
+from ..store import TweetStore
+from .direct import parse_variables, with_variables
+from .resource import ResourceFilter
+from .router import ResponseRouter
 
 _T = TypeVar("_T")
+_R = TypeVar("_R")
+
+BLANK_URL: Final[str] = "about:blank"
+
+
+def _convert_body(
+    crawler: Type["CrawlerBase"], decoder: Decoder, body: bytes, options: Dict[str, Any]
+) -> Tuple[Any, float, float]:
+    start = time.perf_counter()
+    content = decoder.decode(body, crawler.DECODE_PATHS)
+    decoded = time.perf_counter()
+    converted = crawler.convert(content, **options)
+    return converted, decoded - start, time.perf_counter() - decoded
+
+
+def _convert_content(
+    crawler: Type["CrawlerBase"], content: Any, options: Dict[str, Any]
+) -> Tuple[Any, float, float]:
+    start = time.perf_counter()
+    converted = crawler.convert(content, **options)
+    return converted, 0.0, time.perf_counter() - start
 
 
 class CrawlerBase(Generic[_T]):
     done_signal: asyncio.Event
+    stop_signal: asyncio.Event
 
     exception_signal: asyncio.Event
     exception: Exception
 
     url: str
     page: Page
+    endpoint: str
+    resource_filter: Optional[ResourceFilter]
+    cache: Optional[ResponseCache]
+    decoder: Decoder
+    rate_limiter: Optional[RateLimiter]
+    account: str
+    metrics: CrawlMetrics
+    recorder: Optional[MetricsRecorder]
+    timeout: Optional[float]
+    timed_out: bool
+    router: ResponseRouter
+    executor: Optional[Executor]
+    sink: Optional[JsonlSink]
+    store: Optional[TweetStore]
+    from_store: bool
+    ENDPOINTS: Tuple[str, ...] = ()
+    DECODE_PATHS: Tuple[Tuple[str, ...], ...] = ()
+
+    _deadline: Optional[float]
+    _tail: Optional["asyncio.Future[None]"]
 
-    def __init__(self, page: Page, url: str):
+    def __init__(
+        self,
+        page: Page,
+        url: str,
+        resource_filter: Optional[ResourceFilter] = None,
+        cache: Optional[ResponseCache] = None,
+        decoder: Optional[Decoder] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        account: str = DEFAULT_ACCOUNT,
+        recorder: Optional[MetricsRecorder] = None,
+        timeout: Optional[float] = None,
+        executor: Optional[Executor] = None,
+        sink: Optional[JsonlSink] = None,
+        store: Optional[TweetStore] = None,
+    ):
         self.done_signal = asyncio.Event()
+        self.stop_signal = asyncio.Event()
         self.exception_signal = asyncio.Event()
         self.url = url
         self.page = page
-        self.page.on("response", self.handle_response)
-        self.page.on("framenavigated", self.handle_redirection)
+        self.resource_filter = resource_filter
+        self.cache = cache
+        self.decoder = decoder or DEFAULT_DECODER
+        self.rate_limiter = rate_limiter
+        self.account = account
+        self.metrics = CrawlMetrics(type(self).__name__, url, account)
+        self.recorder = recorder
+        self.timeout = timeout
+        self.timed_out = False
+        self.executor = executor
+        self.sink = sink
+        self.store = store
+        self.from_store = False
+        self._deadline = None
+        self._tail = None
+        self.router = ResponseRouter.for_page(page)
+        self.router.bind(self)
+
+    def detach(self) -> None:
+        self.router.unbind(self)
+
+    def handles(self, endpoint: str) -> bool:
+        """Whether responses of the GraphQL ``endpoint`` belong to this crawler."""
+        return endpoint == self.endpoint or endpoint in self.ENDPOINTS
+
+    async def release(self) -> None:
+        """Detach from the page and leave it blank, ready for another crawl."""
+        self.detach()
+        with suppress(Exception):
+            await self.page.goto(BLANK_URL)
+
+    def cancel(self) -> None:
+        """Ask the crawl to stop at the next opportunity."""
+        self.stop_signal.set()
+        self.done_signal.set()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left until the ``timeout`` of the running crawl, if any."""
+        if self._deadline is None:
+            return None
+        return self._deadline - asyncio.get_running_loop().time()
+
+    def expired(self) -> bool:
+        """Whether the crawl was cancelled or has run out of time."""
+        if not self.stop_signal.is_set():
+            if (remaining := self.remaining()) is not None and remaining <= 0:
+                self.timed_out = True
+                self.cancel()
+        return self.stop_signal.is_set()
+
+    def timeout_error(self) -> CrawlTimeout:
+        return CrawlTimeout(f"{self.url} did not finish within {self.timeout}s")
+
+    async def halt(self) -> NoReturn:
+        """Release the page and raise ``CrawlTimeout`` or ``CrawlCancelled``."""
+        await self.release()
+        if self.timed_out:
+            raise self.timeout_error()
+        raise CrawlCancelled(f"Crawl of {self.url} was cancelled")
+
+    async def until_stopped(self, aw: Awaitable[_R]) -> _R:
+        """Await ``aw``, unless the crawl is cancelled or runs out of time first."""
+        task = asyncio.ensure_future(aw)
+        stop = asyncio.ensure_future(self.stop_signal.wait())
+        try:
+            await asyncio.wait(
+                (task, stop),
+                timeout=self.remaining(),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            stop.cancel()
+            if not task.done():
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+        if not task.cancelled():
+            return task.result()
+        if not self.stop_signal.is_set():
+            self.timed_out = True
+            self.cancel()
+        await self.halt()
+
+    async def prepare(self) -> None:
+        if self.resource_filter is not None:
+            await self.resource_filter.attach(self.page)
+
+    async def throttle(self, endpoint: Optional[str] = None) -> None:
+        """Wait until the rate limiter allows another request to ``endpoint``."""
+        if self.rate_limiter is not None:
+            with stopwatch(self.metrics, "throttle_time"):
+                await self.rate_limiter.acquire(endpoint or self.endpoint, self.account)
+
+    async def navigate(self) -> None:
+        await self.throttle()
+        with stopwatch(self.metrics, "navigation_time"):
+            await self.page.goto(self.url)
+
+    @contextmanager
+    def instrument(self) -> Iterator[None]:
+        """Time the crawl and hand its metrics to the recorder when it ends.
+
+        Nested uses are no-ops, so ``run`` overrides can wrap ``super().run()``.
+        """
+        if not self.metrics.start():
+            yield
+            return
+        if self.timeout is not None:
+            self._deadline = asyncio.get_running_loop().time() + self.timeout
+        error = None
+        try:
+            yield
+        except GeneratorExit:
+            raise
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.metrics.finish(error)
+            if self.recorder is not None:
+                self.recorder.record(self.metrics)
+
+    def observe(self, endpoint: str, response: Response) -> None:
+        """Feed a response's rate limit headers back, raising on a 429."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.observe(
+                endpoint, response.status, response.headers, self.account
+            )
+        else:
+            check_rate_limit(endpoint, response.status, response.headers, self.account)
+
+    async def ingest(self, body: bytes) -> None:
+        """Decode and convert a response body in the executor, then ``apply`` it."""
+        self.metrics.response(len(body))
+        await self._stage(_convert_body, self.decoder, body)
+
+    async def _stage(
+        self, convert: Callable[..., Tuple[Any, float, float]], *args: Any
+    ) -> None:
+        """Run ``convert`` in the executor, applying results in call order."""
+        loop = asyncio.get_running_loop()
+        previous, tail = self._tail, loop.create_future()
+        self._tail = tail
+        try:
+            converted, decode_time, convert_time = await loop.run_in_executor(
+                self.executor, convert, type(self), *args, self.convert_options()
+            )
+            self.metrics.decode_time += decode_time
+            if previous is not None:
+                await previous
+            waited = self.metrics.queue_wait_time
+            start = time.perf_counter()
+            try:
+                await self.apply(converted)
+            finally:
+                # Time spent blocked on a full queue is the consumer's, not parse's.
+                self.metrics.parse_time += (
+                    convert_time
+                    + time.perf_counter()
+                    - start
+                    - self.metrics.queue_wait_time
+                    + waited
+                )
+        finally:
+            tail.set_result(None)
 
     async def handle_redirection(self, frame: Frame) -> None:
         ...
@@ -29,9 +284,41 @@ class CrawlerBase(Generic[_T]):
     async def handle_response(self, response: Response) -> None:
         ...
 
-    async def parse(self, content: dict) -> None:
+    async def handle_graphql(self, endpoint: str, response: Response) -> None:
+        """Handle a response the page's ``ResponseRouter`` matched to ``endpoint``."""
+        await self.handle_response(response)
+
+    @classmethod
+    def convert(cls, content: Any, **options: Any) -> Any:
+        """Build the models in a decoded response.
+
+        Runs in the crawler's ``executor``, in a worker process if it is a
+        ``ProcessPoolExecutor``, so it may only use its arguments and must
+        return something picklable. ``options`` come from ``convert_options``.
+        """
+        return content
+
+    def convert_options(self) -> Dict[str, Any]:
+        return {}
+
+    async def apply(self, converted: Any) -> None:
+        """Take over the result of ``convert`` on the event loop."""
         ...
 
+    def output(self, items: Sequence[Any]) -> None:
+        """Write parsed items to the sink and, unless they came from it, the store."""
+        if self.sink is not None:
+            self.sink.write_many(items)
+        if self.store is not None and not self.from_store:
+            self.store.write_many(items)
+
+    async def parse(self, content: Any) -> None:
+        """Convert an already decoded response in the executor, then ``apply`` it.
+
+        Like ``ingest``, but for JSON that did not come as a raw body.
+        """
+        await self._stage(_convert_content, content)
+
     async def run(self) -> _T:
         ...
 
@@ -40,34 +327,248 @@ class StaticCrawler(CrawlerBase[_T]):
     result: _T
 
     async def run(self) -> _T:
-        await self.page.goto(self.url)
+        """Crawl ``url``, raising ``CrawlTimeout`` after ``timeout`` seconds."""
+        with self.instrument():
+            result = await self.until_stopped(self._run())
+        self.output([result])
+        return result
+
+    async def _run(self) -> _T:
+        await self.prepare()
+        await self.navigate()
         await self.done_signal.wait()
+        if self.expired():
+            await self.halt()
         if self.exception_signal.is_set():
             raise self.exception  # pragma: no cover
         return self.result
 
 
 class ScrollableCrawler(CrawlerBase[List[_T]]):
+    RESPONSE_PATTERN: re.Pattern
+
     scroll_done_signal: asyncio.Event
-    increment: List[_T]
+    queue: "asyncio.Queue[List[_T]]"
     result: List[_T]
 
-    def __init__(self, page: Page, url: str):
-        super().__init__(page=page, url=url)
+    scroll_interval: float
+    max_scroll_interval: float = 8.0
+    scroll_backoff: float = 2.0
+    max_idle_time: float
+    max_pages: Optional[int]
+    complete: bool
+    checkpoint: Optional[Checkpoint]
+
+    _closed: bool
+    _resuming: bool
+    _cursors: List[str]
+    _progress: Deque[Optional[str]]
+
+    def __init__(
+        self,
+        page: Page,
+        url: str,
+        scroll_interval: float = 0.5,
+        max_idle_time: float = 30.0,
+        max_pages: Optional[int] = None,
+        queue_size: int = 4,
+        checkpoint: Optional[Checkpoint] = None,
+        **kwargs,
+    ):
+        super().__init__(page=page, url=url, **kwargs)
         self.scroll_done_signal = asyncio.Event()
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.scroll_interval = scroll_interval
+        self.max_idle_time = max_idle_time
+        self.max_pages = max_pages
+        self.complete = False
+        self.checkpoint = checkpoint
+        self._closed = False
+        self._resuming = False
+        self._cursors = []
+        self._progress = deque()
 
-    async def run_yield(self) -> AsyncGenerator[List[_T], None]:
-        await self.page.goto(self.url)
-        while not self.scroll_done_signal.is_set():
-            while not self.done_signal.is_set():
-                await self.page.keyboard.press("End")
+    async def prepare(self) -> None:
+        await super().prepare()
+        if self.checkpoint is not None:
+            self.checkpoint.start(self.url)
+            if self.checkpoint.cursor is not None:
+                await self.page.route(self.RESPONSE_PATTERN, self._resume)
+                self._resuming = True
+
+    async def release(self) -> None:
+        if self._resuming:
+            self._resuming = False
+            with suppress(Exception):
+                await self.page.unroute(self.RESPONSE_PATTERN, self._resume)
+        await super().release()
+
+    async def _resume(self, route: Route) -> None:
+        """Start the timeline at the checkpoint cursor instead of the top."""
+        url = route.request.url
+        if self.checkpoint is None or parse_variables(url).get("cursor"):
+            await route.fallback()
+            return
+        self._resuming = False
+        await self.page.unroute(self.RESPONSE_PATTERN, self._resume)
+        await route.fallback(url=with_variables(url, cursor=self.checkpoint.cursor))
+
+    async def feed(self, batch: List[_T], cursor: Optional[str] = None) -> None:
+        """Hand a parsed timeline page over to ``run_yield``.
+
+        Waits while the queue is full, so a slow consumer holds back parsing
+        instead of losing pages. ``cursor`` is the page's bottom cursor, saved
+        to the checkpoint once the page has been consumed; items the
+        checkpoint has already seen are dropped.
+        """
+        if self._closed:
+            return
+        if self.checkpoint is not None:
+            seen = self.checkpoint.seen
+            batch = [item for item in batch if getattr(item, "id") not in seen]
+        self._progress.append(cursor)
+        with stopwatch(self.metrics, "queue_wait_time"):
+            await self.queue.put(batch)
+
+    def save_progress(self, batch: List[_T]) -> None:
+        cursor = self._progress.popleft() if self._progress else None
+        if self.checkpoint is not None and cursor is not None:
+            # A checkpointed page must not be lost in a write buffer.
+            if self.sink is not None:
+                self.sink.flush()
+            if self.store is not None:
+                self.store.flush()
+            self.checkpoint.record(cursor, (getattr(item, "id") for item in batch))
+
+    async def scroll(self) -> None:
+        await self.page.keyboard.press("End")
+
+    async def wait_increment(self, scroll: bool) -> bool:
+        """Scroll until the next matching response arrives.
+
+        Scrolls are spaced by ``scroll_interval``, backing off up to
+        ``max_scroll_interval`` while nothing arrives. Returns ``False`` if the
+        timeline stayed idle for ``max_idle_time`` seconds, and halts if the
+        crawl is cancelled or runs out of time.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_idle_time
+        interval = self.scroll_interval
+        if scroll:
+            await self.until_stopped(self.throttle())
+            await self.scroll()
+            self.metrics.scrolls += 1
+        while not self.done_signal.is_set() or self.stop_signal.is_set():
+            if self.expired():
+                await self.halt()
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            timeout = min(interval, remaining, self.remaining() or remaining)
+            try:
+                await asyncio.wait_for(self.done_signal.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                await self.scroll()
+                self.metrics.scrolls += 1
+                self.metrics.rescrolls += 1
+                interval = min(interval * self.scroll_backoff, self.max_scroll_interval)
+        return True
+
+    def cache_page(self, cursor: str, body: bytes) -> None:
+        if self.cache is not None:
+            self.cache.put(self.endpoint, f"{self.url}#{cursor}", body)
+            self._cursors.append(cursor)
+
+    def cached_keys(self) -> Optional[List[str]]:
+        """Keys of a fresh, complete cached copy of the timeline, if any."""
+        if self.cache is None:
+            return None
+        if (manifest := self.cache.get(self.endpoint, self.url)) is None:
+            return None
+        keys = [f"{self.url}#{cursor}" for cursor in json.loads(manifest)]
+        if all(self.cache.contains(self.endpoint, key) for key in keys):
+            return keys
+        return None
+
+    async def _replay(self, keys: List[str]) -> AsyncGenerator[List[_T], None]:
+        assert self.cache is not None
+        for key in keys:
+            if (body := self.cache.get(self.endpoint, key)) is None:
+                self.cache.discard(self.endpoint, self.url)
+                raise TwitterException(f"Cached page of {self.url} expired")
+            await self.ingest(body)
             if self.exception_signal.is_set():
                 raise self.exception
-            self.done_signal.clear()
-            yield self.increment
+            while not self.queue.empty():
+                yield self.queue.get_nowait()
+
+    async def _crawl(self) -> AsyncGenerator[List[_T], None]:
+        """Yield parsed pages; on cancellation or timeout, stop after the pages
+        already parsed, leaving ``complete`` unset."""
+        try:
+            await self.prepare()
+            await self.until_stopped(self.navigate())
+            waited = False
+            while True:
+                if self.queue.empty():
+                    if self.exception_signal.is_set():
+                        raise self.exception
+                    if self.scroll_done_signal.is_set():
+                        if self.cache is not None and self.complete:
+                            self.cache.put(
+                                self.endpoint,
+                                self.url,
+                                json.dumps(self._cursors).encode(),
+                            )
+                        return
+                    if self.expired():
+                        await self.halt()
+                    self.done_signal.clear()
+                    if not await self.wait_increment(scroll=waited):
+                        return
+                    waited = True
+                    continue
+                yield self.queue.get_nowait()
+        except CrawlCancelled as e:
+            self.metrics.error = type(e).__name__
+
+    async def run_yield(self) -> AsyncGenerator[List[_T], None]:
+        keys = self.cached_keys()
+        try:
+            with self.instrument():
+                async with aclosing(
+                    self._crawl() if keys is None else self._replay(keys)
+                ) as batches:
+                    async for batch in batches:
+                        self.output(batch)
+                        yield batch
+                        self.save_progress(batch)
+                        self.metrics.pages += 1
+                        if (
+                            self.max_pages is not None
+                            and self.metrics.pages >= self.max_pages
+                        ):
+                            return
+                if self.complete and self.checkpoint is not None:
+                    self.checkpoint.clear()
+        finally:
+            self._closed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
 
     async def run(self) -> List[_T]:
         self.result = []
         async for part in self.run_yield():
             self.result.extend(part)
         return self.result
+
+    async def drain(self) -> int:
+        """Crawl without keeping the items, returning how many there were.
+
+        Meant for crawls written to a ``sink`` or ``store``, which then run in constant
+        memory however long the timeline is.
+        """
+        count = 0
+        async for part in self.run_yield():
+            count += len(part)
+        return count
@@ -0,0 +1,78 @@
+from typing import Any, Dict, Final, Optional, Sequence, Tuple, Union
+
+from ..exception import TweetUnavailable
+from .status import TwitterStatusCrawler
+
+COUNTERS: Final[Tuple[str, ...]] = (
+    "views_count",
+    "favorite_count",
+    "retweet_count",
+    "reply_count",
+    "quote_count",
+    "bookmark_count",
+)
+
+
+def _focal_result(content: dict, tweet_id: int) -> Optional[dict]:
+    data = content["data"]
+    if "tweetResult" in data:
+        return data["tweetResult"].get("result")
+    instructions = data["threaded_conversation_with_injections_v2"]["instructions"]
+    entries = [
+        entry
+        for instruction in instructions
+        if instruction["type"] == "TimelineAddEntries"
+        for entry in instruction["entries"]
+    ]
+    # Like ``Tweet.from_instructions``, fall back to the first entry.
+    entry = next((e for e in entries if e["entryId"] == f"tweet-{tweet_id}"), None)
+    if entry is None and entries:
+        entry = entries[0]
+    if entry is None:
+        return None
+    return entry["content"]["itemContent"]["tweet_results"].get("result")
+
+
+def extract_counters(
+    content: dict, tweet_id: int
+) -> Union[Dict[str, int], TweetUnavailable]:
+    """Read the counters of a tweet from a decoded ``TweetDetail`` or
+    ``TweetResultByRestId`` response, without building a ``Tweet``."""
+    result = _focal_result(content, tweet_id)
+    if result is None:
+        return TweetUnavailable("Tweet not found")
+    typename = result.get("__typename")
+    if typename == "TweetUnavailable":
+        return TweetUnavailable(result.get("reason"))
+    if typename == "TweetTombstone":
+        return TweetUnavailable(result["tombstone"]["text"]["text"])
+    if typename == "TweetWithVisibilityResults":
+        result = result["tweet"]
+    legacy = result["legacy"]
+    counters = {name: int(legacy.get(name, 0)) for name in COUNTERS[1:]}
+    return {"views_count": int(result.get("views", {}).get("count", 0)), **counters}
+
+
+class TwitterCountersCrawler(TwitterStatusCrawler):
+    """Crawls only the counters of a tweet, as a dict keyed by ``COUNTERS``.
+
+    Loads the same responses as ``TwitterStatusCrawler`` (pass a ``template``
+    to skip the page load), but reads the counters straight from the decoded
+    response instead of building the tweet, its author and its replies. The
+    counters are not written to the crawler's sink or store.
+    """
+
+    @classmethod
+    def convert(
+        cls, content: dict, tweet_id: int = 0, **options: Any
+    ) -> Union[Dict[str, int], TweetUnavailable]:
+        return extract_counters(content, tweet_id)
+
+    def convert_options(self) -> Dict[str, Any]:
+        return {"tweet_id": self.tweet_id}
+
+    def run_stored(self) -> bool:
+        return False
+
+    def output(self, items: Sequence[Any]) -> None:
+        pass
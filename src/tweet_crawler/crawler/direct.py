@@ -0,0 +1,126 @@
+import json
+from typing import Any, Dict, Final, FrozenSet, Optional
+from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
+
+from playwright.async_api import APIRequestContext, Request
+from typing_extensions import Self
+
+from ..exception import TwitterException
+from ..ratelimit import DEFAULT_ACCOUNT, RateLimiter, check_rate_limit
+
+TWEET_ID_VARIABLES: Final[Dict[str, str]] = {
+    "TweetDetail": "focalTweetId",
+    "TweetResultByRestId": "tweetId",
+}
+DROPPED_HEADERS: Final[FrozenSet[str]] = frozenset(
+    {"cookie", "host", "content-length", "accept-encoding", "connection"}
+)
+
+
+def _compact(value: Dict[str, Any]) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+def parse_variables(url: str) -> Dict[str, Any]:
+    query = parse_qs(urlsplit(url).query)
+    return json.loads(query.get("variables", ["{}"])[0])
+
+
+def with_variables(url: str, **variables: Any) -> str:
+    split = urlsplit(url)
+    query = parse_qs(split.query)
+    query["variables"] = [_compact(parse_variables(url) | variables)]
+    return urlunsplit(split._replace(query=urlencode(query, doseq=True)))
+
+
+class GraphQLTemplate:
+    """A GraphQL request captured from a real navigation, replayable for other ids.
+
+    Holds the endpoint URL (including the query id), the variables, feature
+    flags and field toggles the web client sent, and the headers carrying the
+    bearer token, CSRF token and guest token.
+    """
+
+    url: str
+    operation: str
+    variables: Dict[str, Any]
+    features: Dict[str, Any]
+    field_toggles: Optional[Dict[str, Any]]
+    headers: Dict[str, str]
+
+    def __init__(
+        self,
+        url: str,
+        variables: Dict[str, Any],
+        features: Dict[str, Any],
+        headers: Dict[str, str],
+        field_toggles: Optional[Dict[str, Any]] = None,
+    ):
+        self.url = url
+        self.operation = urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1]
+        self.variables = variables
+        self.features = features
+        self.field_toggles = field_toggles
+        self.headers = headers
+
+    @classmethod
+    async def from_request(cls, request: Request) -> Self:
+        split = urlsplit(request.url)
+        query = parse_qs(split.query)
+        headers = {
+            k: v
+            for k, v in (await request.all_headers()).items()
+            if not k.startswith(":") and k.lower() not in DROPPED_HEADERS
+        }
+        return cls(
+            url=urlunsplit((split.scheme, split.netloc, split.path, "", "")),
+            variables=parse_variables(request.url),
+            features=json.loads(query.get("features", ["{}"])[0]),
+            field_toggles=(
+                json.loads(query["fieldToggles"][0])
+                if "fieldToggles" in query
+                else None
+            ),
+            headers=headers,
+        )
+
+    def build_url(self, **variables: Any) -> str:
+        params = {
+            "variables": _compact(self.variables | variables),
+            "features": _compact(self.features),
+        }
+        if self.field_toggles is not None:
+            params["fieldToggles"] = _compact(self.field_toggles)
+        return f"{self.url}?{urlencode(params)}"
+
+    def for_tweet(self, tweet_id: int) -> str:
+        if self.operation not in TWEET_ID_VARIABLES:
+            raise ValueError(f"{self.operation} does not take a tweet id")
+        return self.build_url(**{TWEET_ID_VARIABLES[self.operation]: str(tweet_id)})
+
+    async def fetch(
+        self,
+        request: APIRequestContext,
+        url: str,
+        rate_limiter: Optional[RateLimiter] = None,
+        account: str = DEFAULT_ACCOUNT,
+    ) -> bytes:
+        if rate_limiter is not None:
+            await rate_limiter.acquire(self.operation, account)
+        response = await request.get(url, headers=self.headers)
+        try:
+            if rate_limiter is not None:
+                rate_limiter.observe(
+                    self.operation, response.status, response.headers, account
+                )
+            else:
+                check_rate_limit(
+                    self.operation, response.status, response.headers, account
+                )
+            if not response.ok:
+                raise TwitterException(
+                    f"{self.operation} returned {response.status} {response.status_text}"
+                )
+            return await response.body()
+        finally:
+            await response.dispose()
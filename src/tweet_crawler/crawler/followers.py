@@ -1,27 +1,84 @@
-import json
+import os
 import re
-from typing import Final
+from typing import Final, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+from urllib.parse import urlsplit
 
 from playwright.async_api import Frame, Page, Response
+from typing_extensions import Self
 
+from ..checkpoint import Checkpoint
 from ..exception import NotAuthenticated
 from ..model import TwitterUser
+from ..snapshot import IdIndex
 from ._base import ScrollableCrawler
+from .direct import parse_variables
 
 FOLLOWERS_PATTERN: Final[re.Pattern] = re.compile(
     r"^https?://(?:twitter|x)\.com/i/api/graphql/[^/]+/Followers(\?.*)?$"
 )
 
 
+class TimelineUpdate(NamedTuple):
+    batches: List[Tuple[List[TwitterUser], Optional[str]]]
+    terminated: bool
+
+
+class FollowerSync(NamedTuple):
+    new: List[TwitterUser]
+    unfollowers: Set[int]
+    complete: bool
+
+
 class TwitterFollowersCrawler(ScrollableCrawler[TwitterUser]):
+    """Crawls the followers of ``screen_name``, newest first.
+
+    Given ``known``, the newest-first ids of a previous crawl (such as
+    ``FollowerSnapshot.ids`` or its ``index()``), scrolling stops once
+    ``stop_after`` consecutive known users have been seen; see ``sync``.
+    """
+
     screen_name: str
+    known: Optional[IdIndex]
+    stop_after: int
     URL_PATTERN: str = "https://x.com/{screen_name}/followers"
+    RESPONSE_PATTERN: re.Pattern = FOLLOWERS_PATTERN
+    endpoint: str = "Followers"
+    DECODE_PATHS: Tuple[Tuple[str, ...], ...] = (
+        ("data", "user", "result", "timeline", "timeline", "instructions"),
+    )
+
+    _streak: int
+    _covered: int
+    _seen_known: Set[int]
 
-    def __init__(self, page: Page, screen_name: str):
+    def __init__(
+        self,
+        page: Page,
+        screen_name: str,
+        known: Union[IdIndex, Sequence[int], None] = None,
+        stop_after: int = 20,
+        **kwargs,
+    ):
         super().__init__(
-            page=page, url=self.URL_PATTERN.format(screen_name=screen_name)
+            page=page, url=self.URL_PATTERN.format(screen_name=screen_name), **kwargs
         )
         self.screen_name = screen_name
+        self.known = (
+            known if known is None or isinstance(known, IdIndex) else IdIndex(known)
+        )
+        self.stop_after = stop_after
+        self._streak = 0
+        self._covered = 0
+        self._seen_known = set()
+
+    @classmethod
+    def resume(cls, page: Page, path: Union[str, os.PathLike], **kwargs) -> Self:
+        """A crawler continuing the crawl recorded in the checkpoint at ``path``."""
+        checkpoint = Checkpoint(path)
+        if checkpoint.url is None:
+            raise ValueError(f"No checkpoint at {path}")
+        screen_name = urlsplit(checkpoint.url).path.strip("/").split("/")[0]
+        return cls(page, screen_name, checkpoint=checkpoint, **kwargs)
 
     async def handle_redirection(self, frame: Frame) -> None:
         if frame.url == f"https://x.com/{self.screen_name}":
@@ -30,16 +87,24 @@ class TwitterFollowersCrawler(ScrollableCrawler[TwitterUser]):
             self.done_signal.set()
 
     async def handle_response(self, response: Response) -> None:
-        if FOLLOWERS_PATTERN.match(response.url):
-            try:
-                await self.parse(json.loads(await response.body()))
-            except Exception as e:  # pragma: no cover
-                self.exception = e
-                self.exception_signal.set()
-            finally:
-                self.done_signal.set()
-
-    async def parse(self, content: dict) -> None:
+        if self.RESPONSE_PATTERN.match(response.url):
+            await self.handle_graphql(self.endpoint, response)
+
+    async def handle_graphql(self, endpoint: str, response: Response) -> None:
+        try:
+            self.observe(endpoint, response)
+            body = await response.body()
+            await self.ingest(body)
+            self.cache_page(parse_variables(response.url).get("cursor", ""), body)
+        except Exception as e:  # pragma: no cover
+            self.exception = e
+            self.exception_signal.set()
+        finally:
+            self.done_signal.set()
+
+    @classmethod
+    def convert(cls, content: dict, **options) -> TimelineUpdate:
+        update = TimelineUpdate(batches=[], terminated=False)
         for ins in content["data"]["user"]["result"]["timeline"]["timeline"][
             "instructions"
         ]:
@@ -47,13 +112,64 @@ class TwitterFollowersCrawler(ScrollableCrawler[TwitterUser]):
                 ins["type"] == "TimelineTerminateTimeline"
                 and ins["direction"] == "Bottom"
             ):
-                self.scroll_done_signal.set()
+                update = update._replace(terminated=True)
             if ins["type"] == "TimelineAddEntries":
-                users = [
-                    TwitterUser.from_result(
-                        entry["content"]["itemContent"]["user_results"]["result"]
-                    )
-                    for entry in ins["entries"]
-                    if entry["content"]["entryType"] == "TimelineTimelineItem"
-                ]
-                self.increment = users
+                users = []
+                cursor = None
+                for entry in ins["entries"]:
+                    content = entry["content"]
+                    if content["entryType"] == "TimelineTimelineItem":
+                        users.append(
+                            TwitterUser.from_result(
+                                content["itemContent"]["user_results"]["result"]
+                            )
+                        )
+                    elif content.get("cursorType") == "Bottom":
+                        cursor = content["value"]
+                update.batches.append((users, cursor))
+        return update
+
+    async def apply(self, converted: TimelineUpdate) -> None:
+        for users, cursor in converted.batches:
+            if self.known is not None:
+                self.track_known(users)
+            await self.feed(users, cursor)
+        if converted.terminated:
+            self.complete = True
+            self.scroll_done_signal.set()
+
+    def track_known(self, users: List[TwitterUser]) -> None:
+        assert self.known is not None
+        for user in users:
+            if (position := self.known.position(user.id)) is None:
+                self._streak = 0
+                continue
+            self._seen_known.add(position)
+            self._covered = max(self._covered, position + 1)
+            self._streak += 1
+        if self._streak >= self.stop_after:
+            self.scroll_done_signal.set()
+
+    def unfollowers(self) -> Set[int]:
+        """Known ids missing from the part of the previous crawl covered so far."""
+        if self.known is None:
+            return set()
+        covered = len(self.known) if self.complete else self._covered
+        return {self.known.ids[p] for p in range(covered) if p not in self._seen_known}
+
+    async def sync(self) -> FollowerSync:
+        """Crawl until ``stop_after`` known users in a row, or the end of the list.
+
+        Returns the users that are not ``known`` and the known ids that
+        disappeared, which is only exhaustive when ``complete`` is true.
+        """
+        new: List[TwitterUser] = []
+        async for batch in self.run_yield():
+            new.extend(
+                user
+                for user in batch
+                if self.known is None or user.id not in self.known
+            )
+        return FollowerSync(
+            new=new, unfollowers=self.unfollowers(), complete=self.complete
+        )
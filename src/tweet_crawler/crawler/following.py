@@ -1,4 +1,3 @@
-import json
 import re
 from typing import Final
 
@@ -11,10 +10,5 @@ FOLLOWING_PATTERN: Final[re.Pattern] = re.compile(
 
 class TwitterFollowingCrawler(TwitterFollowersCrawler):
     URL_PATTERN: str = "https://x.com/{screen_name}/following"
-
-    async def handle_response(self, response):
-        if FOLLOWING_PATTERN.match(response.url):
-            try:
-                await self.parse(json.loads(await response.body()))
-            finally:
-                self.done_signal.set()
+    RESPONSE_PATTERN: re.Pattern = FOLLOWING_PATTERN
+    endpoint: str = "Following"
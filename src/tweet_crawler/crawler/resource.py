@@ -0,0 +1,89 @@
+import re
+import weakref
+from typing import Final, FrozenSet, Iterable, Tuple
+from urllib.parse import urlsplit
+
+from playwright.async_api import Page, Route
+
+DEFAULT_ALLOWED_RESOURCE_TYPES: Final[FrozenSet[str]] = frozenset(
+    {
+        "document",
+        "script",
+        "stylesheet",
+        "xhr",
+        "fetch",
+        "eventsource",
+        "websocket",
+        "manifest",
+        "other",
+    }
+)
+DEFAULT_BLOCKED_HOSTS: Final[FrozenSet[str]] = frozenset(
+    {
+        "ads-twitter.com",
+        "ads-api.twitter.com",
+        "analytics.twitter.com",
+        "google-analytics.com",
+        "googletagmanager.com",
+        "doubleclick.net",
+        "video.twimg.com",
+        "pbs.twimg.com",
+    }
+)
+DEFAULT_BLOCKED_URL_PATTERNS: Final[Tuple[re.Pattern, ...]] = (
+    re.compile(r"/1\.1/jot/"),
+    re.compile(r"/i/adsct"),
+    re.compile(r"/i/api/1\.1/live_pipeline/"),
+)
+
+
+class ResourceFilter:
+    """Aborts requests the GraphQL interception does not need.
+
+    A request goes through only if its resource type is in
+    ``allowed_resource_types`` and neither its host nor its URL is blocked.
+    """
+
+    allowed_resource_types: FrozenSet[str]
+    blocked_hosts: FrozenSet[str]
+    blocked_url_patterns: Tuple[re.Pattern, ...]
+
+    _pages: "weakref.WeakSet[Page]"
+
+    def __init__(
+        self,
+        allowed_resource_types: Iterable[str] = DEFAULT_ALLOWED_RESOURCE_TYPES,
+        blocked_hosts: Iterable[str] = DEFAULT_BLOCKED_HOSTS,
+        blocked_url_patterns: Iterable[re.Pattern] = DEFAULT_BLOCKED_URL_PATTERNS,
+    ):
+        self.allowed_resource_types = frozenset(allowed_resource_types)
+        self.blocked_hosts = frozenset(blocked_hosts)
+        self.blocked_url_patterns = tuple(blocked_url_patterns)
+        self._pages = weakref.WeakSet()
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type not in self.allowed_resource_types:
+            return True
+        host = urlsplit(url).hostname or ""
+        if any(host == h or host.endswith(f".{h}") for h in self.blocked_hosts):
+            return True
+        return any(pattern.search(url) for pattern in self.blocked_url_patterns)
+
+    async def handle(self, route: Route) -> None:
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
+
+    async def attach(self, page: Page) -> None:
+        if page in self._pages:
+            return
+        await page.route("**/*", self.handle)
+        self._pages.add(page)
+
+    async def detach(self, page: Page) -> None:
+        if page not in self._pages:
+            return
+        await page.unroute("**/*", self.handle)
+        self._pages.discard(page)
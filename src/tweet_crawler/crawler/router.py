@@ -0,0 +1,60 @@
+import re
+import weakref
+from typing import TYPE_CHECKING, Final, Optional
+
+from playwright.async_api import Frame, Page, Response
+from typing_extensions import Self
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ._base import CrawlerBase
+
+GRAPHQL_PATTERN: Final[re.Pattern] = re.compile(
+    r"^https?://(?:(?:twitter|x)\.com/i/api|api\.(?:twitter|x)\.com)/graphql/[^/]+/"
+    r"(TweetDetail|TweetResultByRestId|Followers|Following)(?:\?.*)?$"
+)
+
+
+class ResponseRouter:
+    """Hands the GraphQL responses of one page to the crawler bound to it.
+
+    The router listens to ``response`` and ``framenavigated`` once for the
+    lifetime of the page; crawlers ``bind`` and ``unbind`` themselves instead
+    of adding listeners, so a page reused for many crawls matches every
+    response against ``GRAPHQL_PATTERN`` once, whatever ran on it before.
+    """
+
+    crawler: Optional["CrawlerBase"]
+
+    _routers: "weakref.WeakKeyDictionary[Page, ResponseRouter]" = (
+        weakref.WeakKeyDictionary()
+    )
+
+    def __init__(self):
+        self.crawler = None
+
+    @classmethod
+    def for_page(cls, page: Page) -> Self:
+        if (router := cls._routers.get(page)) is None:
+            router = cls._routers[page] = cls()
+            page.on("response", router.handle_response)
+            page.on("framenavigated", router.handle_redirection)
+        return router
+
+    def bind(self, crawler: "CrawlerBase") -> None:
+        self.crawler = crawler
+
+    def unbind(self, crawler: "CrawlerBase") -> None:
+        if self.crawler is crawler:
+            self.crawler = None
+
+    async def handle_response(self, response: Response) -> None:
+        if (crawler := self.crawler) is None:
+            return
+        if (match := GRAPHQL_PATTERN.match(response.url)) is None:
+            return
+        if crawler.handles(match[1]):
+            await crawler.handle_graphql(match[1], response)
+
+    async def handle_redirection(self, frame: Frame) -> None:
+        if (crawler := self.crawler) is not None:
+            await crawler.handle_redirection(frame)
@@ -1,12 +1,12 @@
-import json
 import re
-from typing import Final
+from typing import Any, Dict, Final, Optional, Tuple, Union
 
-from playwright.async_api import Frame
+from playwright.async_api import Frame, Page, Request, Response
 
 from ..exception import TweetUnavailable
 from ..model import Tweet, TweetTombstone
 from ._base import StaticCrawler
+from .direct import GraphQLTemplate
 
 TWEET_DETAIL_PATTERN: Final[re.Pattern] = re.compile(
     r"^https?://(?:twitter|x)\.com/i/api/graphql/[^/]+/TweetDetail(\?.*)?$"
@@ -14,33 +14,128 @@ TWEET_DETAIL_PATTERN: Final[re.Pattern] = re.compile(
 TWEET_BY_ID_PATTERN: Final[re.Pattern] = re.compile(
     r"^https?://api\.(?:twitter|x)\.com/graphql/[^/]+/TweetResultByRestId(\?.*)?$"
 )
+ENDPOINTS: Final[Tuple[str, ...]] = ("TweetDetail", "TweetResultByRestId")
+STATUS_ID_PATTERN: Final[re.Pattern] = re.compile(r"/status(?:es)?/(\d+)")
 
 
 class TwitterStatusCrawler(StaticCrawler[Tweet]):
+    endpoint: str = "TweetDetail"
+    ENDPOINTS: Tuple[str, ...] = ENDPOINTS
+    DECODE_PATHS: Tuple[Tuple[str, ...], ...] = (
+        ("data", "threaded_conversation_with_injections_v2", "instructions"),
+        ("data", "tweetResult"),
+    )
+
+    template: Optional[GraphQLTemplate]
+    graphql_request: Optional[Request]
+    lazy_threads: bool
+
+    def __init__(
+        self,
+        page: Page,
+        url: str,
+        template: Optional[GraphQLTemplate] = None,
+        lazy_threads: bool = False,
+        **kwargs,
+    ):
+        super().__init__(page=page, url=url, **kwargs)
+        self.template = template
+        self.lazy_threads = lazy_threads
+        self.graphql_request = None
+
+    @property
+    def tweet_id(self) -> int:
+        if (match := STATUS_ID_PATTERN.search(self.url)) is None:
+            raise ValueError(f"No tweet id in {self.url}")
+        return int(match[1])
+
+    async def capture_template(self) -> GraphQLTemplate:
+        if self.graphql_request is None:
+            raise RuntimeError("No GraphQL request has been intercepted yet")
+        return await GraphQLTemplate.from_request(self.graphql_request)
+
+    async def _run(self) -> Tweet:
+        if self.run_stored():
+            return self.result
+        if not await self.run_cached():
+            if self.template is None:
+                return await super()._run()
+            endpoint = self.template.operation
+            body = await self.template.fetch(
+                self.page.request,
+                self.template.for_tweet(self.tweet_id),
+                rate_limiter=self.rate_limiter,
+                account=self.account,
+            )
+            await self.consume(endpoint, body)
+        if self.exception_signal.is_set():
+            raise self.exception
+        return self.result
+
+    def run_stored(self) -> bool:
+        """Take the stored copy of the tweet if its conversation is fresh."""
+        if self.store is None:
+            return False
+        if (tweet := self.store.fresh_tweet(self.tweet_id)) is None:
+            return False
+        self.result = tweet
+        self.from_store = True
+        return True
+
+    async def run_cached(self) -> bool:
+        if self.cache is None:
+            return False
+        key = str(self.tweet_id)
+        for endpoint in ENDPOINTS:
+            if (reason := self.cache.get_unavailable(endpoint, key)) is not None:
+                self.exception = TweetUnavailable(reason)
+                self.exception_signal.set()
+                return True
+            if (body := self.cache.get(endpoint, key)) is not None:
+                await self.ingest(body)
+                return True
+        return False
+
+    async def consume(self, endpoint: str, body: bytes) -> None:
+        await self.ingest(body)
+        if self.cache is None:
+            return
+        key = str(self.tweet_id)
+        if not self.exception_signal.is_set():
+            self.cache.put(endpoint, key, body)
+        elif isinstance(self.exception, TweetUnavailable):
+            self.cache.put_unavailable(endpoint, key, str(self.exception))
+
     async def handle_redirection(self, frame: Frame) -> None:
         pass
 
-    async def handle_response(self, response) -> None:
-        if TWEET_DETAIL_PATTERN.match(response.url) or TWEET_BY_ID_PATTERN.match(
-            response.url
-        ):
-            try:
-                await self.parse(json.loads(await response.body()))
-            except Exception as e:  # pragma: no cover
-                self.exception = e
-                self.exception_signal.set()
-            finally:
-                self.done_signal.set()
+    async def handle_response(self, response: Response) -> None:
+        if TWEET_DETAIL_PATTERN.match(response.url):
+            await self.handle_graphql("TweetDetail", response)
+        elif TWEET_BY_ID_PATTERN.match(response.url):
+            await self.handle_graphql("TweetResultByRestId", response)
+
+    async def handle_graphql(self, endpoint: str, response: Response) -> None:
+        self.graphql_request = response.request
+        try:
+            self.observe(endpoint, response)
+            await self.consume(endpoint, await response.body())
+        except Exception as e:  # pragma: no cover
+            self.exception = e
+            self.exception_signal.set()
+        finally:
+            self.done_signal.set()
 
-    async def parse(self, content: dict) -> None:
+    @classmethod
+    def convert(
+        cls, content: dict, lazy_threads: bool = False, **options
+    ) -> Union[Tweet, TweetUnavailable]:
         data = content["data"]
 
         if "tweetResult" in data:
             result = data["tweetResult"]["result"]
             if result["__typename"] == "TweetUnavailable":
-                self.exception = TweetUnavailable(result["reason"])
-                self.exception_signal.set()
-                return
+                return TweetUnavailable(result["reason"])
             else:
                 tweet_result = data["tweetResult"]["result"]
                 parsed = Tweet.from_result(
@@ -48,13 +143,22 @@ class TwitterStatusCrawler(StaticCrawler[Tweet]):
                 )
         elif "threaded_conversation_with_injections_v2" in data:
             parsed = Tweet.from_instructions(
-                data["threaded_conversation_with_injections_v2"]["instructions"]
+                data["threaded_conversation_with_injections_v2"]["instructions"],
+                lazy=lazy_threads,
             )
         else:  # pragma: no cover
             raise ValueError("Invalid tweet data")
 
         if isinstance(parsed, TweetTombstone):
-            self.exception = TweetUnavailable(parsed.text)
+            return TweetUnavailable(parsed.text)
+        return parsed
+
+    def convert_options(self) -> Dict[str, Any]:
+        return {"lazy_threads": self.lazy_threads}
+
+    async def apply(self, converted: Union[Tweet, TweetUnavailable]) -> None:
+        if isinstance(converted, TweetUnavailable):
+            self.exception = converted
             self.exception_signal.set()
         else:
-            self.result = parsed
+            self.result = converted
@@ -0,0 +1,259 @@
+import json
+import re
+from contextlib import suppress
+from typing import Any, Callable, Final, List, Optional, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Selective decoding skips at most this many bytes of siblings with the
+# (slow) Python scanner before deciding a path cannot be cut out cheaply.
+SCAN_LIMIT: Final[int] = 4 * 1024
+
+_STRUCTURE: Final[re.Pattern] = re.compile(rb'[{}\[\]"]')
+_SCALAR_END: Final[re.Pattern] = re.compile(rb"[,}\]\s]")
+_WHITESPACE: Final[re.Pattern] = re.compile(rb"[ \t\r\n]*")
+_QUOTE: Final[int] = ord('"')
+_BACKSLASH: Final[int] = ord("\\")
+_OPENERS: Final[bytes] = b"{["
+_CLOSERS: Final[bytes] = b"}]"
+_SPACES: Final[bytes] = b" \t\r\n"
+
+
+def loads_stdlib(body: bytes) -> Any:
+    return json.loads(body)
+
+
+def loads_orjson(body: bytes) -> Any:
+    if orjson is None:  # pragma: no cover
+        raise RuntimeError("orjson is not installed")
+    return orjson.loads(body)
+
+
+class _Unselectable(Exception):
+    """A path is missing, ambiguous or too costly to cut out of a body."""
+
+
+def _escaped(body: bytes, index: int) -> bool:
+    start = index
+    while start > 0 and body[start - 1] == _BACKSLASH:
+        start -= 1
+    return (index - start) % 2 == 1
+
+
+def _closes(first: int, last: int) -> bool:
+    """Whether a value starting with the byte ``first`` may end with ``last``."""
+    if first in _OPENERS:
+        return last == _CLOSERS[_OPENERS.index(first)]
+    if first == _QUOTE:
+        return last == _QUOTE
+    return last not in _CLOSERS and last != _QUOTE
+
+
+class _Scanner:
+    """Finds the exact bytes of the value at a key path in a JSON body.
+
+    The body is only scanned forward up to the path, and backward over what
+    follows it, tracking nesting and strings so that a key only matches as a
+    direct child of the object before it. The value itself is never scanned.
+    """
+
+    body: bytes
+    limit: int
+
+    def __init__(self, body: bytes, limit: int = SCAN_LIMIT):
+        self.body = body
+        self.limit = limit
+
+    def skip(self, index: int) -> int:
+        return _WHITESPACE.match(self.body, index).end()  # type: ignore
+
+    def skip_back(self, index: int) -> int:
+        """The index of the last non-whitespace byte before ``index``."""
+        index -= 1
+        while index >= 0 and self.body[index] in _SPACES:
+            index -= 1
+        if index < 0:
+            raise _Unselectable
+        return index
+
+    def string_end(self, index: int) -> int:
+        """The index after the string starting at ``index``."""
+        end = index
+        while True:
+            if (end := self.body.find(b'"', end + 1)) < 0:
+                raise _Unselectable
+            if not _escaped(self.body, end):
+                return end + 1
+
+    def string_start(self, index: int) -> int:
+        """The index of the opening quote of the string ending at ``index``."""
+        start = index
+        while True:
+            if (start := self.body.rfind(b'"', 0, start)) < 0:
+                raise _Unselectable
+            if not _escaped(self.body, start):
+                return start
+
+    def value_end(self, index: int) -> int:
+        """The index after the value starting at ``index``."""
+        body = self.body
+        first = body[index]
+        if first == _QUOTE:
+            return self.string_end(index)
+        if first not in _OPENERS:
+            match = _SCALAR_END.search(body, index)
+            return len(body) if match is None else match.start()
+        depth = 0
+        stop = min(index + self.limit, len(body))
+        while match := _STRUCTURE.search(body, index, stop):
+            index = match.start()
+            if body[index] == _QUOTE:
+                index = self.string_end(index)
+                continue
+            depth += 1 if body[index] in _OPENERS else -1
+            index += 1
+            if depth == 0:
+                return index
+        raise _Unselectable
+
+    def value_start(self, index: int) -> int:
+        """The start of the value whose last byte is at ``index``."""
+        body = self.body
+        last = body[index]
+        if last == _QUOTE:
+            return self.string_start(index)
+        if last not in _CLOSERS:
+            while index > 0 and body[index - 1] not in b",:[{ \t\r\n":
+                index -= 1
+            return index
+        # Search the scan window reversed: index ``i`` in it is ``index - i``.
+        window = body[max(index - self.limit, 0) : index + 1][::-1]
+        position = depth = 0
+        while match := _STRUCTURE.search(window, position):
+            start = index - match.start()
+            if body[start] == _QUOTE:
+                position = index - self.string_start(start) + 1
+                continue
+            depth += 1 if body[start] in _CLOSERS else -1
+            position = match.end()
+            if depth == 0:
+                return start
+        raise _Unselectable
+
+    def locate(self, path: Tuple[str, ...]) -> Tuple[int, int]:
+        """The start and end index of the value at ``path``."""
+        body = self.body
+        keys: List[int] = []
+        index = self.skip(0)
+        for key in path:
+            if body[index : index + 1] != b"{":
+                raise _Unselectable
+            target = json.dumps(key).encode()
+            index = self.skip(index + 1)
+            while True:
+                if body[index : index + 1] != b'"':
+                    raise _Unselectable
+                key_end = self.string_end(index)
+                colon = self.skip(key_end)
+                if body[colon : colon + 1] != b":":
+                    raise _Unselectable
+                if body[index:key_end] == target:
+                    keys.append(index)
+                    index = self.skip(colon + 1)
+                    break
+                comma = self.skip(self.value_end(self.skip(colon + 1)))
+                if body[comma : comma + 1] != b",":
+                    raise _Unselectable
+                index = self.skip(comma + 1)
+        if index >= len(body):
+            raise _Unselectable
+        return index, self.end(path, keys, body[index], self.skip_back(len(body)))
+
+    def end(
+        self, path: Tuple[str, ...], keys: List[int], first: int, closer: int
+    ) -> int:
+        """The index after the value of the member at ``keys[0]`` of the
+        object closed at ``closer``, whose deepest value starts with the byte
+        ``first``.
+
+        Members after it are walked back over, last first. One that ends the
+        way the path does is taken for the path itself without being scanned
+        (the final decode verifies it); it is only scanned, to be skipped as a
+        sibling, if descending into it fails.
+        """
+        body = self.body
+        if body[closer] != ord("}"):
+            raise _Unselectable
+        target = json.dumps(path[0]).encode()
+        last = self.skip_back(closer)
+        while True:
+            if _closes(ord("{") if len(path) > 1 else first, body[last]):
+                with suppress(_Unselectable):
+                    if len(path) == 1:
+                        return last + 1
+                    return self.end(path[1:], keys[1:], first, last)
+            colon = self.skip_back(self.value_start(last))
+            if body[colon] != ord(":"):
+                raise _Unselectable
+            key_end = self.skip_back(colon)
+            if body[key_end] != _QUOTE:
+                raise _Unselectable
+            key_start = self.string_start(key_end)
+            if key_start <= keys[0] or body[key_start : key_end + 1] == target:
+                # The member itself failed to descend, or a duplicate key.
+                raise _Unselectable
+            comma = self.skip_back(key_start)
+            if body[comma] != ord(","):
+                raise _Unselectable
+            last = self.skip_back(comma)
+
+
+class Decoder:
+    """Turns GraphQL response bodies into Python objects.
+
+    Uses ``orjson`` when it is installed and the standard library otherwise.
+    In selective mode only the subtree at one of the given key paths is
+    decoded and returned wrapped in its path, e.g. ``{"data": {"tweetResult":
+    ...}}``; siblings of the path are skipped without being materialised. The
+    full body is decoded if no path is found, if a key of the path appears
+    twice in the same object, or if the siblings are too large to skip.
+    """
+
+    loads: Callable[[bytes], Any]
+    selective: bool
+    scan_limit: int
+
+    def __init__(
+        self,
+        loads: Optional[Callable[[bytes], Any]] = None,
+        selective: bool = False,
+        scan_limit: int = SCAN_LIMIT,
+    ):
+        self.loads = loads or (loads_stdlib if orjson is None else loads_orjson)
+        self.selective = selective
+        self.scan_limit = scan_limit
+
+    def select(self, body: bytes, paths: Sequence[Tuple[str, ...]]) -> Optional[Any]:
+        scanner = _Scanner(body, self.scan_limit)
+        for path in paths:
+            try:
+                start, end = scanner.locate(path)
+                content = self.loads(body[start:end])
+            except (_Unselectable, IndexError, ValueError):
+                continue
+            for key in reversed(path):
+                content = {key: content}
+            return content
+        return None
+
+    def decode(self, body: bytes, paths: Sequence[Tuple[str, ...]] = ()) -> Any:
+        if self.selective and paths:
+            if (content := self.select(body, paths)) is not None:
+                return content
+        return self.loads(body)
+
+
+DEFAULT_DECODER: Final[Decoder] = Decoder()
@@ -8,3 +8,23 @@ class NotAuthenticated(TwitterException, PermissionError):
 
 class TweetUnavailable(TwitterException, PermissionError):
     ...
+
+
+class CrawlCancelled(TwitterException):
+    ...
+
+
+class CrawlTimeout(CrawlCancelled, TimeoutError):
+    ...
+
+
+class RateLimited(TwitterException):
+    endpoint: str
+    account: str
+    reset: float
+
+    def __init__(self, endpoint: str, account: str, reset: float):
+        super().__init__(f"{endpoint} is rate limited for {account} until {reset:.0f}")
+        self.endpoint = endpoint
+        self.account = account
+        self.reset = reset
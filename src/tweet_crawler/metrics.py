@@ -0,0 +1,267 @@
+import json
+import time
+import warnings
+from collections import deque
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Final,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+TIMINGS: Final[Dict[str, str]] = {
+    "duration": "Time from the start to the end of a crawl.",
+    "navigation_time": "Time spent in page.goto.",
+    "first_response_time": "Time until the first matching GraphQL response.",
+    "throttle_time": "Time spent waiting for the rate limiter.",
+    "decode_time": "Time spent decoding response bodies.",
+    "parse_time": "Time spent parsing decoded responses.",
+    "queue_wait_time": "Time parsed pages waited for a slow consumer.",
+}
+COUNTERS: Final[Dict[str, str]] = {
+    "responses": "Matching GraphQL responses handled.",
+    "response_bytes": "Bytes of matching GraphQL responses.",
+    "pages": "Timeline pages yielded.",
+    "scrolls": "Scrolls to load more of a timeline.",
+    "rescrolls": "Scrolls repeated because the previous one loaded nothing.",
+    "retries": "Crawls retried on another account.",
+}
+
+
+class CrawlMetrics:
+    """Where the time of one crawl went.
+
+    Timings are in seconds; ``first_response_time`` is counted from the start
+    of the crawl, ``parse_time`` leaves out the time ``feed`` spent waiting
+    for a slow consumer, which is ``queue_wait_time``. ``rescrolls`` are the
+    scrolls repeated because the previous one brought no response, and
+    ``retries`` the attempts a pool made on other accounts before this one.
+    """
+
+    crawler: str
+    url: str
+    account: str
+    started_at: Optional[float]
+    error: Optional[str]
+
+    duration: Optional[float]
+    navigation_time: Optional[float]
+    first_response_time: Optional[float]
+    throttle_time: float
+    decode_time: float
+    parse_time: float
+    queue_wait_time: float
+
+    responses: int
+    response_bytes: int
+    pages: int
+    scrolls: int
+    rescrolls: int
+    retries: int
+
+    _start: Optional[float]
+
+    def __init__(self, crawler: str, url: str, account: str):
+        self.crawler = crawler
+        self.url = url
+        self.account = account
+        self.started_at = None
+        self.error = None
+        self.duration = None
+        self.navigation_time = None
+        self.first_response_time = None
+        self.throttle_time = 0.0
+        self.decode_time = 0.0
+        self.parse_time = 0.0
+        self.queue_wait_time = 0.0
+        self.responses = 0
+        self.response_bytes = 0
+        self.pages = 0
+        self.scrolls = 0
+        self.rescrolls = 0
+        self.retries = 0
+        self._start = None
+
+    def start(self) -> bool:
+        """Start the clock, returning ``False`` if it was already started."""
+        if self._start is not None:
+            return False
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        return True
+
+    def finish(self, error: Optional[BaseException] = None) -> bool:
+        """Stop the clock, returning ``False`` if it was already stopped."""
+        if self._start is None or self.duration is not None:
+            return False
+        self.duration = time.perf_counter() - self._start
+        if error is not None:
+            self.error = type(error).__name__
+        return True
+
+    def response(self, size: int) -> None:
+        if self.first_response_time is None and self._start is not None:
+            self.first_response_time = time.perf_counter() - self._start
+        self.responses += 1
+        self.response_bytes += size
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "crawler": self.crawler,
+            "url": self.url,
+            "account": self.account,
+            "started_at": self.started_at,
+            "error": self.error,
+            **{name: getattr(self, name) for name in (*TIMINGS, *COUNTERS)},
+        }
+
+
+@contextmanager
+def stopwatch(metrics: CrawlMetrics, field: str) -> Iterator[None]:
+    """Add the time spent in the block to a timing of ``metrics``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(
+            metrics,
+            field,
+            (getattr(metrics, field) or 0.0) + time.perf_counter() - start,
+        )
+
+
+class _Summary:
+    count: int
+    total: float
+    max: float
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+
+class _Aggregate:
+    crawls: int
+    errors: Dict[str, int]
+    timings: Dict[str, _Summary]
+    counters: Dict[str, int]
+
+    def __init__(self):
+        self.crawls = 0
+        self.errors = {}
+        self.timings = {name: _Summary() for name in TIMINGS}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    def add(self, metrics: CrawlMetrics) -> None:
+        self.crawls += 1
+        if metrics.error is not None:
+            self.errors[metrics.error] = self.errors.get(metrics.error, 0) + 1
+        for name, summary in self.timings.items():
+            if (value := getattr(metrics, name)) is not None:
+                summary.add(value)
+        for name in self.counters:
+            self.counters[name] += getattr(metrics, name)
+
+
+class MetricsRecorder:
+    """Collects the ``CrawlMetrics`` of finished crawls.
+
+    Pass one instance to every crawler (or to ``CrawlerPool``) as
+    ``recorder``. Every finished crawl is handed to the ``hooks`` and added to
+    per-crawler totals, which can be exported as Prometheus text or JSON.
+    The last ``keep`` crawls are kept as they are.
+    """
+
+    hooks: List[Callable[[CrawlMetrics], Any]]
+    recent: Deque[CrawlMetrics]
+
+    _aggregates: Dict[str, _Aggregate]
+
+    def __init__(
+        self,
+        hooks: Sequence[Callable[[CrawlMetrics], Any]] = (),
+        keep: int = 100,
+    ):
+        self.hooks = list(hooks)
+        self.recent = deque(maxlen=keep)
+        self._aggregates = {}
+
+    def add_hook(self, hook: Callable[[CrawlMetrics], Any]) -> None:
+        self.hooks.append(hook)
+
+    def record(self, metrics: CrawlMetrics) -> None:
+        if (aggregate := self._aggregates.get(metrics.crawler)) is None:
+            aggregate = self._aggregates[metrics.crawler] = _Aggregate()
+        aggregate.add(metrics)
+        self.recent.append(metrics)
+        for hook in self.hooks:
+            try:
+                hook(metrics)
+            except Exception as e:
+                # A broken hook must not replace the outcome of the crawl.
+                warnings.warn(f"Metrics hook {hook!r} failed: {e!r}", RuntimeWarning)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "crawlers": {
+                crawler: {
+                    "crawls": aggregate.crawls,
+                    "errors": dict(aggregate.errors),
+                    **{
+                        name: {"count": s.count, "sum": s.total, "max": s.max}
+                        for name, s in aggregate.timings.items()
+                    },
+                    **aggregate.counters,
+                }
+                for crawler, aggregate in self._aggregates.items()
+            },
+            "recent": [metrics.as_dict() for metrics in self.recent],
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "tweet_crawler") -> str:
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help: str) -> str:
+            lines.append(f"# HELP {prefix}_{name} {help}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            return f"{prefix}_{name}"
+
+        items = sorted(self._aggregates.items())
+        metric = family("crawls_total", "counter", "Finished crawls.")
+        for crawler, aggregate in items:
+            lines.append(f'{metric}{{crawler="{crawler}"}} {aggregate.crawls}')
+        metric = family(
+            "errors_total", "counter", "Crawls that failed or were cut short, by error."
+        )
+        for crawler, aggregate in items:
+            for error, count in sorted(aggregate.errors.items()):
+                lines.append(f'{metric}{{crawler="{crawler}",error="{error}"}} {count}')
+        for timing, help in TIMINGS.items():
+            metric = family(f"{timing.removesuffix('_time')}_seconds", "summary", help)
+            for crawler, aggregate in items:
+                summary = aggregate.timings[timing]
+                lines.append(f'{metric}_sum{{crawler="{crawler}"}} {summary.total!r}')
+                lines.append(f'{metric}_count{{crawler="{crawler}"}} {summary.count}')
+        for counter, help in COUNTERS.items():
+            metric = family(f"{counter}_total", "counter", help)
+            for crawler, aggregate in items:
+                lines.append(
+                    f'{metric}{{crawler="{crawler}"}} {aggregate.counters[counter]}'
+                )
+        return "\n".join(lines) + "\n"
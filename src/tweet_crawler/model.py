@@ -1,12 +1,81 @@
-from datetime import datetime
-from typing import Annotated, List, Literal, Optional, Union
-
-from pydantic import AnyHttpUrl, BaseModel, BeforeValidator, Field, model_validator
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from functools import cache, lru_cache
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Final,
+    Hashable,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Union,
+    overload,
+)
+
+from pydantic import (
+    AnyHttpUrl,
+    BaseModel,
+    BeforeValidator,
+    Field,
+    SerializerFunctionWrapHandler,
+    field_serializer,
+    model_validator,
+)
 from typing_extensions import Self
 
+TWITTER_DATETIME_FORMAT: Final[str] = "%a %b %d %H:%M:%S %z %Y"
+TWITTER_DATETIME_PATTERN: Final[re.Pattern] = re.compile(
+    r"(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun) "
+    r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) "
+    r"([0-9]{2}) ([0-9]{2}):([0-9]{2}):([0-9]{2}) "
+    r"([+-][0-9]{2}[0-5][0-9]) ([0-9]{4})"
+)
+_MONTHS: Final[Dict[str, int]] = {
+    month: index
+    for index, month in enumerate(
+        "Jan Feb Mar Apr May Jun Jul Aug Sep Oct Nov Dec".split(), start=1
+    )
+}
+
+
+@lru_cache(maxsize=None)
+def _timezone(offset: str) -> timezone:
+    delta = timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5]))
+    return timezone(-delta if offset[0] == "-" else delta)
+
+
+@lru_cache(maxsize=16384)
+def parse_twitter_datetime(v: str) -> datetime:
+    """Parse Twitter's ``Wed Oct 10 20:19:24 +0000 2018`` timestamps.
+
+    Equivalent to ``strptime`` with ``TWITTER_DATETIME_FORMAT``, which is
+    still used for anything not in the exact layout Twitter sends.
+    """
+    if (match := TWITTER_DATETIME_PATTERN.fullmatch(v)) is None:
+        return datetime.strptime(v, TWITTER_DATETIME_FORMAT)
+    month, day, hour, minute, second, offset, year = match.groups()
+    return datetime(
+        int(year),
+        _MONTHS[month],
+        int(day),
+        int(hour),
+        int(minute),
+        int(second),
+        tzinfo=_timezone(offset),
+    )
 
-def _twitter_datetime(v: str) -> datetime:
-    return datetime.strptime(v, "%a %b %d %H:%M:%S %z %Y")
+
+def _twitter_datetime(v: Union[str, datetime]) -> datetime:
+    if isinstance(v, datetime):
+        return v
+    return parse_twitter_datetime(v)
 
 
 class TwitterEntity(BaseModel):
@@ -97,9 +166,12 @@ class TwitterEntityUserMention(TwitterEntity):
 class TwitterEntities(BaseModel):
     hashtags: List[TwitterEntityHashTag] = Field(default_factory=list)
     media: List[
-        TwitterEntityMediaPhoto
-        | TwitterEntityMediaVideo
-        | TwitterEntityMediaAnimatedGif
+        Annotated[
+            TwitterEntityMediaPhoto
+            | TwitterEntityMediaVideo
+            | TwitterEntityMediaAnimatedGif,
+            Field(discriminator="type"),
+        ]
     ] = Field(default_factory=list)
     symbols: List[TwitterEntitySymbol] = Field(default_factory=list)
     timestamps: List[TwitterEntityTimestamp] = Field(default_factory=list)
@@ -112,7 +184,58 @@ class UserEntities(BaseModel):
     url: TwitterEntities = TwitterEntities()
 
 
+class UserCache:
+    """Bounded LRU cache that hands out one shared ``TwitterUser`` per content.
+
+    Keys combine the user's ``rest_id`` with a fingerprint of the fields parsed
+    from the response, so a changed profile or counter yields a new object.
+    """
+
+    maxsize: int
+    hits: int
+    misses: int
+
+    _users: "OrderedDict[Hashable, TwitterUser]"
+    _lock: threading.Lock
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def get(self, key: Hashable) -> "Optional[TwitterUser]":
+        with self._lock:
+            if (user := self._users.get(key)) is None:
+                self.misses += 1
+                return None
+            self._users.move_to_end(key)
+            self.hits += 1
+            return user
+
+    def put(self, key: Hashable, user: "TwitterUser") -> "TwitterUser":
+        with self._lock:
+            if self.maxsize <= 0:
+                return user
+            user = self._users.setdefault(key, user)
+            self._users.move_to_end(key)
+            while len(self._users) > self.maxsize:
+                self._users.popitem(last=False)
+            return user
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+            self.hits = self.misses = 0
+
+
 class TwitterUser(BaseModel):
+    cache: ClassVar[Optional[UserCache]] = UserCache()
+
     id: int
     name: str
     screen_name: str
@@ -202,7 +325,99 @@ class TwitterUser(BaseModel):
         if "created_at" not in validated_data or validated_data["created_at"] is None:
             validated_data["created_at"] = "Mon Jan 01 00:00:00 +0000 2020"  # 提供默认日期
 
-        return cls.model_validate(validated_data)
+        if cls.cache is None or "id" not in validated_data:
+            return cls.model_validate(validated_data)
+        key = (validated_data["id"], hash(repr(validated_data)))
+        if (user := cls.cache.get(key)) is None:
+            user = cls.cache.put(key, cls.model_validate(validated_data))
+        return user
+
+
+@cache
+def _unknown_user() -> TwitterUser:
+    return TwitterUser.model_validate(
+        {
+            "id": 0,
+            "name": "Unknown User",
+            "screen_name": "unknown",
+            "description": "",
+            "verified": False,
+            "created_at": "Mon Jan 01 00:00:00 +0000 2020",
+            "entities": {"description": {"urls": []}, "url": {"urls": []}},
+            "profile_image_url_https": "https://abs.twimg.com/sticky/default_profile_images/default_profile_normal.png",  # noqa: E501
+            "followers_count": 0,
+            "friends_count": 0,
+            "listed_count": 0,
+            "favourites_count": 0,
+            "statuses_count": 0,
+        }
+    )
+
+
+class LazyThreads(Sequence[List[Union["Tweet", "TweetTombstone"]]]):
+    """Conversation threads kept as raw timeline entries until first access.
+
+    Each thread is parsed into ``Tweet``/``TweetTombstone`` objects the first
+    time it is indexed or iterated, and cached afterwards.
+    """
+
+    _entries: List[List[dict]]
+    _threads: List[Optional[List[Union["Tweet", "TweetTombstone"]]]]
+    _from_entry: Callable[[dict], List[Union["Tweet", "TweetTombstone"]]]
+
+    def __init__(
+        self,
+        entries: List[List[dict]],
+        from_entry: Callable[[dict], List[Union["Tweet", "TweetTombstone"]]],
+    ):
+        self._entries = entries
+        self._threads = [None] * len(entries)
+        self._from_entry = from_entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _thread(self, index: int) -> List[Union["Tweet", "TweetTombstone"]]:
+        if (thread := self._threads[index]) is None:
+            thread = [t for e in self._entries[index] for t in self._from_entry(e)]
+            self._threads[index] = thread
+            self._entries[index] = []
+        return thread
+
+    @overload
+    def __getitem__(self, index: int) -> List[Union["Tweet", "TweetTombstone"]]:
+        ...
+
+    @overload
+    def __getitem__(
+        self, index: slice
+    ) -> List[List[Union["Tweet", "TweetTombstone"]]]:
+        ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._thread(i) for i in range(len(self))[index]]
+        return self._thread(range(len(self))[index])
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, LazyThreads)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"<LazyThreads {self.parsed}/{len(self)} parsed>"
+
+    @property
+    def parsed(self) -> int:
+        return sum(thread is not None for thread in self._threads)
+
+
+def _serialize_threads(
+    value: Sequence[List[Union["Tweet", "TweetTombstone"]]],
+    handler: SerializerFunctionWrapHandler,
+) -> Any:
+    # Materializes lazy threads, as the list serializer only accepts lists.
+    return handler(value if isinstance(value, list) else list(value))
 
 
 class TweetTombstone(BaseModel):
@@ -212,6 +427,10 @@ class TweetTombstone(BaseModel):
     )
     text: str
 
+    @field_serializer("conversation_threads", mode="wrap")
+    def serialize_threads(self, value, handler: SerializerFunctionWrapHandler):
+        return _serialize_threads(value, handler)
+
 
 class Tweet(BaseModel):
     id: int = Field(alias="id_str")
@@ -235,12 +454,25 @@ class Tweet(BaseModel):
     favorited: bool  # noqa
     retweeted: bool
 
+    @field_serializer("conversation_threads", mode="wrap")
+    def serialize_threads(self, value, handler: SerializerFunctionWrapHandler):
+        return _serialize_threads(value, handler)
+
     @property
     def text(self) -> str:
         return self.full_text[self.display_text_range[0] : self.display_text_range[1]]
 
     @classmethod
-    def from_instructions(cls, result: List[dict]) -> Union["Tweet", "TweetTombstone"]:
+    def from_instructions(
+        cls, result: List[dict], lazy: bool = False
+    ) -> Union["Tweet", "TweetTombstone"]:
+        """Parse a ``TweetDetail`` timeline into its focal tweet.
+
+        With ``lazy``, replies are only parsed when ``conversation_threads`` is
+        accessed, one thread at a time.
+        """
+        if lazy:
+            return cls._from_instructions_lazy(result)
         base_tweet = None
         for instruction in result:
             if instruction["type"] == "TimelineAddEntries":
@@ -256,6 +488,29 @@ class Tweet(BaseModel):
         assert base_tweet
         return base_tweet
 
+    @classmethod
+    def _from_instructions_lazy(
+        cls, result: List[dict]
+    ) -> Union["Tweet", "TweetTombstone"]:
+        base_tweet = None
+        for instruction in result:
+            if instruction["type"] == "TimelineAddEntries":
+                entries: List[dict] = instruction["entries"]
+                base_tweet = cls.from_entry(entries.pop(0))[0]
+                threads: List[List[dict]] = []
+                for entry in entries:
+                    if entry["entryId"].startswith("tweet-"):
+                        if not threads:
+                            threads.append([])
+                        threads[0].append(entry)
+                    if entry["entryId"].startswith("conversationthread-"):
+                        threads.append([entry])
+                base_tweet.conversation_threads = LazyThreads(  # type: ignore
+                    threads, cls.from_entry
+                )
+        assert base_tweet
+        return base_tweet
+
     @classmethod
     def from_entry(cls, result: dict) -> List[Union["Tweet", "TweetTombstone"]]:
         content = result["content"]
@@ -300,39 +555,11 @@ class Tweet(BaseModel):
                 user_data = TwitterUser.from_result(result["legacy"]["user"])
             else:
                 # 如果找不到用户数据，创建一个最小化的默认用户
-                user_data = TwitterUser.model_validate({
-                    "id": 0,
-                    "name": "Unknown User",
-                    "screen_name": "unknown",
-                    "description": "",
-                    "verified": False,
-                    "created_at": "Mon Jan 01 00:00:00 +0000 2020",
-                    "entities": {"description": {"urls": []}, "url": {"urls": []}},
-                    "profile_image_url_https": "https://abs.twimg.com/sticky/default_profile_images/default_profile_normal.png",
-                    "followers_count": 0,
-                    "friends_count": 0,
-                    "listed_count": 0,
-                    "favourites_count": 0,
-                    "statuses_count": 0
-                })
+                user_data = _unknown_user()
         except Exception as e:
             # 如果处理用户数据时出现任何异常，使用默认用户
             print(f"Error processing user data: {e}")
-            user_data = TwitterUser.model_validate({
-                "id": 0,
-                "name": "Unknown User",
-                "screen_name": "unknown",
-                "description": "",
-                "verified": False,
-                "created_at": "Mon Jan 01 00:00:00 +0000 2020",
-                "entities": {"description": {"urls": []}, "url": {"urls": []}},
-                "profile_image_url_https": "https://abs.twimg.com/sticky/default_profile_images/default_profile_normal.png",
-                "followers_count": 0,
-                "friends_count": 0,
-                "listed_count": 0,
-                "favourites_count": 0,
-                "statuses_count": 0
-            })
+            user_data = _unknown_user()
         
         # 构建推文数据
         tweet_data = result["legacy"] | {
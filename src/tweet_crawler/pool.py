@@ -0,0 +1,223 @@
+import asyncio
+from concurrent.futures import Executor
+from contextlib import aclosing, asynccontextmanager
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from playwright.async_api import Browser, BrowserContext, Page
+from typing_extensions import Self
+
+from .crawler._base import BLANK_URL, CrawlerBase, ScrollableCrawler
+from .crawler.resource import ResourceFilter
+from .metrics import MetricsRecorder
+from .ratelimit import RateLimiter
+from .sink import JsonlSink
+from .store import TweetStore
+
+_T = TypeVar("_T")
+_A = TypeVar("_A")
+
+
+class PoolSlot:
+    context: BrowserContext
+    page: Page
+    crawls: int
+
+    def __init__(self, context: BrowserContext, page: Page):
+        self.context = context
+        self.page = page
+        self.crawls = 0
+
+
+class CrawlerPool:
+    """Owns one browser and leases a fixed number of reusable pages to crawlers.
+
+    Every slot is a separate ``BrowserContext`` with its own page, so cookies
+    are applied once per slot and pages are reset to ``about:blank`` between
+    crawls instead of being recreated.
+    """
+
+    browser: Browser
+    size: int
+    cookies: List[Dict[str, Any]]
+    resource_filter: Optional[ResourceFilter]
+    rate_limiter: Optional[RateLimiter]
+    recorder: Optional[MetricsRecorder]
+    executor: Optional[Executor]
+    sink: Optional[JsonlSink]
+    store: Optional[TweetStore]
+    context_options: Dict[str, Any]
+
+    _slots: List[PoolSlot]
+    _idle: "asyncio.Queue[PoolSlot]"
+
+    def __init__(
+        self,
+        browser: Browser,
+        size: int = 4,
+        cookies: Optional[Sequence[Dict[str, Any]]] = None,
+        resource_filter: Optional[ResourceFilter] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        recorder: Optional[MetricsRecorder] = None,
+        executor: Optional[Executor] = None,
+        sink: Optional[JsonlSink] = None,
+        store: Optional[TweetStore] = None,
+        **context_options: Any,
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be positive")
+        self.browser = browser
+        self.size = size
+        self.cookies = list(cookies or [])
+        self.resource_filter = resource_filter
+        self.rate_limiter = rate_limiter
+        self.recorder = recorder
+        self.executor = executor
+        self.sink = sink
+        self.store = store
+        self.context_options = context_options
+        self._slots = []
+        self._idle = asyncio.Queue()
+
+    async def __aenter__(self) -> Self:
+        return await self.start()
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    async def _new_page(self, context: BrowserContext) -> Page:
+        page = await context.new_page()
+        if self.resource_filter is not None:
+            await self.resource_filter.attach(page)
+        return page
+
+    async def _new_slot(self) -> PoolSlot:
+        context = await self.browser.new_context(**self.context_options)
+        if self.cookies:
+            await context.add_cookies(self.cookies)  # type: ignore
+        return PoolSlot(context, await self._new_page(context))
+
+    async def _reset(self, slot: PoolSlot) -> PoolSlot:
+        try:
+            if slot.page.is_closed():
+                slot.page = await self._new_page(slot.context)
+            else:
+                await slot.page.goto(BLANK_URL)
+            return slot
+        except Exception:  # pragma: no cover
+            try:
+                await slot.context.close()
+            except Exception:
+                pass
+            fresh = await self._new_slot()
+            self._slots[self._slots.index(slot)] = fresh
+            return fresh
+
+    async def start(self) -> Self:
+        if self._slots:
+            return self
+        self._slots = list(
+            await asyncio.gather(*(self._new_slot() for _ in range(self.size)))
+        )
+        for slot in self._slots:
+            self._idle.put_nowait(slot)
+        return self
+
+    async def close(self) -> None:
+        for slot in self._slots:
+            await slot.context.close()
+        self._slots.clear()
+        self._idle = asyncio.Queue()
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncGenerator[Page, None]:
+        if not self._slots:
+            raise RuntimeError("CrawlerPool is not started")
+        slot = await self._idle.get()
+        try:
+            slot.crawls += 1
+            yield slot.page
+        finally:
+            self._idle.put_nowait(await self._reset(slot))
+
+    def crawler_options(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """``kwargs`` with the options the pool shares between its crawlers."""
+        shared = {
+            "rate_limiter": self.rate_limiter,
+            "recorder": self.recorder,
+            "executor": self.executor,
+            "sink": self.sink,
+            "store": self.store,
+        }
+        return {k: v for k, v in shared.items() if v is not None} | kwargs
+
+    async def crawl(self, crawler: Type[CrawlerBase[_T]], *args, **kwargs) -> _T:
+        async with self.lease() as page:
+            instance = crawler(page, *args, **self.crawler_options(kwargs))
+            try:
+                return await instance.run()
+            finally:
+                instance.detach()
+
+    async def stream(
+        self, crawler: Type[ScrollableCrawler[_T]], *args, **kwargs
+    ) -> AsyncGenerator[List[_T], None]:
+        """Run a scrollable crawl on a leased page, yielding its batches.
+
+        A crawl that runs out of time raises ``CrawlTimeout`` once the batches
+        parsed before its deadline have been yielded.
+        """
+        async with self.lease() as page:
+            instance = crawler(page, *args, **self.crawler_options(kwargs))
+            try:
+                async with aclosing(instance.run_yield()) as batches:
+                    async for batch in batches:
+                        yield batch
+                if instance.timed_out:
+                    raise instance.timeout_error()
+            finally:
+                instance.detach()
+
+    async def imap(
+        self, crawler: Type[CrawlerBase[_T]], args: Iterable[_A], **kwargs
+    ) -> AsyncGenerator[Tuple[_A, Union[_T, Exception]], None]:
+        pending = iter(args)
+        results: "asyncio.Queue[Optional[Tuple[_A, Union[_T, Exception]]]]" = (
+            asyncio.Queue(maxsize=self.size)
+        )
+
+        async def worker() -> None:
+            for arg in pending:
+                try:
+                    result: Union[_T, Exception] = await self.crawl(
+                        crawler, arg, **kwargs
+                    )
+                except Exception as e:
+                    result = e
+                await results.put((arg, result))
+            await results.put(None)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.size)]
+        running = len(workers)
+        try:
+            while running:
+                item = await results.get()
+                if item is None:
+                    running -= 1
+                    continue
+                yield item
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
@@ -0,0 +1,158 @@
+import asyncio
+import time
+from typing import Dict, Final, Mapping, Optional, Tuple
+
+from .exception import RateLimited
+
+DEFAULT_ACCOUNT: Final[str] = "default"
+WINDOW: Final[float] = 900.0
+
+
+class RateLimitBucket:
+    """Request budget of one endpoint for one account.
+
+    Follows the ``x-rate-limit-*`` headers of the last response and spreads
+    the remaining requests evenly over what is left of the window, keeping
+    ``reserve`` requests unused. Once the budget is spent, requests wait for
+    the window to reset.
+    """
+
+    reserve: int
+    window: float
+    limit: Optional[int]
+    remaining: Optional[int]
+    reset: float
+
+    _next: float
+
+    def __init__(self, reserve: int = 1, window: float = WINDOW):
+        self.reserve = reserve
+        self.window = window
+        self.limit = None
+        self.remaining = None
+        self.reset = 0.0
+        self._next = 0.0
+
+    @property
+    def budget(self) -> float:
+        """Requests left in the current window, or infinity if unknown."""
+        if self.remaining is None:
+            return float("inf")
+        if time.time() >= self.reset:
+            return float("inf") if self.limit is None else float(self.limit)
+        return float(max(self.remaining - self.reserve, 0))
+
+    def update(self, limit: Optional[int], remaining: int, reset: float) -> None:
+        if limit is not None:
+            self.limit = limit
+        if self.remaining is None or reset > self.reset:
+            self.remaining = remaining
+        else:
+            # Responses can arrive out of order; the lowest count is current.
+            self.remaining = min(self.remaining, remaining)
+        self.reset = max(self.reset, reset)
+
+    def exhaust(self, reset: float) -> None:
+        self.remaining = 0
+        self.reset = max(self.reset, reset)
+
+    def reserve_slot(self) -> float:
+        """Claim a request and return the wall-clock time it may be sent at."""
+        now = time.time()
+        if self.remaining is None:
+            return now
+        start = max(now, self._next)
+        if start < self.reset and self.remaining <= self.reserve:
+            start = self.reset
+        if start >= self.reset:
+            if self.limit is None:
+                self.remaining = None
+                return start
+            self.remaining = self.limit
+            self.reset = start + self.window
+        self._next = start + (self.reset - start) / max(
+            self.remaining - self.reserve, 1
+        )
+        self.remaining -= 1
+        return start
+
+
+class RateLimiter:
+    """Shared scheduler pacing crawlers by the rate limits X reports.
+
+    Pass one instance to every crawler (or to ``CrawlerPool``); it keeps a
+    ``RateLimitBucket`` per account and GraphQL endpoint, fed by the headers
+    of intercepted responses, and delays navigations and scrolls so that the
+    limits are approached but not hit.
+    """
+
+    reserve: int
+    max_delay: float
+    default_backoff: float
+
+    _buckets: Dict[Tuple[str, str], RateLimitBucket]
+
+    def __init__(
+        self, reserve: int = 1, max_delay: float = 900.0, default_backoff: float = 60.0
+    ):
+        self.reserve = reserve
+        self.max_delay = max_delay
+        self.default_backoff = default_backoff
+        self._buckets = {}
+
+    def bucket(self, endpoint: str, account: str = DEFAULT_ACCOUNT) -> RateLimitBucket:
+        if (bucket := self._buckets.get((account, endpoint))) is None:
+            bucket = self._buckets[account, endpoint] = RateLimitBucket(self.reserve)
+        return bucket
+
+    def budget(self, account: str = DEFAULT_ACCOUNT) -> float:
+        """Smallest remaining budget of any endpoint the account has used."""
+        return min(
+            (b.budget for (a, _), b in self._buckets.items() if a == account),
+            default=float("inf"),
+        )
+
+    async def acquire(self, endpoint: str, account: str = DEFAULT_ACCOUNT) -> None:
+        delay = self.bucket(endpoint, account).reserve_slot() - time.time()
+        if delay > self.max_delay:
+            raise RateLimited(endpoint, account, time.time() + delay)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def observe(
+        self,
+        endpoint: str,
+        status: int,
+        headers: Mapping[str, str],
+        account: str = DEFAULT_ACCOUNT,
+    ) -> None:
+        """Record a response, raising ``RateLimited`` if it was a 429."""
+        bucket = self.bucket(endpoint, account)
+        reset = _header(headers, "x-rate-limit-reset")
+        if status == 429:
+            bucket.exhaust(reset or time.time() + self.default_backoff)
+        check_rate_limit(endpoint, status, headers, account, self.default_backoff)
+        remaining = _header(headers, "x-rate-limit-remaining")
+        if remaining is not None and reset is not None:
+            limit = _header(headers, "x-rate-limit-limit")
+            bucket.update(None if limit is None else int(limit), int(remaining), reset)
+
+
+def check_rate_limit(
+    endpoint: str,
+    status: int,
+    headers: Mapping[str, str],
+    account: str = DEFAULT_ACCOUNT,
+    default_backoff: float = 60.0,
+) -> None:
+    """Raise ``RateLimited`` for a 429 response."""
+    if status == 429:
+        reset = _header(headers, "x-rate-limit-reset")
+        raise RateLimited(endpoint, account, reset or time.time() + default_backoff)
+
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[float]:
+    try:
+        return float(headers[name])
+    except (KeyError, ValueError):
+        return None
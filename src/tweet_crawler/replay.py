@@ -0,0 +1,136 @@
+import json
+import os
+import re
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Final, List, Optional, Union
+
+from playwright.async_api import Page, Response, Route
+from typing_extensions import Self
+
+GRAPHQL_PATTERN: Final[re.Pattern] = re.compile(
+    r"^https?://(?:api\.)?(?:twitter|x)\.com/(?:i/api/)?graphql/[^/]+/"
+    r"(?:TweetDetail|TweetResultByRestId|Followers|Following)(\?.*)?$"
+)
+STUB_DOCUMENT: Final[str] = (
+    '<!DOCTYPE html><html><body style="height: 100000px"><script>\n'
+    "const urls = %s;\n"
+    "let next = 0;\n"
+    "const load = () => { if (next < urls.length) fetch(urls[next++]); };\n"
+    'document.addEventListener("keydown", (e) => { if (e.key === "End") load(); });\n'
+    "load();\n"
+    "</script></body></html>\n"
+)
+
+
+class Cassette:
+    """GraphQL responses intercepted while crawling one page URL."""
+
+    url: str
+    responses: List[Dict[str, Any]]
+
+    def __init__(self, url: str, responses: Optional[List[Dict[str, Any]]] = None):
+        self.url = url
+        self.responses = responses or []
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> Self:
+        with open(path, "rb") as f:
+            data = json.load(f)
+        return cls(data["url"], data["responses"])
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"url": self.url, "responses": self.responses}, f)
+
+
+class Recorder:
+    """Saves the GraphQL responses a crawl intercepts as a replayable fixture.
+
+    Use it around a crawl on the same page::
+
+        async with Recorder(page, "tests/fixtures/status.json"):
+            await TwitterStatusCrawler(page, url).run()
+    """
+
+    page: Page
+    path: Path
+    cassette: Optional[Cassette]
+
+    def __init__(self, page: Page, path: Union[str, os.PathLike]):
+        self.page = page
+        self.path = Path(path)
+        self.cassette = None
+
+    async def __aenter__(self) -> Self:
+        self.page.on("response", self.handle_response)
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        self.page.remove_listener("response", self.handle_response)
+        if self.cassette is not None:
+            self.cassette.save(self.path)
+
+    async def handle_response(self, response: Response) -> None:
+        if not GRAPHQL_PATTERN.match(response.url):
+            return
+        if self.cassette is None:
+            self.cassette = Cassette(self.page.url)
+        self.cassette.responses.append(
+            {
+                "url": response.url,
+                "status": response.status,
+                "body": json.loads(await response.body()),
+            }
+        )
+
+
+class Replayer:
+    """Serves recorded cassettes to a page through ``page.route``, fully offline.
+
+    Navigating to a recorded page URL loads a stub document that requests the
+    first recorded GraphQL URL, and the next one every time ``End`` is
+    pressed, which is what the crawlers do to scroll. Any other request is
+    aborted.
+    """
+
+    cassettes: Dict[str, Cassette]
+
+    _pending: Dict[str, Deque[Dict[str, Any]]]
+
+    def __init__(self, *cassettes: Cassette):
+        self.cassettes = {c.url: c for c in cassettes}
+        self._pending = defaultdict(deque)
+        for cassette in cassettes:
+            for response in cassette.responses:
+                self._pending[response["url"]].append(response)
+
+    @classmethod
+    def from_directory(cls, directory: Union[str, os.PathLike]) -> Self:
+        return cls(*(Cassette.load(p) for p in sorted(Path(directory).glob("*.json"))))
+
+    async def attach(self, page: Page) -> None:
+        await page.route("**/*", self.handle)
+
+    async def detach(self, page: Page) -> None:
+        await page.unroute("**/*", self.handle)
+
+    async def handle(self, route: Route) -> None:
+        url = route.request.url
+        if (cassette := self.cassettes.get(url)) is not None:
+            urls = json.dumps([r["url"] for r in cassette.responses])
+            await route.fulfill(
+                status=200, content_type="text/html", body=STUB_DOCUMENT % urls
+            )
+        elif pending := self._pending.get(url):
+            response = pending.popleft()
+            pending.append(response)
+            await route.fulfill(
+                status=response["status"],
+                content_type="application/json",
+                headers={"access-control-allow-origin": "*"},
+                body=json.dumps(response["body"]),
+            )
+        else:
+            await route.abort()
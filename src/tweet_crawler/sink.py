@@ -0,0 +1,212 @@
+import gzip
+import json
+import os
+import re
+import zlib
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, List, Optional, Union
+
+from pydantic import BaseModel
+from typing_extensions import Self
+
+
+def _repair_plain(path: Path) -> None:
+    with open(path, "rb+") as f:
+        end = position = f.seek(0, os.SEEK_END)
+        while position > 0:
+            start = max(position - 64 * 1024, 0)
+            f.seek(start)
+            if (index := f.read(position - start).rfind(b"\n")) >= 0:
+                position = start + index + 1
+                break
+            position = start
+        if position < end:
+            f.truncate(position)
+
+
+def _repair_gzip(path: Path) -> None:
+    with open(path, "rb+") as f:
+        data = f.read()
+        offset = 0
+        while offset < len(data):
+            member = zlib.decompressobj(zlib.MAX_WBITS | 16)
+            try:
+                text = member.decompress(data[offset:])
+            except zlib.error:
+                text = b""
+            if not member.eof:
+                # Keep the complete lines of an unfinished member in a finished one.
+                f.seek(offset)
+                f.truncate()
+                if lines := text[: text.rfind(b"\n") + 1]:
+                    f.write(gzip.compress(lines))
+                return
+            offset = len(data) - len(member.unused_data)
+
+
+def repair(path: Union[str, os.PathLike], compress: bool = False) -> None:
+    """Drop what a crash left half-written at the end of a ``JsonlSink`` file.
+
+    A torn last line is cut off, and a gzip stream that was never finished
+    is rewritten with its complete lines, so that appending starts on a fresh
+    line and the file stays readable to the end.
+    """
+    path = Path(path)
+    if path.exists():
+        (_repair_gzip if compress else _repair_plain)(path)
+
+
+class JsonlSink:
+    """Writes crawled tweets and users to JSON Lines files as they are parsed.
+
+    Lines are collected in memory and written once ``buffer_size`` bytes are
+    pending, or on ``flush``. With ``compress`` (the default for paths ending
+    in ``.gz``) the files are gzip streams, flushed so that everything written
+    so far can already be decompressed. With ``max_bytes``, the output is
+    split into numbered parts next to ``path`` (``out.jsonl`` becomes
+    ``out.00000.jsonl``, ``out.00001.jsonl``, ...), starting a new part once
+    one has reached that size on disk. Existing output is appended to, after
+    dropping whatever a crash left half-written (see ``repair``).
+    """
+
+    path: Path
+    compress: bool
+    max_bytes: Optional[int]
+    buffer_size: int
+    records: int
+    files: List[Path]
+
+    _file: Optional[BinaryIO]
+    _stream: Optional[BinaryIO]
+    _buffer: List[bytes]
+    _pending: int
+    _part: int
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        compress: Optional[bool] = None,
+        max_bytes: Optional[int] = None,
+        buffer_size: int = 64 * 1024,
+    ):
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be positive")
+        self.path = Path(path)
+        self.compress = self.path.suffix == ".gz" if compress is None else compress
+        self.max_bytes = max_bytes
+        self.buffer_size = buffer_size
+        self.records = 0
+        self.files = []
+        self._file = None
+        self._stream = None
+        self._buffer = []
+        self._pending = 0
+        self._part = 0
+        if max_bytes is not None:
+            self._part = max(self._existing_parts(), default=0)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def _part_path(self, part: int) -> Path:
+        if self.max_bytes is None:
+            return self.path
+        stem, dot, suffixes = self.path.name.partition(".")
+        return self.path.with_name(f"{stem}.{part:05d}{dot}{suffixes}")
+
+    def _existing_parts(self) -> Iterable[int]:
+        stem, dot, suffixes = self.path.name.partition(".")
+        pattern = re.compile(
+            rf"{re.escape(stem)}\.(\d{{5}}){re.escape(dot + suffixes)}"
+        )
+        if not self.path.parent.is_dir():
+            return
+        for path in self.path.parent.iterdir():
+            if match := pattern.fullmatch(path.name):
+                yield int(match[1])
+
+    def _open(self) -> BinaryIO:
+        if self._stream is not None:
+            return self._stream
+        path = self._part_path(self._part)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path not in self.files:
+            repair(path, self.compress)
+        self._file = open(path, "ab")
+        self._stream = self._file
+        if self.compress:
+            # Appending adds another gzip member, which readers concatenate.
+            self._stream = gzip.GzipFile(fileobj=self._file, mode="ab")  # type: ignore
+        if path not in self.files:
+            self.files.append(path)
+        return self._stream
+
+    def _close_file(self) -> None:
+        if self._stream is not None and self._stream is not self._file:
+            self._stream.close()
+        if self._file is not None:
+            self._file.close()
+        self._file = self._stream = None
+
+    def write_line(self, line: Union[str, bytes]) -> None:
+        """Queue one already serialized JSON record."""
+        if isinstance(line, str):
+            line = line.encode()
+        self._buffer.append(line + b"\n")
+        self._pending += len(line) + 1
+        self.records += 1
+        if self._pending >= self.buffer_size:
+            self.flush()
+
+    def write(self, item: Any) -> None:
+        """Queue a ``Tweet``, ``TwitterUser`` or any JSON-serializable value."""
+        if isinstance(item, BaseModel):
+            self.write_line(item.model_dump_json())
+        else:
+            self.write_line(json.dumps(item, ensure_ascii=False))
+
+    def write_many(self, items: Iterable[Any]) -> None:
+        for item in items:
+            self.write(item)
+
+    def flush(self) -> None:
+        """Write the pending lines and make them visible to readers."""
+        if not self._buffer:
+            return
+        stream = self._open()
+        stream.write(b"".join(self._buffer))
+        self._buffer.clear()
+        self._pending = 0
+        stream.flush()
+        assert self._file is not None
+        self._file.flush()
+        if self.max_bytes is not None and self._file.tell() >= self.max_bytes:
+            self._close_file()
+            self._part += 1
+
+    def close(self) -> None:
+        self.flush()
+        self._close_file()
+
+
+def read_jsonl(path: Union[str, os.PathLike]) -> List[Any]:
+    """Read back the records of one file written by ``JsonlSink``.
+
+    A line cut short by a crash (or by a writer still running) is ignored.
+    """
+    path = Path(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    if path.suffix == ".gz":
+        chunks = []
+        while data:
+            member = zlib.decompressobj(zlib.MAX_WBITS | 16)
+            chunks.append(member.decompress(data))
+            if not member.eof:  # a stream that is still being written
+                break
+            data = member.unused_data
+        data = b"".join(chunks)
+    return [json.loads(line) for line in data.split(b"\n")[:-1]]
@@ -0,0 +1,283 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import (
+    AsyncIterable,
+    Dict,
+    Final,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from typing_extensions import Self
+
+from .model import TwitterUser
+
+MAGIC: Final[bytes] = b"TCSNAP1\0"
+NUMERIC_COLUMNS: Final[Tuple[Tuple[str, str], ...]] = (
+    ("id", "q"),
+    ("created_at", "q"),
+    ("followers_count", "q"),
+    ("friends_count", "q"),
+    ("statuses_count", "q"),
+    ("favourites_count", "q"),
+    ("listed_count", "q"),
+    ("verified", "b"),
+    ("protected", "b"),
+)
+STRING_COLUMNS: Final[Tuple[str, ...]] = ("screen_name", "name")
+_HEADER: Final[struct.Struct] = struct.Struct(f"={1 + len(STRING_COLUMNS)}Q")
+
+
+class SnapshotRow(NamedTuple):
+    id: int
+    created_at: int
+    followers_count: int
+    friends_count: int
+    statuses_count: int
+    favourites_count: int
+    listed_count: int
+    verified: bool
+    protected: Optional[bool]
+    screen_name: str
+    name: str
+
+
+def _padded(size: int) -> int:
+    return size + -size % 8
+
+
+class _StringColumn(Sequence[str]):
+    """UTF-8 strings stored back to back, located through an offset array."""
+
+    _offsets: Sequence[int]
+    _blob: Union[bytes, memoryview]
+
+    def __init__(self, offsets: Sequence[int], blob: Union[bytes, memoryview]):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        index = range(len(self))[index]
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return sys.intern(str(self._blob[start:end], "utf-8"))
+
+
+class IdIndex:
+    """Sorted, array-backed index over a newest-first id column.
+
+    Answers membership and "where was this id in the previous crawl" with a
+    binary search, at 16 bytes per id.
+    """
+
+    ids: Sequence[int]
+    keys: array
+    positions: array
+
+    def __init__(self, ids: Sequence[int]):
+        order = sorted(range(len(ids)), key=ids.__getitem__)
+        self.ids = ids
+        self.keys = array("q", (ids[i] for i in order))
+        self.positions = array("q", order)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, user_id: object) -> bool:
+        return isinstance(user_id, int) and self.position(user_id) is not None
+
+    def position(self, user_id: int) -> Optional[int]:
+        index = bisect_left(self.keys, user_id)
+        if index < len(self.keys) and self.keys[index] == user_id:
+            return self.positions[index]
+        return None
+
+
+class FollowerSnapshot:
+    """Columnar store of follower/following timelines.
+
+    Numeric fields live in typed ``array`` columns and names in interned
+    strings, a few dozen bytes per user instead of a full ``TwitterUser``.
+    Snapshots are saved to a compact binary file in native byte order, and
+    reopened through ``mmap`` without copying the columns, in which case they
+    are read-only until closed.
+    """
+
+    columns: Dict[str, Sequence[int]]
+    strings: Dict[str, Sequence[str]]
+
+    _mmap: Optional[mmap.mmap]
+    _views: List[memoryview]
+
+    def __init__(self):
+        self.columns = {name: array(code) for name, code in NUMERIC_COLUMNS}
+        self.strings = {name: [] for name in STRING_COLUMNS}
+        self._mmap = None
+        self._views = []
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def __getitem__(self, index: int) -> SnapshotRow:
+        columns, strings = self.columns, self.strings
+        protected = columns["protected"][index]
+        return SnapshotRow(
+            id=columns["id"][index],
+            created_at=columns["created_at"][index],
+            followers_count=columns["followers_count"][index],
+            friends_count=columns["friends_count"][index],
+            statuses_count=columns["statuses_count"][index],
+            favourites_count=columns["favourites_count"][index],
+            listed_count=columns["listed_count"][index],
+            verified=bool(columns["verified"][index]),
+            protected=None if protected < 0 else bool(protected),
+            screen_name=strings["screen_name"][index],
+            name=strings["name"][index],
+        )
+
+    def __iter__(self) -> Iterator[SnapshotRow]:
+        return (self[i] for i in range(len(self)))
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @property
+    def ids(self) -> Sequence[int]:
+        return self.columns["id"]
+
+    @property
+    def readonly(self) -> bool:
+        return self._mmap is not None
+
+    def append(self, user: TwitterUser) -> None:
+        if self.readonly:
+            raise TypeError("Memory-mapped snapshots are read-only")
+        row = (
+            user.id,
+            int(user.created_at.timestamp()),
+            user.followers_count,
+            user.friends_count,
+            user.statuses_count,
+            user.favourites_count,
+            user.listed_count,
+            int(user.verified),
+            -1 if user.protected is None else int(user.protected),
+        )
+        for (name, _), value in zip(NUMERIC_COLUMNS, row):
+            self.columns[name].append(value)  # type: ignore[attr-defined]
+        for name in STRING_COLUMNS:
+            self.strings[name].append(  # type: ignore[attr-defined]
+                sys.intern(getattr(user, name))
+            )
+
+    def extend(self, users: Iterable[TwitterUser]) -> None:
+        for user in users:
+            self.append(user)
+
+    async def collect(self, batches: AsyncIterable[List[TwitterUser]]) -> Self:
+        """Append every page of a crawl, e.g. ``ScrollableCrawler.run_yield()``."""
+        async for batch in batches:
+            self.extend(batch)
+        return self
+
+    def index(self) -> IdIndex:
+        return IdIndex(self.ids)
+
+    def id_set(self) -> Set[int]:
+        return set(self.ids)
+
+    def diff(self, previous: "FollowerSnapshot") -> Tuple[Set[int], Set[int]]:
+        """Ids added since ``previous``, and ids no longer present."""
+        current, before = self.id_set(), previous.id_set()
+        return current - before, before - current
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        encoded = {
+            name: [s.encode() for s in self.strings[name]] for name in STRING_COLUMNS
+        }
+        blobs = [b"".join(parts) for parts in encoded.values()]
+        temp = f"{os.fspath(path)}.{os.getpid()}.tmp"
+        with open(temp, "wb") as f:
+            f.write(MAGIC)
+            f.write(_HEADER.pack(len(self), *map(len, blobs)))
+            for name, code in NUMERIC_COLUMNS:
+                data = array(code, self.columns[name]).tobytes()
+                f.write(data.ljust(_padded(len(data)), b"\0"))
+            for parts, blob in zip(encoded.values(), blobs):
+                offsets = array("q", [0])
+                for part in parts:
+                    offsets.append(offsets[-1] + len(part))
+                f.write(offsets.tobytes())
+                f.write(blob.ljust(_padded(len(blob)), b"\0"))
+        os.replace(temp, path)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike], mmapped: bool = True) -> Self:
+        """Open a saved snapshot, memory-mapped unless ``mmapped`` is false."""
+        snapshot = cls()
+        with open(path, "rb") as f:
+            if mmapped:
+                buffer = snapshot._mmap = mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            else:
+                buffer = f.read()
+        view = snapshot._view(memoryview(buffer))
+        if view[: len(MAGIC)] != MAGIC:
+            snapshot.close()
+            raise ValueError(f"{path} is not a follower snapshot")
+        count, *blob_sizes = _HEADER.unpack_from(view, len(MAGIC))
+        position = len(MAGIC) + _HEADER.size
+        for name, code in NUMERIC_COLUMNS:
+            size = array(code).itemsize * count
+            column = snapshot._view(view[position : position + size])
+            snapshot.columns[name] = (
+                snapshot._view(column.cast(code))
+                if mmapped
+                else array(code, column.tobytes())
+            )
+            position += _padded(size)
+        for name, blob_size in zip(STRING_COLUMNS, blob_sizes):
+            size = 8 * (count + 1)
+            offsets = snapshot._view(view[position : position + size])
+            blob = snapshot._view(view[position + size : position + size + blob_size])
+            strings = _StringColumn(snapshot._view(offsets.cast("q")), blob)
+            snapshot.strings[name] = strings if mmapped else list(strings)
+            position += size + _padded(blob_size)
+        if not mmapped:
+            snapshot._release()
+        return snapshot
+
+    def _view(self, view: memoryview) -> memoryview:
+        self._views.append(view)
+        return view
+
+    def _release(self) -> None:
+        while self._views:
+            self._views.pop().release()
+
+    def close(self) -> None:
+        """Unmap a memory-mapped snapshot; its columns become unusable."""
+        if self._mmap is not None:
+            self.columns, self.strings = {}, {}
+            self._release()
+            self._mmap.close()
+            self._mmap = None
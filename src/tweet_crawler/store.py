@@ -0,0 +1,469 @@
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+from typing import (
+    Any,
+    Dict,
+    Final,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from typing_extensions import Self
+
+from .model import Tweet, TweetTombstone, TwitterEntities, TwitterUser
+
+SCHEMA: Final = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    screen_name TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    location TEXT,
+    protected INTEGER,
+    verified INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    entities TEXT NOT NULL,
+    pinned_tweet_ids TEXT NOT NULL,
+    profile_image_url TEXT NOT NULL,
+    profile_banner_url TEXT,
+    followers_count INTEGER NOT NULL,
+    friends_count INTEGER NOT NULL,
+    listed_count INTEGER NOT NULL,
+    favourites_count INTEGER NOT NULL,
+    statuses_count INTEGER NOT NULL,
+    followed_by INTEGER,
+    following INTEGER,
+    can_dm INTEGER,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS users_screen_name ON users (screen_name);
+CREATE INDEX IF NOT EXISTS users_created_at ON users (created_at);
+
+CREATE TABLE IF NOT EXISTS tweets (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users (id),
+    created_at TEXT NOT NULL,
+    full_text TEXT NOT NULL,
+    display_start INTEGER NOT NULL,
+    display_end INTEGER NOT NULL,
+    lang TEXT NOT NULL,
+    possibly_sensitive INTEGER NOT NULL,
+    views_count INTEGER NOT NULL,
+    bookmark_count INTEGER NOT NULL,
+    favorite_count INTEGER NOT NULL,
+    quote_count INTEGER NOT NULL,
+    reply_count INTEGER NOT NULL,
+    retweet_count INTEGER NOT NULL,
+    bookmarked INTEGER NOT NULL,
+    favorited INTEGER NOT NULL,
+    retweeted INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    crawled_at REAL
+);
+CREATE INDEX IF NOT EXISTS tweets_user_id ON tweets (user_id);
+CREATE INDEX IF NOT EXISTS tweets_created_at ON tweets (created_at);
+
+CREATE TABLE IF NOT EXISTS tombstones (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS entities (
+    tweet_id INTEGER NOT NULL REFERENCES tweets (id),
+    kind TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    start_index INTEGER,
+    end_index INTEGER,
+    data TEXT NOT NULL,
+    PRIMARY KEY (tweet_id, kind, position)
+);
+
+CREATE TABLE IF NOT EXISTS threads (
+    tweet_id INTEGER NOT NULL REFERENCES tweets (id),
+    thread INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    reply_id INTEGER NOT NULL,
+    PRIMARY KEY (tweet_id, thread, position)
+);
+CREATE INDEX IF NOT EXISTS threads_reply_id ON threads (reply_id);
+"""
+
+USER_COLUMNS: Final[Tuple[str, ...]] = (
+    "id",
+    "screen_name",
+    "name",
+    "description",
+    "location",
+    "protected",
+    "verified",
+    "created_at",
+    "entities",
+    "pinned_tweet_ids",
+    "profile_image_url",
+    "profile_banner_url",
+    "followers_count",
+    "friends_count",
+    "listed_count",
+    "favourites_count",
+    "statuses_count",
+    "followed_by",
+    "following",
+    "can_dm",
+    "fetched_at",
+)
+TWEET_COLUMNS: Final[Tuple[str, ...]] = (
+    "id",
+    "user_id",
+    "created_at",
+    "full_text",
+    "display_start",
+    "display_end",
+    "lang",
+    "possibly_sensitive",
+    "views_count",
+    "bookmark_count",
+    "favorite_count",
+    "quote_count",
+    "reply_count",
+    "retweet_count",
+    "bookmarked",
+    "favorited",
+    "retweeted",
+    "fetched_at",
+    "crawled_at",
+)
+COUNTS: Final[Tuple[str, ...]] = (
+    "views_count",
+    "bookmark_count",
+    "favorite_count",
+    "quote_count",
+    "reply_count",
+    "retweet_count",
+)
+# SQLite builds without SQLITE_MAX_VARIABLE_NUMBER raised only allow 999.
+MAX_VARIABLES: Final[int] = 900
+
+
+def _upsert(table: str, columns: Sequence[str], **overrides: str) -> str:
+    updates = ", ".join(
+        f"{column} = {overrides.get(column, f'excluded.{column}')}"
+        for column in columns[1:]
+    )
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT (id) DO UPDATE SET {updates}"
+    )
+
+
+UPSERT_USER: Final[str] = _upsert("users", USER_COLUMNS)
+# A tweet seen as a reply keeps the time its own conversation was crawled.
+UPSERT_TWEET: Final[str] = _upsert(
+    "tweets", TWEET_COLUMNS, crawled_at="COALESCE(excluded.crawled_at, crawled_at)"
+)
+UPSERT_TOMBSTONE: Final[str] = _upsert("tombstones", ("id", "text"))
+
+
+def _chunks(ids: Sequence[int]) -> Iterator[Sequence[int]]:
+    for start in range(0, len(ids), MAX_VARIABLES):
+        yield ids[start : start + MAX_VARIABLES]
+
+
+def _placeholders(ids: Sequence[int]) -> str:
+    return ", ".join("?" * len(ids))
+
+
+class TweetStore:
+    """SQLite database of crawled tweets and users.
+
+    Tweets, users, tweet entities, tombstones and conversation threads are
+    kept in separate tables, indexed by id and ``created_at``. Written items
+    are buffered and upserted with ``executemany`` once ``batch_size`` of
+    them are pending, or on ``flush``; the whole batch is one transaction.
+    The database runs in WAL mode, so other processes can read it, and write
+    to it in turn, while a crawl is running.
+
+    A tweet counts as fresh for ``max_age`` seconds after its conversation
+    was crawled; a tweet only seen as a reply in another conversation never
+    is. ``TwitterStatusCrawler`` returns the stored copy of a fresh tweet
+    without loading the page.
+    """
+
+    path: str
+    max_age: float
+    batch_size: int
+    connection: sqlite3.Connection
+
+    _tweets: List[Tweet]
+    _users: List[TwitterUser]
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        max_age: float = 3600.0,
+        batch_size: int = 500,
+        timeout: float = 30.0,
+    ):
+        self.path = os.fspath(path)
+        self.max_age = max_age
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(self.path, timeout=timeout)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+        self._tweets = []
+        self._users = []
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def write(self, item: Union[Tweet, TwitterUser]) -> None:
+        """Queue a crawled tweet (with its conversation) or user."""
+        if isinstance(item, Tweet):
+            self._tweets.append(item)
+        elif isinstance(item, TwitterUser):
+            self._users.append(item)
+        else:
+            raise TypeError(f"Cannot store {type(item).__name__}")
+        if len(self._tweets) + len(self._users) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, items: Iterable[Union[Tweet, TwitterUser]]) -> None:
+        for item in items:
+            self.write(item)
+
+    def flush(self) -> None:
+        if not self._tweets and not self._users:
+            return
+        now = time.time()
+        users: Dict[int, tuple] = {}
+        tweets: Dict[int, tuple] = {}
+        tombstones: Dict[int, tuple] = {}
+        entities: Dict[int, List[tuple]] = {}
+        threads: Dict[int, List[tuple]] = {}
+
+        def add_tweet(tweet: Tweet, crawled_at: Optional[float]) -> None:
+            if crawled_at is None and tweet.id in tweets:
+                crawled_at = tweets[tweet.id][-1]
+            tweets[tweet.id] = self._tweet_row(tweet, now, crawled_at)
+            users[tweet.user.id] = self._user_row(tweet.user, now)
+            entities[tweet.id] = list(self._entity_rows(tweet))
+
+        for user in self._users:
+            users[user.id] = self._user_row(user, now)
+        for tweet in self._tweets:
+            add_tweet(tweet, now)
+            rows = threads[tweet.id] = []
+            for index, thread in enumerate(tweet.conversation_threads):
+                for position, reply in enumerate(thread):
+                    rows.append((tweet.id, index, position, reply.id))
+                    if isinstance(reply, TweetTombstone):
+                        tombstones[reply.id] = (reply.id, reply.text)
+                    else:
+                        add_tweet(reply, None)
+
+        with self.connection as connection:
+            connection.executemany(UPSERT_USER, users.values())
+            connection.executemany(UPSERT_TWEET, tweets.values())
+            connection.executemany(UPSERT_TOMBSTONE, tombstones.values())
+            connection.executemany(
+                "DELETE FROM entities WHERE tweet_id = ?", ((i,) for i in entities)
+            )
+            connection.executemany(
+                "INSERT INTO entities VALUES (?, ?, ?, ?, ?, ?)",
+                (row for rows in entities.values() for row in rows),
+            )
+            connection.executemany(
+                "DELETE FROM threads WHERE tweet_id = ?", ((i,) for i in threads)
+            )
+            connection.executemany(
+                "INSERT INTO threads VALUES (?, ?, ?, ?)",
+                (row for rows in threads.values() for row in rows),
+            )
+        self._tweets.clear()
+        self._users.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self.connection.close()
+
+    @staticmethod
+    def _user_row(user: TwitterUser, now: float) -> tuple:
+        return (
+            user.id,
+            user.screen_name,
+            user.name,
+            user.description,
+            user.location,
+            user.protected,
+            user.verified,
+            user.created_at.isoformat(),
+            user.entities.model_dump_json(by_alias=True),
+            json.dumps(user.pinned_tweet_ids),
+            str(user.profile_image_url_normal),
+            None if user.profile_banner_url is None else str(user.profile_banner_url),
+            user.followers_count,
+            user.friends_count,
+            user.listed_count,
+            user.favourites_count,
+            user.statuses_count,
+            user.followed_by,
+            user.following,
+            user.can_dm,
+            now,
+        )
+
+    @staticmethod
+    def _tweet_row(tweet: Tweet, now: float, crawled_at: Optional[float]) -> tuple:
+        start, end = tweet.display_text_range
+        return (
+            tweet.id,
+            tweet.user.id,
+            tweet.created_at.isoformat(),
+            tweet.full_text,
+            start,
+            end,
+            tweet.lang,
+            tweet.possibly_sensitive,
+            *(getattr(tweet, count) for count in COUNTS),
+            tweet.bookmarked,
+            tweet.favorited,
+            tweet.retweeted,
+            now,
+            crawled_at,
+        )
+
+    @staticmethod
+    def _entity_rows(tweet: Tweet) -> Iterator[tuple]:
+        for kind in TwitterEntities.model_fields:
+            for position, entity in enumerate(getattr(tweet.entities, kind)):
+                indices = entity.indices
+                yield (
+                    tweet.id,
+                    kind,
+                    position,
+                    indices[0] if indices else None,
+                    indices[1] if len(indices) > 1 else None,
+                    entity.model_dump_json(by_alias=True),
+                )
+
+    def _select(self, table: str, ids: Sequence[int]) -> List[sqlite3.Row]:
+        rows: List[sqlite3.Row] = []
+        for chunk in _chunks(ids):
+            rows += self.connection.execute(
+                f"SELECT * FROM {table} WHERE id IN ({_placeholders(chunk)})", chunk
+            ).fetchall()
+        return rows
+
+    def _load_users(self, ids: Sequence[int]) -> Dict[int, TwitterUser]:
+        users = {}
+        for row in self._select("users", ids):
+            users[row["id"]] = TwitterUser.model_validate(
+                {
+                    **{k: row[k] for k in USER_COLUMNS[:-1]},
+                    "created_at": datetime.fromisoformat(row["created_at"]),
+                    "entities": json.loads(row["entities"]),
+                    "pinned_tweet_ids": json.loads(row["pinned_tweet_ids"]),
+                    "profile_image_url_https": row["profile_image_url"],
+                }
+            )
+        return users
+
+    def _load_tweets(self, ids: Sequence[int]) -> Dict[int, Tweet]:
+        rows = self._select("tweets", ids)
+        users = self._load_users(list({row["user_id"] for row in rows}))
+        entities: Dict[int, Dict[str, List[Any]]] = {}
+        for chunk in _chunks([row["id"] for row in rows]):
+            for entity in self.connection.execute(
+                "SELECT tweet_id, kind, data FROM entities "
+                f"WHERE tweet_id IN ({_placeholders(chunk)}) "
+                "ORDER BY tweet_id, kind, position",
+                chunk,
+            ):
+                kinds = entities.setdefault(entity["tweet_id"], {})
+                kinds.setdefault(entity["kind"], []).append(json.loads(entity["data"]))
+        return {
+            row["id"]: Tweet.model_validate(
+                {
+                    "id_str": row["id"],
+                    "created_at": datetime.fromisoformat(row["created_at"]),
+                    "full_text": row["full_text"],
+                    "display_text_range": [row["display_start"], row["display_end"]],
+                    "lang": row["lang"],
+                    "possibly_sensitive": row["possibly_sensitive"],
+                    "entities": entities.get(row["id"], {}),
+                    "user": users[row["user_id"]],
+                    **{count: row[count] for count in COUNTS},
+                    "bookmarked": row["bookmarked"],
+                    "favorited": row["favorited"],
+                    "retweeted": row["retweeted"],
+                }
+            )
+            for row in rows
+        }
+
+    def get_user(self, user_id: int) -> Optional[TwitterUser]:
+        self.flush()
+        return self._load_users([user_id]).get(user_id)
+
+    def get_tweet(self, tweet_id: int) -> Optional[Tweet]:
+        """The stored tweet with the conversation it was last crawled with."""
+        self.flush()
+        if (tweet := self._load_tweets([tweet_id]).get(tweet_id)) is None:
+            return None
+        replies = self.connection.execute(
+            "SELECT thread, reply_id FROM threads WHERE tweet_id = ? "
+            "ORDER BY thread, position",
+            (tweet_id,),
+        ).fetchall()
+        ids = [row["reply_id"] for row in replies]
+        loaded: Dict[int, Union[Tweet, TweetTombstone]] = {
+            row["id"]: TweetTombstone(id=row["id"], text=row["text"])
+            for row in self._select("tombstones", ids)
+        }
+        loaded.update(self._load_tweets(ids))
+        for row in replies:
+            while len(tweet.conversation_threads) <= row["thread"]:
+                tweet.conversation_threads.append([])
+            tweet.conversation_threads[row["thread"]].append(loaded[row["reply_id"]])
+        return tweet
+
+    def fresh_ids(
+        self, tweet_ids: Iterable[int], max_age: Optional[float] = None
+    ) -> Set[int]:
+        """Those of ``tweet_ids`` whose conversation was crawled recently."""
+        self.flush()
+        ids = list(tweet_ids)
+        since = time.time() - (self.max_age if max_age is None else max_age)
+        fresh: Set[int] = set()
+        for chunk in _chunks(ids):
+            fresh.update(
+                row["id"]
+                for row in self.connection.execute(
+                    f"SELECT id FROM tweets WHERE id IN ({_placeholders(chunk)}) "
+                    "AND crawled_at >= ?",
+                    (*chunk, since),
+                )
+            )
+        return fresh
+
+    def fresh_tweet(
+        self, tweet_id: int, max_age: Optional[float] = None
+    ) -> Optional[Tweet]:
+        if not self.fresh_ids([tweet_id], max_age):
+            return None
+        return self.get_tweet(tweet_id)
@@ -0,0 +1,225 @@
+import asyncio
+import heapq
+import time
+from contextlib import suppress
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    Final,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from .crawler.counters import TwitterCountersCrawler
+from .exception import TweetUnavailable
+from .pool import CrawlerPool
+
+STATUS_URL: Final[str] = "https://x.com/i/web/status/{}"
+
+
+class CounterDelta(NamedTuple):
+    """What changed about a tweet since its previous record.
+
+    ``changes`` maps each changed counter to its difference from the last
+    polled value; the first record of a tweet is ``initial`` and holds every
+    counter as is. A tweet that became unavailable gets a last record with
+    the ``unavailable`` reason and is no longer watched.
+    """
+
+    tweet_id: int
+    time: float
+    changes: Dict[str, int]
+    initial: bool = False
+    unavailable: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        record: Dict[str, Any] = {"id": self.tweet_id, "t": round(self.time, 3)}
+        if self.initial:
+            record["initial"] = True
+        if self.unavailable is not None:
+            record["unavailable"] = self.unavailable
+        return record | self.changes
+
+
+class WatchedTweet:
+    tweet_id: int
+    counters: Optional[Dict[str, int]]
+    interval: float
+    due: float
+    polls: int
+    errors: int
+
+    def __init__(self, tweet_id: int, interval: float, due: float):
+        self.tweet_id = tweet_id
+        self.counters = None
+        self.interval = interval
+        self.due = due
+        self.polls = 0
+        self.errors = 0
+
+
+class TweetWatcher:
+    """Polls the counters of a set of tweets and yields only what changed.
+
+    Every tweet has its own polling interval, starting at ``min_interval``:
+    a poll that finds a changed counter divides it by ``backoff``, one that
+    finds nothing new (or fails) multiplies it, up to ``max_interval``. Hot
+    tweets are thus polled often and settled ones rarely. Up to
+    ``concurrency`` polls (by default the pool size) run at once, each a
+    ``TwitterCountersCrawler`` crawl on ``pool`` with ``crawler_options``;
+    pass a captured ``template`` to poll without loading pages.
+    """
+
+    pool: CrawlerPool
+    tweets: Dict[int, WatchedTweet]
+    min_interval: float
+    max_interval: float
+    backoff: float
+    concurrency: int
+    crawler_options: Dict[str, Any]
+    polls: int
+    errors: int
+
+    _heap: List[Tuple[float, int]]
+    _wakeup: asyncio.Event
+    _stopped: asyncio.Event
+
+    def __init__(
+        self,
+        pool: CrawlerPool,
+        tweet_ids: Iterable[int] = (),
+        min_interval: float = 60.0,
+        max_interval: float = 3600.0,
+        backoff: float = 2.0,
+        concurrency: Optional[int] = None,
+        **crawler_options: Any,
+    ):
+        if not 0 < min_interval <= max_interval or backoff < 1:
+            raise ValueError("Invalid polling intervals")
+        self.pool = pool
+        self.tweets = {}
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.concurrency = concurrency or pool.size
+        self.crawler_options = crawler_options
+        self.polls = 0
+        self.errors = 0
+        self._heap = []
+        self._wakeup = asyncio.Event()
+        self._stopped = asyncio.Event()
+        for tweet_id in tweet_ids:
+            self.add(tweet_id)
+
+    def __len__(self) -> int:
+        return len(self.tweets)
+
+    def _schedule(self, tweet: WatchedTweet, due: float) -> None:
+        tweet.due = due
+        heapq.heappush(self._heap, (due, tweet.tweet_id))
+        self._wakeup.set()
+
+    def add(self, tweet_id: int) -> None:
+        """Start watching a tweet; its first poll is due right away."""
+        if tweet_id not in self.tweets:
+            tweet = self.tweets[tweet_id] = WatchedTweet(tweet_id, self.min_interval, 0)
+            self._schedule(tweet, time.monotonic())
+
+    def remove(self, tweet_id: int) -> None:
+        self.tweets.pop(tweet_id, None)
+
+    def stop(self) -> None:
+        """Make ``run`` return, cancelling the polls in progress."""
+        self._stopped.set()
+
+    async def poll(self, tweet_id: int) -> Dict[str, int]:
+        return await self.pool.crawl(
+            TwitterCountersCrawler,
+            STATUS_URL.format(tweet_id),
+            **self.crawler_options,
+        )
+
+    def update(
+        self, tweet: WatchedTweet, counters: Dict[str, int]
+    ) -> Optional[CounterDelta]:
+        """Adapt the interval of ``tweet`` to a poll, returning the changes."""
+        previous, tweet.counters = tweet.counters, counters
+        if previous is None:
+            return CounterDelta(tweet.tweet_id, time.time(), dict(counters), True)
+        changes = {
+            name: value - previous.get(name, 0)
+            for name, value in counters.items()
+            if value != previous.get(name)
+        }
+        if not changes:
+            tweet.interval = min(tweet.interval * self.backoff, self.max_interval)
+            return None
+        tweet.interval = max(tweet.interval / self.backoff, self.min_interval)
+        return CounterDelta(tweet.tweet_id, time.time(), changes)
+
+    async def _poll(self, tweet: WatchedTweet) -> Optional[CounterDelta]:
+        self.polls += 1
+        tweet.polls += 1
+        try:
+            counters = await self.poll(tweet.tweet_id)
+        except TweetUnavailable as e:
+            self.remove(tweet.tweet_id)
+            return CounterDelta(tweet.tweet_id, time.time(), {}, unavailable=str(e))
+        except Exception:
+            self.errors += 1
+            tweet.errors += 1
+            tweet.interval = min(tweet.interval * self.backoff, self.max_interval)
+            delta = None
+        else:
+            delta = self.update(tweet, counters)
+        if self.tweets.get(tweet.tweet_id) is tweet:
+            self._schedule(tweet, time.monotonic() + tweet.interval)
+        return delta
+
+    async def run(self) -> AsyncGenerator[CounterDelta, None]:
+        """Poll until ``stop`` is called, yielding every change."""
+        due: "asyncio.Queue[WatchedTweet]" = asyncio.Queue()
+        deltas: "asyncio.Queue[Optional[CounterDelta]]" = asyncio.Queue(
+            maxsize=self.concurrency
+        )
+        self._stopped.clear()
+
+        async def schedule() -> None:
+            while True:
+                self._wakeup.clear()
+                now = time.monotonic()
+                while self._heap and self._heap[0][0] <= now:
+                    at, tweet_id = heapq.heappop(self._heap)
+                    # Entries of removed or rescheduled tweets are skipped.
+                    if (tweet := self.tweets.get(tweet_id)) and tweet.due == at:
+                        due.put_nowait(tweet)
+                timeout = self._heap[0][0] - now if self._heap else None
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+
+        async def worker() -> None:
+            while True:
+                tweet = await due.get()
+                if (delta := await self._poll(tweet)) is not None:
+                    await deltas.put(delta)
+
+        async def stopper() -> None:
+            await self._stopped.wait()
+            await deltas.put(None)
+
+        tasks = [
+            asyncio.create_task(schedule()),
+            asyncio.create_task(stopper()),
+            *(asyncio.create_task(worker()) for _ in range(self.concurrency)),
+        ]
+        try:
+            while (delta := await deltas.get()) is not None:
+                yield delta
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,10 +1,54 @@
 import unittest
 
+from accounts import AccountResetCase, AccountsCase, LoadAccountsCase
+from benchmark import BenchmarkCase
+from cache import CacheCase
+from checkpoint import CheckpointCase
+from cli import CliCase
+from convert import ConvertCase
+from decoder import DecoderCase
+from direct import DirectCase
 from followers import FollowersCase
 from following import FollowingCase
+from metrics import MetricsCase
+from model import ModelCase
+from pool import PoolCase
+from ratelimit import RateLimitCase
+from replay import ReplayCase
+from resources import ResourceCase
+from scroll import ScrollCase
+from sink import SinkCase
+from snapshot import SnapshotCase
 from status import StatusCase
+from store import StoreCase
+from watch import WatchCase
 
-__all__ = ["FollowersCase", "FollowingCase", "StatusCase"]
+__all__ = [
+    "AccountResetCase",
+    "AccountsCase",
+    "BenchmarkCase",
+    "CacheCase",
+    "CheckpointCase",
+    "CliCase",
+    "ConvertCase",
+    "DecoderCase",
+    "DirectCase",
+    "FollowersCase",
+    "FollowingCase",
+    "LoadAccountsCase",
+    "MetricsCase",
+    "ModelCase",
+    "PoolCase",
+    "RateLimitCase",
+    "ReplayCase",
+    "ResourceCase",
+    "ScrollCase",
+    "SinkCase",
+    "SnapshotCase",
+    "StatusCase",
+    "StoreCase",
+    "WatchCase",
+]
 
 
 if __name__ == "__main__":
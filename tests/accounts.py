@@ -0,0 +1,125 @@
+import json
+import math
+import os
+import tempfile
+import unittest
+
+from dotenv import load_dotenv
+from playwright.async_api import Browser, Playwright, async_playwright
+from util import cookies
+
+from tweet_crawler import TwitterFollowersCrawler, TwitterStatusCrawler
+from tweet_crawler.accounts import AccountPool, account_cookies, load_accounts
+from tweet_crawler.pool import PoolSlot
+
+load_dotenv()
+
+
+class LoadAccountsCase(unittest.TestCase):
+    def test_load_accounts(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "accounts.json")
+            with open(path, "w") as f:
+                json.dump(
+                    {
+                        "alice": {"auth_token": "a", "ct0": "b", "expires": 1e10},
+                        "bob": account_cookies("c", "d"),
+                    },
+                    f,
+                )
+            accounts = load_accounts(path)
+        self.assertEqual(set(accounts), {"alice", "bob"})
+        self.assertEqual(
+            {c["name"]: c["value"] for c in accounts["alice"]},
+            {"auth_token": "a", "ct0": "b"},
+        )
+        self.assertTrue(all(c["expires"] == 1e10 for c in accounts["alice"]))
+        self.assertEqual(accounts["bob"], account_cookies("c", "d"))
+
+
+class AccountsCase(unittest.IsolatedAsyncioTestCase):
+    playwright: Playwright
+    browser: Browser
+
+    async def asyncSetUp(self):
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch()
+
+    async def asyncTearDown(self):
+        await self.browser.close()
+        await self.playwright.stop()
+
+    async def test_rotation(self):
+        print("\n===== test_rotation =====")
+        urls = [
+            os.environ["TWEET_PLAIN_TEXT"],
+            os.environ["TWEET_PHOTO"],
+            os.environ["TWEET_VIDEO"],
+            os.environ["TWEET_HASHTAG"],
+        ]
+        accounts = {"first": cookies(), "second": cookies()}
+        async with AccountPool(self.browser, accounts) as pool:
+            results = [r async for _, r in pool.imap(TwitterStatusCrawler, urls)]
+            self.assertEqual(len(results), 4)
+            for name, account in pool.accounts.items():
+                print(f"{name}: {account.crawls=}")
+                self.assertGreater(account.crawls, 0)
+        print("===== done =====")
+
+    async def test_quarantine(self):
+        print("\n===== test_quarantine =====")
+        accounts = {"expired": account_cookies("0", "0"), "valid": cookies()}
+        async with AccountPool(self.browser, accounts) as pool:
+            result = await pool.crawl(
+                TwitterFollowersCrawler,
+                os.environ["TWITTER_SCREEN_NAME"],
+                max_pages=1,
+            )
+            self.assertTrue(result)
+            expired = pool.accounts["expired"]
+            print(f"{expired.failures=} {expired.quarantined=}")
+            self.assertEqual(expired.quarantined, expired.failures > 0)
+            self.assertEqual(pool.accounts["valid"].failures, 0)
+        print("===== done =====")
+
+
+class StubPage:
+    def __init__(self, dead: bool = False):
+        self.dead = dead
+
+    def is_closed(self) -> bool:
+        return False
+
+    async def goto(self, url: str) -> None:
+        if self.dead:
+            raise RuntimeError("Target page, context or browser has been closed")
+
+
+class DeadContext:
+    async def new_page(self) -> StubPage:
+        raise RuntimeError("Target page, context or browser has been closed")
+
+
+class AccountResetCase(unittest.IsolatedAsyncioTestCase):
+    async def test_dead_context(self):
+        pool = AccountPool(None, {"dead": [], "alive": []})  # type: ignore
+        dead, alive = pool.accounts["dead"], pool.accounts["alive"]
+        dead.slots = [PoolSlot(DeadContext(), StubPage(dead=True))]  # type: ignore
+        alive.slots = [PoolSlot(None, StubPage())]  # type: ignore
+        for account in pool.accounts.values():
+            account.idle = list(account.slots)
+        pool._slots = dead.slots + alive.slots
+        async with pool.lease_account() as (account, _):
+            self.assertIs(account, dead)
+            async with pool.lease_account() as (account, _):
+                self.assertIs(account, alive)
+        # A page that cannot be replaced takes its account out of rotation.
+        self.assertEqual(dead.quarantined_until, math.inf)
+        self.assertFalse(alive.quarantined)
+        for _ in range(2):
+            async with pool.lease_account() as (account, _):
+                self.assertIs(account, alive)
+
+
+if __name__ == "__main__":
+    unittest.main()
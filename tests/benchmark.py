@@ -0,0 +1,245 @@
+import asyncio
+import copy
+import json
+import os
+import time
+import unittest
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from payload import tweet_detail, tweet_result, tweet_result_by_rest_id, user_result
+
+from tweet_crawler.crawler import TwitterStatusCrawler
+from tweet_crawler.crawler._base import _convert_body
+from tweet_crawler.crawler.counters import extract_counters
+from tweet_crawler.decoder import (
+    DEFAULT_DECODER,
+    Decoder,
+    loads_orjson,
+    loads_stdlib,
+    orjson,
+)
+from tweet_crawler.model import (
+    TWITTER_DATETIME_FORMAT,
+    Tweet,
+    TwitterUser,
+    parse_twitter_datetime,
+)
+from tweet_crawler.replay import Cassette
+
+FIXTURES = Path(__file__).parent / "fixtures"
+PAYLOADS: Dict[str, dict] = {
+    "small": tweet_detail(1, threads=5),
+    "large": tweet_detail(1, threads=200, tombstones=True),
+    "deep": tweet_detail(1, threads=10, depth=50),
+    "media": tweet_detail(1, threads=100, media="video"),
+}
+
+
+def instructions(content: dict) -> list:
+    return content["data"]["threaded_conversation_with_injections_v2"]["instructions"]
+
+
+class BenchmarkCase(unittest.TestCase):
+    """Times the parsers on synthetic payloads and recorded fixtures.
+
+    Set ``BENCHMARK_OUTPUT`` to write the timings as JSON, and
+    ``BENCHMARK_BASELINE`` to fail when a timing regresses by more than
+    ``BENCHMARK_TOLERANCE`` (default 1.5x) against a previous output.
+    """
+
+    timings: Dict[str, float] = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        if output := os.environ.get("BENCHMARK_OUTPUT"):
+            with open(output, "w") as f:
+                json.dump(cls.timings, f, indent=2, sort_keys=True)
+
+    def bench(self, name: str, func: Callable[[Any], Any], arg: Any, rounds=20):
+        best = float("inf")
+        for _ in range(rounds):
+            copied = copy.deepcopy(arg)
+            if TwitterUser.cache is not None:
+                TwitterUser.cache.clear()
+            start = time.perf_counter()
+            func(copied)
+            best = min(best, time.perf_counter() - start)
+        self.report(name, best)
+
+    def report(self, name: str, best: float):
+        self.timings[name] = best
+        print(f"{name:<48} {best * 1000:10.3f} ms")
+        if baseline := os.environ.get("BENCHMARK_BASELINE"):
+            with open(baseline) as f:
+                previous = json.load(f).get(name)
+            tolerance = float(os.environ.get("BENCHMARK_TOLERANCE", "1.5"))
+            if previous is not None:
+                self.assertLessEqual(best, previous * tolerance, name)
+
+    def test_from_instructions(self):
+        print("\n===== test_from_instructions =====")
+        for name, content in PAYLOADS.items():
+            self.bench(
+                f"Tweet.from_instructions[{name}]",
+                Tweet.from_instructions,
+                instructions(content),
+                rounds=5 if name != "small" else 20,
+            )
+        print("===== done =====")
+
+    def test_from_instructions_lazy(self):
+        print("\n===== test_from_instructions_lazy =====")
+        for name, content in PAYLOADS.items():
+            self.bench(
+                f"Tweet.from_instructions[lazy][{name}]",
+                lambda x: Tweet.from_instructions(x, lazy=True),
+                instructions(content),
+                rounds=5 if name != "small" else 20,
+            )
+        self.bench(
+            "Tweet.from_result[TweetResultByRestId]",
+            lambda x: Tweet.from_result(x, rest_id=1),
+            tweet_result_by_rest_id(1)["data"]["tweetResult"]["result"],
+            rounds=200,
+        )
+        print("===== done =====")
+
+    def test_from_result(self):
+        print("\n===== test_from_result =====")
+        self.bench(
+            "Tweet.from_result",
+            lambda x: Tweet.from_result(x, rest_id=1),
+            tweet_result(1, 1, media="video"),
+            rounds=200,
+        )
+        print("===== done =====")
+
+    def test_user_from_result(self):
+        print("\n===== test_user_from_result =====")
+        self.bench(
+            "TwitterUser.from_result", TwitterUser.from_result, user_result(1), 200
+        )
+        print("===== done =====")
+
+    def test_extract_counters(self):
+        print("\n===== test_extract_counters =====")
+        for name, content in PAYLOADS.items():
+            self.bench(
+                f"extract_counters[{name}]",
+                lambda x: extract_counters(x, 1),
+                content,
+                rounds=20,
+            )
+        print("===== done =====")
+
+    def test_decode(self):
+        print("\n===== test_decode =====")
+        decoders = {"stdlib": Decoder(loads_stdlib)}
+        if orjson is not None:
+            decoders["orjson"] = Decoder(loads_orjson)
+        decoders["selective"] = Decoder(loads_stdlib, selective=True)
+        paths = TwitterStatusCrawler.DECODE_PATHS
+        for name, content in PAYLOADS.items():
+            body = json.dumps(content).encode()
+            for backend, decoder in decoders.items():
+                self.bench(
+                    f"Decoder[{backend}][{name}]",
+                    lambda x, d=decoder: d.decode(x, paths),
+                    body,
+                    rounds=5 if name != "small" else 20,
+                )
+        print("===== done =====")
+
+    def test_event_loop_lag(self):
+        print("\n===== test_event_loop_lag =====")
+        body = json.dumps(PAYLOADS["large"]).encode()
+        convert = partial(
+            _convert_body, TwitterStatusCrawler, DEFAULT_DECODER, body, {}
+        )
+
+        async def lag(executor: Optional[Executor]) -> float:
+            """Longest stall of a 1 ms heartbeat while the payload is parsed."""
+            loop = asyncio.get_running_loop()
+            gaps = []
+            parsing = True
+
+            async def heartbeat():
+                last = time.perf_counter()
+                while parsing:
+                    await asyncio.sleep(0.001)
+                    now = time.perf_counter()
+                    gaps.append(now - last)
+                    last = now
+
+            task = asyncio.create_task(heartbeat())
+            await asyncio.sleep(0.01)
+            gaps.clear()
+            if executor is None:
+                convert()
+            else:
+                await loop.run_in_executor(executor, convert)
+            parsing = False
+            await task
+            return max(gaps)
+
+        with ThreadPoolExecutor(1) as threads, ProcessPoolExecutor(1) as processes:
+            processes.submit(convert).result()  # start the worker
+            for name, executor in (
+                ("inline", None),
+                ("thread", threads),
+                ("process", processes),
+            ):
+                best = min(asyncio.run(lag(executor)) for _ in range(5))
+                self.report(f"EventLoopLag[{name}][large]", best)
+        print("===== done =====")
+
+    def test_datetime(self):
+        print("\n===== test_datetime =====")
+        values = [
+            f"Wed Oct 10 20:{m:02}:{s:02} +0000 2018"
+            for m in range(60)
+            for s in range(60)
+        ]
+
+        def uncached(values):
+            parse_twitter_datetime.cache_clear()
+            for value in values:
+                parse_twitter_datetime(value)
+
+        self.bench(
+            "strptime",
+            lambda x: [datetime.strptime(v, TWITTER_DATETIME_FORMAT) for v in x],
+            values,
+            rounds=5,
+        )
+        self.bench("parse_twitter_datetime[uncached]", uncached, values, rounds=5)
+        self.bench(
+            "parse_twitter_datetime[cached]",
+            lambda x: [parse_twitter_datetime(v) for v in x],
+            values,
+            rounds=5,
+        )
+        print("===== done =====")
+
+    def test_fixtures(self):
+        print("\n===== test_fixtures =====")
+        for path in sorted(FIXTURES.glob("*.json")):
+            cassette = Cassette.load(path)
+            for index, response in enumerate(cassette.responses):
+                data = response["body"].get("data", {})
+                if "threaded_conversation_with_injections_v2" in data:
+                    self.bench(
+                        f"Tweet.from_instructions[{path.stem}:{index}]",
+                        Tweet.from_instructions,
+                        instructions(response["body"]),
+                        rounds=5,
+                    )
+        print("===== done =====")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import time
+import unittest
+
+from tweet_crawler.cache import ResponseCache
+
+
+class CacheCase(unittest.TestCase):
+    directory: tempfile.TemporaryDirectory
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_roundtrip(self):
+        cache = ResponseCache(self.directory.name)
+        self.assertIsNone(cache.get("TweetDetail", "1"))
+        cache.put("TweetDetail", "1", b'{"data": {}}')
+        self.assertEqual(cache.get("TweetDetail", "1"), b'{"data": {}}')
+        self.assertIsNone(cache.get("TweetResultByRestId", "1"))
+        reopened = ResponseCache(self.directory.name)
+        self.assertEqual(len(reopened), 1)
+        self.assertEqual(reopened.get("TweetDetail", "1"), b'{"data": {}}')
+
+    def test_ttl(self):
+        cache = ResponseCache(self.directory.name, ttl=60)
+        cache.put("TweetDetail", "1", b"{}")
+        path = cache._path("TweetDetail", "1")
+        stale = time.time() - 120
+        os.utime(path, (stale, stale))
+        self.assertFalse(cache.contains("TweetDetail", "1"))
+        self.assertFalse(path.exists())
+        self.assertEqual(cache.size, 0)
+
+    def test_lru(self):
+        cache = ResponseCache(self.directory.name, max_bytes=30)
+        cache.put("TweetDetail", "1", b"a" * 10)
+        cache.put("TweetDetail", "2", b"b" * 10)
+        cache.put("TweetDetail", "3", b"c" * 10)
+        self.assertIsNotNone(cache.get("TweetDetail", "1"))
+        cache.put("TweetDetail", "4", b"d" * 10)
+        self.assertIsNone(cache.get("TweetDetail", "2"))
+        self.assertIsNotNone(cache.get("TweetDetail", "1"))
+        self.assertLessEqual(cache.size, 30)
+
+    def test_negative(self):
+        cache = ResponseCache(self.directory.name, negative_ttl=60)
+        cache.put("TweetDetail", "1", b"{}")
+        cache.put_unavailable("TweetDetail", "1", "NsfwLoggedOut")
+        self.assertIsNone(cache.get("TweetDetail", "1"))
+        self.assertEqual(cache.get_unavailable("TweetDetail", "1"), "NsfwLoggedOut")
+        cache.put("TweetDetail", "1", b"{}")
+        self.assertIsNone(cache.get_unavailable("TweetDetail", "1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+
+from tweet_crawler.checkpoint import Checkpoint
+
+
+class CheckpointCase(unittest.TestCase):
+    directory: tempfile.TemporaryDirectory
+    path: str
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "followers.checkpoint")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_roundtrip(self):
+        checkpoint = Checkpoint(self.path)
+        self.assertIsNone(checkpoint.cursor)
+        checkpoint.start("https://x.com/user/followers")
+        checkpoint.record("c1", range(1, 21))
+        checkpoint.record("c2", range(21, 41))
+        reopened = Checkpoint(self.path)
+        self.assertEqual(reopened.url, "https://x.com/user/followers")
+        self.assertEqual(reopened.cursor, "c2")
+        self.assertEqual(reopened.seen, set(range(1, 41)))
+        reopened.start("https://x.com/user/followers")
+        with self.assertRaises(ValueError):
+            reopened.start("https://x.com/user/following")
+        reopened.clear()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_truncated(self):
+        checkpoint = Checkpoint(self.path)
+        checkpoint.start("https://x.com/user/followers")
+        checkpoint.record("c1", [1, 2])
+        with open(self.path, "ab") as f:
+            f.write(b'{"cursor":"c2","ids":[3,')
+        reopened = Checkpoint(self.path)
+        self.assertEqual(reopened.cursor, "c1")
+        self.assertEqual(reopened.seen, {1, 2})
+        # Resuming appends after the last complete line, not the torn one.
+        reopened.record("c3", [4])
+        resumed = Checkpoint(self.path)
+        self.assertEqual(resumed.url, "https://x.com/user/followers")
+        self.assertEqual(resumed.cursor, "c3")
+        self.assertEqual(resumed.seen, {1, 2, 4})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import asyncio
+import contextlib
+import io
+import json
+import queue
+import unittest
+from types import SimpleNamespace
+
+from payload import user_result
+
+from tweet_crawler.cli import (
+    Job,
+    WorkerStats,
+    _reap,
+    parse_job,
+    parser,
+    read_jobs,
+    run_job,
+    shard,
+)
+from tweet_crawler.exception import CrawlTimeout
+from tweet_crawler.model import TwitterUser
+
+
+class TimingOutPool:
+    """Streams two users, then times out, for the first ``timeouts`` crawls."""
+
+    def __init__(self, timeouts: int):
+        self.timeouts = timeouts
+        self.calls = 0
+
+    async def stream(self, crawler, target, **kwargs):
+        self.calls += 1
+        yield [TwitterUser.from_result(user_result(i)) for i in range(2)]
+        if self.calls <= self.timeouts:
+            raise CrawlTimeout(f"{target} did not finish within 1s")
+        yield [TwitterUser.from_result(user_result(2))]
+
+
+class CliCase(unittest.TestCase):
+    def test_parse_job(self):
+        self.assertEqual(
+            parse_job("https://x.com/user/status/100\n"),
+            Job("status", "https://x.com/user/status/100"),
+        )
+        self.assertEqual(parse_job("@jack"), Job("followers", "jack"))
+        self.assertEqual(parse_job("jack"), Job("followers", "jack"))
+        self.assertEqual(parse_job("following:@jack"), Job("following", "jack"))
+        self.assertEqual(parse_job("followers:jack"), Job("followers", "jack"))
+        self.assertIsNone(parse_job("   "))
+        self.assertIsNone(parse_job("# comment"))
+        for line in ("likes:jack", "https://x.com/jack", "not a name"):
+            with self.assertRaises(ValueError):
+                parse_job(line)
+
+    def test_shard(self):
+        jobs = read_jobs([f"user{i}\n" for i in range(7)] + ["\n"])
+        self.assertEqual(len(jobs), 7)
+        shards = shard(jobs, 3)
+        self.assertEqual([len(s) for s in shards], [3, 2, 2])
+        self.assertEqual(shards[1], [Job("followers", "user1"), jobs[4]])
+        self.assertEqual(sorted(j for s in shards for j in s), sorted(jobs))
+
+    def test_arguments(self):
+        args = parser().parse_args(["-", "-w", "2", "--timeout", "30"])
+        self.assertEqual(args.workers, 2)
+        self.assertEqual(args.timeout, 30.0)
+        self.assertEqual(args.retries, 2)
+        self.assertIsNone(args.max_pages)
+        self.assertEqual(args.output, "-")
+        with self.assertRaises(SystemExit):
+            with contextlib.redirect_stderr(io.StringIO()):
+                parser().parse_args(["-", "--cookies", "a", "--accounts", "b"])
+
+    def test_stats(self):
+        stats = WorkerStats(1, 10)
+        stats.done, stats.failed, stats.retries, stats.items = 4, 1, 2, 400
+        stats.elapsed = 2.0
+        self.assertEqual(
+            str(stats),
+            "worker 1: 5/10 jobs, 1 failed, 2 retries, 400 items in 2.0s "
+            "(2.00 jobs/s, 200.0 items/s)",
+        )
+
+    def test_reap(self):
+        jobs = [parse_job(f"user{i}") for i in range(3)]
+        shards = shard(jobs, 2)
+        processes = [
+            SimpleNamespace(is_alive=lambda: False, exitcode=0),
+            SimpleNamespace(is_alive=lambda: False, exitcode=1),
+        ]
+        results = queue.Queue()
+        stats = WorkerStats(0, len(shards[0]))
+        results.put(("line", '{"id": 1}'))
+        results.put(("done", stats))
+        finished = {}
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            _reap(results, processes, shards, None, finished)  # type: ignore
+        # Worker 0 exited after queueing its results, worker 1 crashed.
+        self.assertEqual(stdout.getvalue(), '{"id": 1}\n')
+        self.assertIs(finished[0], stats)
+        self.assertIsNone(finished[0].error)
+        self.assertEqual(finished[1].error, "exited with code 1")
+        self.assertEqual(finished[1].total, 1)
+        self.assertTrue(results.empty())
+
+    def test_run_job_timeout(self):
+        job = parse_job("followers:user")
+        args = parser().parse_args(["-", "--retries", "1", "--backoff", "0"])
+        for timeouts, done, ids in ((1, 1, [0, 1, 2]), (2, 0, [0, 1])):
+            pool, lines = TimingOutPool(timeouts), []
+            stats = WorkerStats(0, 1)
+            asyncio.run(run_job(pool, job, args, stats, lines.append))  # type: ignore
+            records = [json.loads(line) for line in lines]
+            users = [r["data"]["id"] for r in records if r["type"] == "user"]
+            # A timed out crawl is retried, without writing its users twice.
+            self.assertEqual(users, ids)
+            self.assertEqual(
+                (stats.done, stats.failed, stats.retries), (done, 1 - done, 1)
+            )
+            if not done:
+                self.assertEqual(records[-1]["type"], "error")
+                self.assertTrue(records[-1]["error"].startswith("CrawlTimeout"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from payload import followers_page, tweet_detail, unavailable
+
+from tweet_crawler.crawler import TwitterFollowersCrawler, TwitterStatusCrawler
+from tweet_crawler.crawler._base import _convert_body
+from tweet_crawler.decoder import DEFAULT_DECODER
+from tweet_crawler.exception import TweetUnavailable
+from tweet_crawler.model import Tweet
+
+
+class StubPage:
+    def on(self, event: str, handler) -> None:
+        pass
+
+
+class ConvertCase(unittest.IsolatedAsyncioTestCase):
+    def test_status(self):
+        tweet = TwitterStatusCrawler.convert(tweet_detail(100, threads=5))
+        self.assertIsInstance(tweet, Tweet)
+        self.assertEqual(tweet.id, 100)
+        self.assertEqual(len(tweet.conversation_threads), 5)
+        lazy = TwitterStatusCrawler.convert(
+            tweet_detail(100, threads=5), lazy_threads=True
+        )
+        self.assertEqual(lazy.conversation_threads, tweet.conversation_threads)
+        result = TwitterStatusCrawler.convert(unavailable())
+        self.assertIsInstance(result, TweetUnavailable)
+        self.assertEqual(str(result), "NsfwLoggedOut")
+
+    def test_followers(self):
+        update = TwitterFollowersCrawler.convert(followers_page(1, 20, "c1"))
+        self.assertFalse(update.terminated)
+        [(users, cursor)] = update.batches
+        self.assertEqual([user.id for user in users], list(range(1, 21)))
+        self.assertEqual(cursor, "c1")
+        last = TwitterFollowersCrawler.convert(
+            followers_page(21, 20, "c2", terminate=True)
+        )
+        self.assertTrue(last.terminated)
+
+    async def test_parse(self):
+        crawler = TwitterStatusCrawler(StubPage(), "https://x.com/user/status/100")
+        await crawler.parse(tweet_detail(100, threads=5))
+        self.assertEqual(crawler.result.id, 100)
+        self.assertGreater(crawler.metrics.parse_time, 0)
+        self.assertEqual(crawler.metrics.decode_time, 0)
+        await crawler.parse(unavailable())
+        self.assertIsInstance(crawler.exception, TweetUnavailable)
+        # Pages parsed concurrently are applied in call order.
+        followers = TwitterFollowersCrawler(StubPage(), "user", queue_size=3)
+        await asyncio.gather(
+            *(followers.parse(followers_page(i * 20, 20, f"c{i}")) for i in range(3))
+        )
+        ids = [[user.id for user in followers.queue.get_nowait()] for _ in range(3)]
+        self.assertEqual(ids, [list(range(i * 20, i * 20 + 20)) for i in range(3)])
+
+    async def test_process_pool(self):
+        loop = asyncio.get_running_loop()
+        bodies = {
+            TwitterStatusCrawler: tweet_detail(100, threads=5, tombstones=True),
+            TwitterFollowersCrawler: followers_page(1, 20, "c1", terminate=True),
+        }
+        with ProcessPoolExecutor(1) as executor:
+            for crawler, content in bodies.items():
+                converted, decode_time, convert_time = await loop.run_in_executor(
+                    executor,
+                    _convert_body,
+                    crawler,
+                    DEFAULT_DECODER,
+                    json.dumps(content).encode(),
+                    {},
+                )
+                self.assertEqual(converted, crawler.convert(content))
+                self.assertGreater(decode_time, 0)
+                self.assertGreater(convert_time, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import json
+import unittest
+
+from payload import followers_page, tweet_detail, tweet_result_by_rest_id
+
+from tweet_crawler.crawler import TwitterFollowersCrawler, TwitterStatusCrawler
+from tweet_crawler.decoder import Decoder, loads_stdlib
+
+
+class DecoderCase(unittest.TestCase):
+    def test_selective(self):
+        print("\n===== test_selective =====")
+        decoder = Decoder(selective=True)
+        cases = [
+            (TwitterStatusCrawler, tweet_detail(1, threads=5, depth=2)),
+            (TwitterStatusCrawler, tweet_result_by_rest_id(1)),
+            (TwitterFollowersCrawler, followers_page(0, 20, "next")),
+        ]
+        for crawler_cls, content in cases:
+            content["extensions"] = {"ignored": list(range(100))}
+            body = json.dumps(content, indent=1).encode()
+            selected = decoder.decode(body, crawler_cls.DECODE_PATHS)
+            self.assertNotIn("extensions", selected)
+            for path in crawler_cls.DECODE_PATHS:
+                expected, actual = content, selected
+                for key in path:
+                    if key not in expected:
+                        break
+                    expected, actual = expected[key], actual[key]
+                else:
+                    self.assertEqual(actual, expected)
+                    break
+            else:
+                self.fail(f"No path of {crawler_cls.__name__} selected")
+        print("===== done =====")
+
+    def test_nested_keys(self):
+        print("\n===== test_nested_keys =====")
+        decoder = Decoder(selective=True)
+        paths = TwitterStatusCrawler.DECODE_PATHS
+        cases = [
+            # The same key deeper in a sibling, and in a string value.
+            (
+                b'{"data": {"threaded_conversation_with_injections_v2": {"meta": '
+                b'{"instructions": "x"}, "instructions": [1]}}}',
+                {
+                    "data": {
+                        "threaded_conversation_with_injections_v2": {
+                            "instructions": [1]
+                        }
+                    }
+                },
+            ),
+            (
+                b'{"note": "\\"data\\": {\\"tweetResult\\": 1}", "data": '
+                b'{"tweetResult": {"text": "}]\\\\"}, "extensions": [1, {"a": "]"}]}}',
+                {"data": {"tweetResult": {"text": "}]\\"}}},
+            ),
+            # A path key below its expected depth is not a match.
+            (
+                b'{"data": {"user": {"x": {"tweetResult": 5}}}}',
+                {"data": {"user": {"x": {"tweetResult": 5}}}},
+            ),
+            # Ambiguous duplicates are left to the full decoder.
+            (
+                b'{"data": {"tweetResult": 1, "tweetResult": 2}}',
+                {"data": {"tweetResult": 2}},
+            ),
+            (
+                b'{"data": {"tweetResult": 1}, "data": {"tweetResult": 2}}',
+                {"data": {"tweetResult": 2}},
+            ),
+        ]
+        for body, expected in cases:
+            self.assertEqual(decoder.decode(body, paths), expected)
+        print("===== done =====")
+
+    def test_fallback(self):
+        print("\n===== test_fallback =====")
+        body = b'{"errors": [{"message": "Rate limit exceeded"}]}'
+        for decoder in (Decoder(), Decoder(loads_stdlib), Decoder(selective=True)):
+            self.assertEqual(
+                decoder.decode(body, TwitterStatusCrawler.DECODE_PATHS),
+                json.loads(body),
+            )
+        print("===== done =====")
+
+
+if __name__ == "__main__":
+    unittest.main()
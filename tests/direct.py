@@ -0,0 +1,82 @@
+import os
+import unittest
+
+from dotenv import load_dotenv
+from payload import tweet_detail
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    async_playwright,
+)
+from util import StubServer, add_cookies
+
+from tweet_crawler import TwitterStatusCrawler
+from tweet_crawler.crawler.direct import GraphQLTemplate
+
+load_dotenv()
+
+
+class DirectCase(unittest.IsolatedAsyncioTestCase):
+    playwright: Playwright
+    browser: Browser
+    context: BrowserContext
+    page: Page
+
+    async def asyncSetUp(self):
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch()
+        self.context = await self.browser.new_context()
+        self.page = await self.context.new_page()
+
+    async def asyncTearDown(self):
+        await self.page.close()
+        await self.context.close()
+        await self.browser.close()
+        await self.playwright.stop()
+
+    async def test_offline(self):
+        print("\n===== test_offline =====")
+
+        def respond(path, variables):
+            self.assertTrue(path.endswith("/TweetDetail"))
+            return tweet_detail(int(variables["focalTweetId"]), threads=3)
+
+        with StubServer(respond) as server:
+            template = GraphQLTemplate(
+                url=f"{server.url}/i/api/graphql/QueryId/TweetDetail",
+                variables={"focalTweetId": "0", "with_rux_injections": False},
+                features={"responsive_web_graphql_timeline_navigation_enabled": True},
+                headers={"authorization": "Bearer token"},
+            )
+            for tweet_id in (1001, 1002, 1003):
+                crawler = TwitterStatusCrawler(
+                    self.page,
+                    f"https://x.com/user/status/{tweet_id}",
+                    template=template,
+                )
+                result = await crawler.run()
+                self.assertEqual(result.id, tweet_id)
+                self.assertEqual(len(result.conversation_threads), 3)
+        print("===== done =====")
+
+    async def test_authenticated(self):
+        print("\n===== test_authenticated =====")
+        await add_cookies(self.context)
+        crawler = TwitterStatusCrawler(self.page, os.environ["TWEET_PLAIN_TEXT"])
+        await crawler.run()
+        template = await crawler.capture_template()
+        print(f"{template.url=}")
+        crawler = TwitterStatusCrawler(
+            self.page, os.environ["TWEET_PHOTO"], template=template
+        )
+        result = await crawler.run()
+        self.assertIsNotNone(
+            next(filter(lambda x: x.type == "photo", result.entities.media), None)
+        )
+        print("===== done =====")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import time
+import unittest
+
+from tweet_crawler.metrics import CrawlMetrics, MetricsRecorder
+
+
+class MetricsCase(unittest.TestCase):
+    def crawl(self, crawler: str, error: Exception = None) -> CrawlMetrics:
+        metrics = CrawlMetrics(crawler, "https://x.com/user", "default")
+        self.assertTrue(metrics.start())
+        self.assertFalse(metrics.start())
+        metrics.navigation_time = 0.25
+        time.sleep(0.01)
+        metrics.response(100)
+        metrics.response(50)
+        metrics.scrolls = 2
+        self.assertTrue(metrics.finish(error))
+        self.assertFalse(metrics.finish())
+        return metrics
+
+    def test_metrics(self):
+        metrics = self.crawl("TwitterFollowersCrawler")
+        self.assertEqual(metrics.responses, 2)
+        self.assertEqual(metrics.response_bytes, 150)
+        self.assertGreaterEqual(metrics.first_response_time, 0.01)
+        self.assertGreaterEqual(metrics.duration, metrics.first_response_time)
+        self.assertIsNone(metrics.error)
+        self.assertEqual(self.crawl("x", ValueError()).error, "ValueError")
+
+    def test_recorder(self):
+        seen = []
+        recorder = MetricsRecorder(hooks=[seen.append], keep=2)
+        for _ in range(3):
+            recorder.record(self.crawl("TwitterFollowersCrawler"))
+        recorder.record(self.crawl("TwitterStatusCrawler", TimeoutError()))
+        self.assertEqual(len(seen), 4)
+        self.assertEqual(len(recorder.recent), 2)
+
+        snapshot = json.loads(recorder.to_json())
+        followers = snapshot["crawlers"]["TwitterFollowersCrawler"]
+        self.assertEqual(followers["crawls"], 3)
+        self.assertEqual(followers["responses"], 6)
+        self.assertEqual(followers["scrolls"], 6)
+        self.assertEqual(followers["navigation_time"]["count"], 3)
+        self.assertAlmostEqual(followers["navigation_time"]["sum"], 0.75)
+        self.assertEqual(followers["parse_time"]["sum"], 0.0)
+        status = snapshot["crawlers"]["TwitterStatusCrawler"]
+        self.assertEqual(status["errors"], {"TimeoutError": 1})
+        self.assertEqual(snapshot["recent"][-1]["error"], "TimeoutError")
+
+        text = recorder.to_prometheus()
+        self.assertIn("# TYPE tweet_crawler_navigation_seconds summary", text)
+        self.assertIn(
+            'tweet_crawler_navigation_seconds_count{crawler="TwitterFollowersCrawler"} 3',
+            text,
+        )
+        self.assertIn(
+            'tweet_crawler_errors_total{crawler="TwitterStatusCrawler",error="TimeoutError"} 1',
+            text,
+        )
+        self.assertIn(
+            'tweet_crawler_response_bytes_total{crawler="TwitterFollowersCrawler"} 450',
+            text,
+        )
+
+    def test_failing_hook(self):
+        def hook(metrics: CrawlMetrics) -> None:
+            raise RuntimeError("broken")
+
+        recorder = MetricsRecorder(hooks=[hook])
+        with self.assertWarns(RuntimeWarning):
+            recorder.record(self.crawl("TwitterStatusCrawler"))
+        self.assertEqual(len(recorder.recent), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import copy
+import random
+import unittest
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from payload import media_entity, tweet_detail, user_result
+from pydantic import BaseModel, Field
+
+from tweet_crawler.model import (
+    TWITTER_DATETIME_FORMAT,
+    LazyThreads,
+    Tweet,
+    TwitterEntities,
+    TwitterEntityMediaAnimatedGif,
+    TwitterEntityMediaPhoto,
+    TwitterEntityMediaVideo,
+    TwitterUser,
+    UserCache,
+    parse_twitter_datetime,
+)
+
+
+class UndiscriminatedEntities(BaseModel):
+    media: List[
+        TwitterEntityMediaPhoto
+        | TwitterEntityMediaVideo
+        | TwitterEntityMediaAnimatedGif
+    ] = Field(default_factory=list)
+
+
+class ModelCase(unittest.TestCase):
+    def test_media_discriminator(self):
+        for kind in ("photo", "video", "animated_gif"):
+            data = {"media": [media_entity(1, 1, kind)]}
+            expected = UndiscriminatedEntities.model_validate(copy.deepcopy(data))
+            actual = TwitterEntities.model_validate(copy.deepcopy(data))
+            self.assertEqual(type(actual.media[0]), type(expected.media[0]))
+            self.assertEqual(actual.media, expected.media)
+
+    def test_media_thread(self):
+        content = tweet_detail(1, threads=3, depth=2, media="video")
+        tweet = Tweet.from_instructions(
+            content["data"]["threaded_conversation_with_injections_v2"]["instructions"]
+        )
+        for thread in tweet.conversation_threads:
+            for reply in thread:
+                self.assertIsInstance(reply.entities.media[0], TwitterEntityMediaVideo)
+
+    def test_lazy_threads(self):
+        content = tweet_detail(1, threads=4, depth=3, tombstones=True)
+        instructions = content["data"]["threaded_conversation_with_injections_v2"][
+            "instructions"
+        ]
+        eager = Tweet.from_instructions(copy.deepcopy(instructions))
+        lazy = Tweet.from_instructions(copy.deepcopy(instructions), lazy=True)
+        threads = lazy.conversation_threads
+        self.assertIsInstance(threads, LazyThreads)
+        self.assertEqual(len(threads), len(eager.conversation_threads))
+        self.assertEqual(threads.parsed, 0)
+        self.assertEqual(threads[-1], eager.conversation_threads[-1])
+        self.assertEqual(threads.parsed, 1)
+        self.assertEqual(lazy.model_dump(), eager.model_dump())
+        self.assertEqual(lazy.model_dump_json(), eager.model_dump_json())
+        self.assertEqual(lazy, eager)
+
+    def test_user_cache(self):
+        cache = UserCache(maxsize=2)
+        TwitterUser.cache, default = cache, TwitterUser.cache
+        try:
+            first = TwitterUser.from_result(user_result(1))
+            self.assertIs(TwitterUser.from_result(user_result(1)), first)
+            changed = user_result(1)
+            changed["legacy"]["followers_count"] += 1
+            self.assertIsNot(TwitterUser.from_result(changed), first)
+            TwitterUser.from_result(user_result(2))
+            self.assertEqual(len(cache), 2)
+            self.assertIsNot(TwitterUser.from_result(user_result(1)), first)
+            self.assertEqual(cache.hits, 1)
+
+            content = tweet_detail(1, threads=4, depth=3, authors=2)
+            tweet = Tweet.from_instructions(
+                content["data"]["threaded_conversation_with_injections_v2"][
+                    "instructions"
+                ]
+            )
+            users = {id(r.user) for t in tweet.conversation_threads for r in t}
+            self.assertLessEqual(len(users), 2)
+        finally:
+            TwitterUser.cache = default
+
+    def test_datetime(self):
+        rng = random.Random(0)
+        values = [
+            "Wed Oct 10 20:19:24 +0000 2018",
+            "Wed Oct 10 20:19:24 -0000 2018",
+            "Mon Jan 01 00:00:00 +0000 2020",
+            "Thu Feb 29 23:59:59 +1345 2024",
+            "Wed Oct 10 20:19:24 -0930 2018",
+            "wed oct 10 20:19:24 +0000 2018",
+            "Wed Oct 10 20:19:24 +00:00 2018",
+            "Wed Oct 10 20:19:24 Z 2018",
+            "Wed Oct 1 20:19:24 +0000 2018",
+        ]
+        for _ in range(500):
+            offset = timedelta(minutes=rng.randrange(-14 * 60, 14 * 60 + 1, 15))
+            moment = datetime(2006, 3, 21, tzinfo=timezone(offset)) + timedelta(
+                seconds=rng.randrange(20 * 365 * 86400)
+            )
+            values.append(moment.strftime(TWITTER_DATETIME_FORMAT))
+        for value in values:
+            expected = datetime.strptime(value, TWITTER_DATETIME_FORMAT)
+            actual = parse_twitter_datetime(value)
+            self.assertEqual(actual, expected, value)
+            self.assertEqual(actual.timetuple(), expected.timetuple(), value)
+            self.assertEqual(actual.tzinfo, expected.tzinfo, value)
+        for value in (
+            "Wed Feb 30 20:19:24 +0000 2018",
+            "Wed Oct 10 24:19:24 +0000 2018",
+            "Wed Oct 10 20:60:24 +0000 2018",
+            "Wed Oct 10 20:19:24 +0060 2018",
+            "Wed Oct 10 20:19:24 +2400 2018",
+            "Wed Oct 10 20:19:24 +0000 2018 ",
+            "Wxd Oct 10 20:19:24 +0000 2018",
+        ):
+            with self.assertRaises(ValueError, msg=value):
+                datetime.strptime(value, TWITTER_DATETIME_FORMAT)
+            with self.assertRaises(ValueError, msg=value):
+                parse_twitter_datetime(value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,240 @@
+from typing import List, Optional
+
+
+def user_result(user_id: int) -> dict:
+    return {
+        "__typename": "User",
+        "id": f"VXNlcjo{user_id}",
+        "rest_id": str(user_id),
+        "core": {
+            "created_at": "Tue Mar 21 20:50:14 +0000 2006",
+            "name": f"User {user_id}",
+            "screen_name": f"user_{user_id}",
+        },
+        "avatar": {
+            "image_url": f"https://pbs.twimg.com/profile_images/{user_id}/a_normal.jpg"
+        },
+        "location": {"location": "Earth"},
+        "privacy": {"protected": False},
+        "verification": {"verified": False},
+        "relationship_perspectives": {"following": False},
+        "dm_permissions": {"can_dm": False},
+        "legacy": {
+            "description": "Synthetic user https://t.co/abc",
+            "entities": {
+                "description": {
+                    "urls": [
+                        {
+                            "display_url": "example.com",
+                            "expanded_url": "https://example.com",
+                            "url": "https://t.co/abc",
+                            "indices": [17, 33],
+                        }
+                    ]
+                },
+                "url": {"urls": []},
+            },
+            "followers_count": user_id * 3,
+            "friends_count": user_id * 2,
+            "listed_count": 1,
+            "favourites_count": 10,
+            "statuses_count": 100,
+            "pinned_tweet_ids_str": [],
+            "profile_banner_url": f"https://pbs.twimg.com/profile_banners/{user_id}/1",
+        },
+    }
+
+
+def media_entity(tweet_id: int, user_id: int, kind: str) -> dict:
+    entity = {
+        "type": kind,
+        "indices": [20, 43],
+        "media_url_https": f"https://pbs.twimg.com/media/{tweet_id}.jpg",
+        "expanded_url": f"https://x.com/user_{user_id}/status/{tweet_id}/photo/1",
+    }
+    if kind != "photo":
+        entity["original_info"] = {"height": 720, "width": 1280}
+        entity["video_info"] = {
+            "duration_millis": 15000,
+            "variants": [
+                {"url": f"https://video.twimg.com/{tweet_id}/pl/playlist.m3u8"},
+                {"url": f"https://video.twimg.com/{tweet_id}/vid/1280x720/a.mp4"},
+            ],
+        }
+        if kind == "animated_gif":
+            del entity["video_info"]["duration_millis"]
+    return entity
+
+
+def tweet_result(tweet_id: int, user_id: int, media: Optional[str] = None) -> dict:
+    entities = {
+        "hashtags": [{"indices": [0, 5], "text": "test"}],
+        "symbols": [],
+        "timestamps": [],
+        "urls": [],
+        "user_mentions": [
+            {
+                "id_str": str(user_id + 1),
+                "name": f"User {user_id + 1}",
+                "screen_name": f"user_{user_id + 1}",
+                "indices": [6, 19],
+            }
+        ],
+    }
+    if media is not None:
+        entities["media"] = [media_entity(tweet_id, user_id, media)]
+    return {
+        "__typename": "Tweet",
+        "rest_id": str(tweet_id),
+        "core": {"user_results": {"result": user_result(user_id)}},
+        "views": {"count": str(tweet_id % 1000), "state": "EnabledWithCount"},
+        "legacy": {
+            "id_str": str(tweet_id),
+            "created_at": "Wed Oct 10 20:19:24 +0000 2018",
+            "full_text": f"#test @user_{user_id + 1} tweet {tweet_id}",
+            "display_text_range": [0, 30],
+            "lang": "en",
+            "entities": entities,
+            "bookmark_count": 1,
+            "favorite_count": 2,
+            "quote_count": 3,
+            "reply_count": 4,
+            "retweet_count": 5,
+            "bookmarked": False,
+            "favorited": False,
+            "retweeted": False,
+            "user_id_str": str(user_id),
+        },
+    }
+
+
+def tombstone_result() -> dict:
+    return {
+        "__typename": "TweetTombstone",
+        "tombstone": {"text": {"text": "This Post was deleted by the Post author."}},
+    }
+
+
+def tweet_entry(tweet_id: int, user_id: int, media: Optional[str] = None) -> dict:
+    return {
+        "entryId": f"tweet-{tweet_id}",
+        "content": {
+            "entryType": "TimelineTimelineItem",
+            "itemContent": {
+                "itemType": "TimelineTweet",
+                "tweet_results": {"result": tweet_result(tweet_id, user_id, media)},
+            },
+        },
+    }
+
+
+def thread_entry(thread_id: int, results: List[dict]) -> dict:
+    items = [
+        {
+            "entryId": f"conversationthread-{thread_id}-tweet-{thread_id + index}",
+            "item": {
+                "itemContent": {
+                    "itemType": "TimelineTweet",
+                    "tweet_results": {"result": result},
+                }
+            },
+        }
+        for index, result in enumerate(results)
+    ]
+    items.append(
+        {
+            "entryId": f"conversationthread-{thread_id}-cursor-showmore-{thread_id}",
+            "item": {"itemContent": {"itemType": "TimelineTimelineCursor"}},
+        }
+    )
+    return {
+        "entryId": f"conversationthread-{thread_id}",
+        "content": {"entryType": "TimelineTimelineModule", "items": items},
+    }
+
+
+def tweet_detail(
+    tweet_id: int,
+    threads: int = 0,
+    depth: int = 1,
+    authors: int = 8,
+    tombstones: bool = False,
+    media: Optional[str] = None,
+) -> dict:
+    entries = [tweet_entry(tweet_id, 1, media)]
+    for thread in range(threads):
+        thread_id = tweet_id + (thread + 1) * 1000
+        results = [
+            tweet_result(thread_id + index, (thread + index) % authors + 1, media)
+            for index in range(depth)
+        ]
+        if tombstones and thread % 5 == 0:
+            results[0] = tombstone_result()
+        entries.append(thread_entry(thread_id, results))
+    return {
+        "data": {
+            "threaded_conversation_with_injections_v2": {
+                "instructions": [
+                    {"type": "TimelineClearCache"},
+                    {"type": "TimelineAddEntries", "entries": entries},
+                ]
+            }
+        }
+    }
+
+
+def tweet_result_by_rest_id(tweet_id: int) -> dict:
+    return {"data": {"tweetResult": {"result": tweet_result(tweet_id, 1, "photo")}}}
+
+
+def followers_page(
+    start: int, count: int, cursor: str, terminate: bool = False
+) -> dict:
+    entries: List[dict] = [
+        {
+            "entryId": f"user-{user_id}",
+            "content": {
+                "entryType": "TimelineTimelineItem",
+                "itemContent": {
+                    "itemType": "TimelineUser",
+                    "user_results": {"result": user_result(user_id)},
+                },
+            },
+        }
+        for user_id in range(start, start + count)
+    ]
+    entries.append(
+        {
+            "entryId": f"cursor-bottom-{cursor}",
+            "content": {
+                "entryType": "TimelineTimelineCursor",
+                "value": cursor,
+                "cursorType": "Bottom",
+            },
+        }
+    )
+    instructions: List[dict] = [{"type": "TimelineAddEntries", "entries": entries}]
+    if terminate:
+        instructions.append(
+            {"type": "TimelineTerminateTimeline", "direction": "Bottom"}
+        )
+    return {
+        "data": {
+            "user": {
+                "result": {
+                    "__typename": "User",
+                    "timeline": {"timeline": {"instructions": instructions}},
+                }
+            }
+        }
+    }
+
+
+def unavailable(reason: Optional[str] = "NsfwLoggedOut") -> dict:
+    return {
+        "data": {
+            "tweetResult": {
+                "result": {"__typename": "TweetUnavailable", "reason": reason}
+            }
+        }
+    }
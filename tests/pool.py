@@ -0,0 +1,54 @@
+import os
+import unittest
+
+from dotenv import load_dotenv
+from playwright.async_api import Browser, Playwright, async_playwright
+from util import cookies
+
+from tweet_crawler import CrawlerPool, Tweet, TwitterStatusCrawler
+
+load_dotenv()
+
+
+class PoolCase(unittest.IsolatedAsyncioTestCase):
+    playwright: Playwright
+    browser: Browser
+
+    async def asyncSetUp(self):
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch()
+
+    async def asyncTearDown(self):
+        await self.browser.close()
+        await self.playwright.stop()
+
+    async def test_reuse(self):
+        print("\n===== test_reuse =====")
+        async with CrawlerPool(self.browser, size=1, cookies=cookies()) as pool:
+            for _ in range(3):
+                result = await pool.crawl(
+                    TwitterStatusCrawler, os.environ["TWEET_PLAIN_TEXT"]
+                )
+                print(f"{result.id=}")
+            self.assertEqual(pool._slots[0].crawls, 3)
+        print("===== done =====")
+
+    async def test_imap(self):
+        print("\n===== test_imap =====")
+        urls = [
+            os.environ["TWEET_PLAIN_TEXT"],
+            os.environ["TWEET_PHOTO"],
+            os.environ["TWEET_VIDEO"],
+            os.environ["TWEET_HASHTAG"],
+        ]
+        async with CrawlerPool(self.browser, size=2, cookies=cookies()) as pool:
+            results = {url: r async for url, r in pool.imap(TwitterStatusCrawler, urls)}
+        self.assertEqual(set(results), set(urls))
+        for url, result in results.items():
+            self.assertIsInstance(result, Tweet)
+            print(f"{url} -> {result.id=}")
+        print("===== done =====")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import time
+import unittest
+
+from tweet_crawler.exception import RateLimited
+from tweet_crawler.ratelimit import RateLimiter
+
+
+def headers(limit: int, remaining: int, reset: float) -> dict:
+    return {
+        "x-rate-limit-limit": str(limit),
+        "x-rate-limit-remaining": str(remaining),
+        "x-rate-limit-reset": str(int(reset)),
+    }
+
+
+class RateLimitCase(unittest.IsolatedAsyncioTestCase):
+    async def test_unknown(self):
+        limiter = RateLimiter()
+        start = time.monotonic()
+        for _ in range(10):
+            await limiter.acquire("Followers")
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertEqual(limiter.budget(), float("inf"))
+
+    def test_pacing(self):
+        limiter = RateLimiter(reserve=1)
+        reset = time.time() + 100
+        limiter.observe("Followers", 200, headers(50, 5, reset), "a")
+        bucket = limiter.bucket("Followers", "a")
+        self.assertEqual(limiter.budget("a"), 4)
+        slots = [bucket.reserve_slot() for _ in range(5)]
+        # Four requests spread over the window, the reserve kept for after it.
+        self.assertTrue(all(b > a for a, b in zip(slots, slots[1:])))
+        self.assertLess(slots[3], reset)
+        self.assertGreaterEqual(slots[4], int(reset))
+        self.assertEqual(limiter.budget("b"), float("inf"))
+
+    async def test_too_many_requests(self):
+        limiter = RateLimiter(max_delay=1)
+        reset = time.time() + 60
+        with self.assertRaises(RateLimited) as cm:
+            limiter.observe("TweetDetail", 429, headers(150, 0, reset), "a")
+        self.assertEqual(cm.exception.reset, int(reset))
+        self.assertEqual(limiter.budget("a"), 0)
+        with self.assertRaises(RateLimited):
+            await limiter.acquire("TweetDetail", "a")
+        await limiter.acquire("TweetDetail", "b")
+
+
+if __name__ == "__main__":
+    unittest.main()
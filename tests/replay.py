@@ -0,0 +1,266 @@
+import json
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import quote
+
+from payload import followers_page, tweet_detail
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    async_playwright,
+)
+
+from tweet_crawler import (
+    TwitterCountersCrawler,
+    TwitterFollowersCrawler,
+    TwitterStatusCrawler,
+)
+from tweet_crawler.checkpoint import Checkpoint
+from tweet_crawler.crawler.direct import with_variables
+from tweet_crawler.crawler.router import GRAPHQL_PATTERN, ResponseRouter
+from tweet_crawler.exception import CrawlTimeout
+from tweet_crawler.replay import Cassette, Replayer
+from tweet_crawler.sink import JsonlSink, read_jsonl
+from tweet_crawler.store import TweetStore
+
+GRAPHQL = "https://x.com/i/api/graphql/QueryId"
+
+
+def graphql_url(endpoint: str, **variables) -> str:
+    return f"{GRAPHQL}/{endpoint}?variables={quote(json.dumps(variables))}"
+
+
+class ReplayCase(unittest.IsolatedAsyncioTestCase):
+    playwright: Playwright
+    browser: Browser
+    context: BrowserContext
+    page: Page
+    directory: tempfile.TemporaryDirectory
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        status = Cassette(
+            "https://x.com/user/status/100",
+            [
+                {
+                    "url": graphql_url("TweetDetail", focalTweetId="100"),
+                    "status": 200,
+                    "body": tweet_detail(100, threads=5, tombstones=True),
+                }
+            ],
+        )
+        followers = Cassette(
+            "https://x.com/user/followers",
+            [
+                {
+                    "url": graphql_url("Followers", userId="1", cursor=cursor),
+                    "status": 200,
+                    "body": followers_page(
+                        index * 20 + 1, 20, f"c{index + 1}", terminate=index == 2
+                    ),
+                }
+                for index, cursor in enumerate(["", "c1", "c2"])
+            ],
+        )
+        first = graphql_url("Followers", userId="2")
+        resumed = Cassette(
+            "https://x.com/resumed/followers",
+            [
+                {"url": first, "status": 200, "body": followers_page(1, 20, "c1")},
+                {
+                    "url": with_variables(first, cursor="c1"),
+                    "status": 200,
+                    "body": followers_page(21, 20, "c2"),
+                },
+                {
+                    "url": with_variables(first, cursor="c2"),
+                    "status": 200,
+                    "body": followers_page(41, 20, "c3", terminate=True),
+                },
+            ],
+        )
+        # Pages whose timelines stop loading, for deadlines and cancellation.
+        stalled_status = Cassette("https://x.com/user/status/200", [])
+        stalled = Cassette(
+            "https://x.com/stalled/followers",
+            [
+                {
+                    "url": graphql_url("Followers", userId="3"),
+                    "status": 200,
+                    "body": followers_page(1, 20, "c1"),
+                }
+            ],
+        )
+        status.save(Path(self.directory.name) / "status.json")
+        stalled_status.save(Path(self.directory.name) / "stalled_status.json")
+        stalled.save(Path(self.directory.name) / "stalled.json")
+        followers.save(Path(self.directory.name) / "followers.json")
+        resumed.save(Path(self.directory.name) / "resumed.json")
+
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch()
+        self.context = await self.browser.new_context()
+        self.page = await self.context.new_page()
+        await Replayer.from_directory(self.directory.name).attach(self.page)
+
+    async def asyncTearDown(self):
+        await self.page.close()
+        await self.context.close()
+        await self.browser.close()
+        await self.playwright.stop()
+        self.directory.cleanup()
+
+    async def test_status(self):
+        print("\n===== test_status =====")
+        crawler = TwitterStatusCrawler(self.page, "https://x.com/user/status/100")
+        result = await crawler.run()
+        self.assertEqual(result.id, 100)
+        self.assertEqual(len(result.conversation_threads), 5)
+        print("===== done =====")
+
+    async def test_status_process_pool(self):
+        print("\n===== test_status_process_pool =====")
+        with ProcessPoolExecutor(1) as executor:
+            crawler = TwitterStatusCrawler(
+                self.page, "https://x.com/user/status/100", executor=executor
+            )
+            result = await crawler.run()
+        self.assertEqual(result.id, 100)
+        self.assertEqual(len(result.conversation_threads), 5)
+        print("===== done =====")
+
+    async def test_status_store(self):
+        print("\n===== test_status_store =====")
+        url = "https://x.com/user/status/100"
+        with TweetStore(Path(self.directory.name) / "tweets.db") as store:
+            crawled = await TwitterStatusCrawler(self.page, url, store=store).run()
+            crawler = TwitterStatusCrawler(self.page, url, store=store)
+            self.assertEqual(await crawler.run(), crawled)
+        self.assertTrue(crawler.from_store)
+        self.assertIsNone(crawler.metrics.navigation_time)
+        print("===== done =====")
+
+    async def test_counters(self):
+        print("\n===== test_counters =====")
+        crawler = TwitterCountersCrawler(self.page, "https://x.com/user/status/100")
+        counters = await crawler.run()
+        tweet = await TwitterStatusCrawler(
+            self.page, "https://x.com/user/status/100"
+        ).run()
+        self.assertEqual(counters["views_count"], tweet.views_count)
+        self.assertEqual(counters["favorite_count"], tweet.favorite_count)
+        print("===== done =====")
+
+    async def test_router(self):
+        print("\n===== test_router =====")
+        self.assertEqual(
+            GRAPHQL_PATTERN.match(graphql_url("Following"))[1], "Following"
+        )
+        self.assertIsNone(GRAPHQL_PATTERN.match(graphql_url("UserTweets")))
+        router = ResponseRouter.for_page(self.page)
+        for _ in range(3):
+            crawler = TwitterStatusCrawler(self.page, "https://x.com/user/status/100")
+            self.assertIs(crawler.router, router)
+            self.assertIs(router.crawler, crawler)
+            self.assertEqual((await crawler.run()).id, 100)
+            crawler.detach()
+            self.assertIsNone(router.crawler)
+            await self.page.goto("about:blank")
+        print("===== done =====")
+
+    async def test_followers(self):
+        print("\n===== test_followers =====")
+        crawler = TwitterFollowersCrawler(self.page, "user", scroll_interval=0.1)
+        result = await crawler.run()
+        self.assertEqual([user.id for user in result], list(range(1, 61)))
+        self.assertTrue(crawler.scroll_done_signal.is_set())
+        self.assertTrue(crawler.complete)
+        metrics = crawler.metrics
+        print(metrics.as_dict())
+        self.assertGreater(metrics.pages, 0)
+        self.assertGreaterEqual(metrics.responses, metrics.pages)
+        self.assertGreater(metrics.response_bytes, 0)
+        self.assertIsNotNone(metrics.navigation_time)
+        self.assertLessEqual(metrics.first_response_time, metrics.duration)
+        print("===== done =====")
+
+    async def test_followers_sync(self):
+        print("\n===== test_followers_sync =====")
+        previous = [11, 12, 999] + [i for i in range(13, 61) if i != 15]
+        crawler = TwitterFollowersCrawler(
+            self.page, "user", known=previous, stop_after=5, scroll_interval=0.1
+        )
+        sync = await crawler.sync()
+        self.assertEqual([user.id for user in sync.new], list(range(1, 11)) + [15])
+        self.assertEqual(sync.unfollowers, {999})
+        self.assertFalse(sync.complete)
+        print("===== done =====")
+
+    async def test_followers_sink(self):
+        print("\n===== test_followers_sink =====")
+        path = Path(self.directory.name) / "followers.jsonl.gz"
+        with JsonlSink(path) as sink:
+            crawler = TwitterFollowersCrawler(
+                self.page, "user", scroll_interval=0.1, sink=sink
+            )
+            self.assertEqual(await crawler.drain(), 60)
+        self.assertEqual([user["id"] for user in read_jsonl(path)], list(range(1, 61)))
+        print("===== done =====")
+
+    async def test_followers_resume(self):
+        print("\n===== test_followers_resume =====")
+        path = Path(self.directory.name) / "resumed.checkpoint"
+        checkpoint = Checkpoint(path)
+        checkpoint.start("https://x.com/resumed/followers")
+        checkpoint.record("c1", range(1, 21))
+        crawler = TwitterFollowersCrawler.resume(self.page, path, scroll_interval=0.1)
+        result = await crawler.run()
+        # The stub document then requests the resumed page a second time; its
+        # users are dropped as already seen.
+        self.assertEqual([user.id for user in result], list(range(21, 61)))
+        self.assertFalse(path.exists())
+        print("===== done =====")
+
+    async def test_status_timeout(self):
+        print("\n===== test_status_timeout =====")
+        crawler = TwitterStatusCrawler(
+            self.page, "https://x.com/user/status/200", timeout=1.0
+        )
+        with self.assertRaises(CrawlTimeout):
+            await crawler.run()
+        self.assertTrue(crawler.timed_out)
+        self.assertEqual(crawler.metrics.error, "CrawlTimeout")
+        self.assertEqual(self.page.url, "about:blank")
+        # The page is released and can serve the next crawl.
+        crawler = TwitterStatusCrawler(self.page, "https://x.com/user/status/100")
+        self.assertEqual((await crawler.run()).id, 100)
+        print("===== done =====")
+
+    async def test_followers_timeout(self):
+        print("\n===== test_followers_timeout =====")
+        crawler = TwitterFollowersCrawler(
+            self.page, "stalled", scroll_interval=0.1, timeout=1.0
+        )
+        result = await crawler.run()
+        self.assertEqual([user.id for user in result], list(range(1, 21)))
+        self.assertTrue(crawler.timed_out)
+        self.assertFalse(crawler.complete)
+        self.assertEqual(self.page.url, "about:blank")
+
+        crawler = TwitterFollowersCrawler(self.page, "user", scroll_interval=0.1)
+        pages = []
+        async for batch in crawler.run_yield():
+            pages.append(batch)
+            crawler.cancel()
+        self.assertEqual(len(pages), 1)
+        self.assertFalse(crawler.timed_out)
+        self.assertEqual(crawler.metrics.error, "CrawlCancelled")
+        print("===== done =====")
+
+
+if __name__ == "__main__":
+    unittest.main()
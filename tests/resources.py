@@ -0,0 +1,120 @@
+import re
+import unittest
+from types import SimpleNamespace
+from typing import Any, List, Tuple
+
+from tweet_crawler.crawler import ResourceFilter
+
+
+class StubPage:
+    def __init__(self):
+        self.calls: List[Tuple[str, str, Any]] = []
+
+    async def route(self, url: str, handler) -> None:
+        self.calls.append(("route", url, handler))
+
+    async def unroute(self, url: str, handler) -> None:
+        self.calls.append(("unroute", url, handler))
+
+
+class StubRoute:
+    def __init__(self, resource_type: str, url: str):
+        self.request = SimpleNamespace(resource_type=resource_type, url=url)
+        self.result = None
+
+    async def abort(self, error_code: str) -> None:
+        self.result = error_code
+
+    async def fallback(self) -> None:
+        self.result = "fallback"
+
+
+class ResourceCase(unittest.IsolatedAsyncioTestCase):
+    def test_resource_types(self):
+        resource_filter = ResourceFilter()
+        url = "https://x.com/elonmusk"
+        for resource_type in ("document", "script", "xhr", "fetch", "other"):
+            self.assertFalse(resource_filter.should_block(resource_type, url))
+        for resource_type in ("image", "media", "font", "texttrack"):
+            self.assertTrue(resource_filter.should_block(resource_type, url))
+
+    def test_hosts(self):
+        resource_filter = ResourceFilter()
+        blocked = [
+            "https://pbs.twimg.com/media/a.jpg",
+            "https://video.twimg.com/ext_tw_video/1/pu/vid/a.mp4",
+            "https://static.ads-twitter.com/uwt.js",
+            "https://www.google-analytics.com/collect",
+            "https://stats.g.doubleclick.net/j/collect",
+        ]
+        allowed = [
+            "https://x.com/i/api/graphql/abc/TweetDetail",
+            "https://abs.twimg.com/responsive-web/client-web/main.js",
+            "https://api.x.com/graphql/abc/TweetResultByRestId",
+            # Only the host itself and its subdomains are blocked.
+            "https://notdoubleclick.net/a.js",
+            "https://pbs.twimg.com.example.org/a.js",
+            "https://example.org/?u=https://pbs.twimg.com/a.jpg",
+        ]
+        for url in blocked:
+            self.assertTrue(resource_filter.should_block("script", url), url)
+        for url in allowed:
+            self.assertFalse(resource_filter.should_block("script", url), url)
+
+    def test_url_patterns(self):
+        resource_filter = ResourceFilter()
+        for url in (
+            "https://x.com/i/api/1.1/jot/client_event.json",
+            "https://x.com/i/adsct?p_id=Twitter",
+            "https://api.x.com/i/api/1.1/live_pipeline/events",
+        ):
+            self.assertTrue(resource_filter.should_block("xhr", url), url)
+        self.assertFalse(
+            resource_filter.should_block("xhr", "https://x.com/i/api/1.1/jotx")
+        )
+
+    def test_custom_lists(self):
+        resource_filter = ResourceFilter(
+            allowed_resource_types={"document", "image"},
+            blocked_hosts={"example.org"},
+            blocked_url_patterns=[re.compile(r"/ads/")],
+        )
+        self.assertFalse(resource_filter.should_block("image", "https://x.com/a.png"))
+        self.assertTrue(resource_filter.should_block("script", "https://x.com/a.js"))
+        self.assertTrue(
+            resource_filter.should_block("document", "https://cdn.example.org/")
+        )
+        self.assertTrue(resource_filter.should_block("document", "https://x.com/ads/"))
+        # The defaults are replaced, not extended.
+        self.assertFalse(
+            resource_filter.should_block("document", "https://pbs.twimg.com/a")
+        )
+
+    async def test_handle(self):
+        resource_filter = ResourceFilter()
+        route = StubRoute("image", "https://pbs.twimg.com/media/a.jpg")
+        await resource_filter.handle(route)  # type: ignore
+        self.assertEqual(route.result, "blockedbyclient")
+        route = StubRoute("xhr", "https://x.com/i/api/graphql/abc/Followers")
+        await resource_filter.handle(route)  # type: ignore
+        self.assertEqual(route.result, "fallback")
+
+    async def test_attach(self):
+        resource_filter = ResourceFilter()
+        page, other = StubPage(), StubPage()
+        route = ("route", "**/*", resource_filter.handle)
+        unroute = ("unroute", "**/*", resource_filter.handle)
+        await resource_filter.attach(page)  # type: ignore
+        await resource_filter.attach(page)  # type: ignore
+        self.assertEqual(page.calls, [route])
+        await resource_filter.detach(other)  # type: ignore
+        self.assertEqual(other.calls, [])
+        await resource_filter.detach(page)  # type: ignore
+        await resource_filter.detach(page)  # type: ignore
+        self.assertEqual(page.calls, [route, unroute])
+        await resource_filter.attach(page)  # type: ignore
+        self.assertEqual(page.calls, [route, unroute, route])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import asyncio
+import json
+import unittest
+from typing import Any, Callable, List, Sequence
+from unittest import mock
+
+from tweet_crawler.crawler._base import BLANK_URL, ScrollableCrawler
+
+GRAPHQL_URL = "https://x.com/i/api/graphql/QueryId/Followers"
+
+
+class StubResponse:
+    def __init__(self, content: Any):
+        self.url = GRAPHQL_URL
+        self.status = 200
+        self.headers = {}
+        self._body = json.dumps(content).encode()
+
+    async def body(self) -> bytes:
+        return self._body
+
+
+class StubKeyboard:
+    def __init__(self, on_press: Callable[[], None]):
+        self.on_press = on_press
+
+    async def press(self, key: str) -> None:
+        self.on_press()
+
+
+class StubPage:
+    """Answers navigation with the responses of ``script[0]``, and the n-th
+    scroll with those of ``script[n]``; later scrolls get no response."""
+
+    def __init__(self, script: Sequence[Sequence[Any]]):
+        self.script = script
+        self.handlers = []
+        self.presses = 0
+        self.events: List[Any] = []
+        self.keyboard = StubKeyboard(self.pressed)
+
+    def on(self, event: str, handler) -> None:
+        if event == "response":
+            self.handlers.append(handler)
+
+    def respond(self, step: int) -> None:
+        for content in self.script[step] if step < len(self.script) else ():
+            for handler in self.handlers:
+                asyncio.ensure_future(handler(StubResponse(content)))
+
+    async def goto(self, url: str) -> None:
+        if url != BLANK_URL:
+            self.respond(0)
+
+    def pressed(self) -> None:
+        self.presses += 1
+        self.events.append("scroll")
+        self.respond(self.presses)
+
+
+class StubCrawler(ScrollableCrawler[int]):
+    """Feeds the ``items`` of each response; ``terminated`` ends the timeline."""
+
+    endpoint = "Followers"
+
+    async def handle_graphql(self, endpoint: str, response) -> None:
+        try:
+            self.observe(endpoint, response)
+            await self.ingest(await response.body())
+        except Exception as e:  # pragma: no cover
+            self.exception = e
+            self.exception_signal.set()
+        finally:
+            self.done_signal.set()
+
+    async def apply(self, converted: Any) -> None:
+        await self.feed(converted["items"])
+        if converted.get("terminated"):
+            self.complete = True
+            self.scroll_done_signal.set()
+
+
+def page(*items: int, terminated: bool = False) -> dict:
+    return {"items": list(items), "terminated": terminated}
+
+
+class ScrollCase(unittest.IsolatedAsyncioTestCase):
+    async def test_wait_increment(self):
+        # Responses to the 3rd and 6th scroll, then an idle timeline.
+        stub = StubPage([[], [], [], [page(1)], [], [], [page(2)]])
+        crawler = StubCrawler(
+            stub,
+            "https://x.com/user/followers",
+            scroll_interval=0.02,
+            max_idle_time=0.4,
+        )
+        crawler.max_scroll_interval = 0.08
+        with mock.patch("asyncio.wait_for", wraps=asyncio.wait_for) as wait_for:
+            result = await asyncio.wait_for(crawler.run(), timeout=5)
+        timeouts = [call.kwargs["timeout"] for call in wait_for.call_args_list[1:]]
+        self.assertEqual(result, [1, 2])
+        self.assertFalse(crawler.complete)
+        # Backing off while idle, from scroll_interval again after each page.
+        expected = [0.02, 0.04, 0.08, 0.08, 0.02, 0.04, 0.08, 0.02, 0.04, 0.08, 0.08]
+        for actual, interval in zip(timeouts, expected):
+            self.assertAlmostEqual(actual, interval)
+        self.assertTrue(all(timeout <= 0.08 for timeout in timeouts))
+        self.assertGreaterEqual(len(timeouts), len(expected))
+        # Only the scroll following each page is not a rescroll.
+        self.assertEqual(crawler.metrics.scrolls, stub.presses)
+        self.assertEqual(crawler.metrics.rescrolls, stub.presses - 2)
+
+    async def test_idle(self):
+        crawler = StubCrawler(
+            StubPage([[page(1)]]),
+            "https://x.com/user/followers",
+            scroll_interval=0.01,
+            max_idle_time=0.2,
+        )
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        self.assertEqual(await asyncio.wait_for(crawler.run(), timeout=5), [1])
+        self.assertGreaterEqual(loop.time() - start, 0.2)
+        self.assertFalse(crawler.complete)
+        self.assertGreater(crawler.metrics.rescrolls, 0)
+
+    async def test_max_pages(self):
+        stub = StubPage([[page(i)] for i in range(10)])
+        crawler = StubCrawler(stub, "https://x.com/user/followers", max_pages=3)
+        self.assertEqual(await asyncio.wait_for(crawler.run(), timeout=5), [0, 1, 2])
+        self.assertEqual(crawler.metrics.pages, 3)
+        self.assertEqual(stub.presses, 2)
+        self.assertFalse(crawler.complete)
+
+    async def test_bounded_queue(self):
+        # Two responses at a time, for a queue of one page and a slow consumer.
+        stub = StubPage([[page(1), page(2)], [page(3), page(4, terminated=True)]])
+        crawler = StubCrawler(
+            stub, "https://x.com/user/followers", scroll_interval=1.0, queue_size=1
+        )
+        async for batch in crawler.run_yield():
+            stub.events.append(batch)
+            await asyncio.sleep(0.05)
+        # Every page once and in order, with no scroll while one was pending.
+        self.assertEqual(stub.events, [[1], [2], "scroll", [3], [4]])
+        self.assertGreater(crawler.metrics.queue_wait_time, 0)
+        self.assertEqual(crawler.metrics.rescrolls, 0)
+        self.assertTrue(crawler.complete)
+
+
+if __name__ == "__main__":
+    unittest.main()
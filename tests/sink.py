@@ -0,0 +1,118 @@
+import gzip
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from payload import user_result
+
+from tweet_crawler.model import TwitterUser
+from tweet_crawler.sink import JsonlSink, read_jsonl, repair
+
+
+class SinkCase(unittest.TestCase):
+    directory: tempfile.TemporaryDirectory
+    path: Path
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / "out.jsonl"
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_buffer(self):
+        sink = JsonlSink(self.path, buffer_size=100)
+        sink.write({"id": 1})
+        self.assertFalse(self.path.exists())
+        sink.write_many({"id": i, "padding": "x" * 50} for i in range(2, 4))
+        self.assertEqual(len(read_jsonl(self.path)), 3)
+        sink.write({"id": 4})
+        sink.flush()
+        self.assertEqual([r["id"] for r in read_jsonl(self.path)], [1, 2, 3, 4])
+        sink.close()
+        with JsonlSink(self.path) as sink:
+            sink.write_line('{"id":5}')
+        self.assertEqual(len(read_jsonl(self.path)), 5)
+        self.assertEqual(sink.records, 1)
+
+    def test_model(self):
+        user = TwitterUser.from_result(user_result(7))
+        with JsonlSink(self.path) as sink:
+            sink.write(user)
+        (record,) = read_jsonl(self.path)
+        self.assertEqual(record, user.model_dump(mode="json"))
+
+    def test_gzip(self):
+        path = self.path.with_suffix(".jsonl.gz")
+        sink = JsonlSink(path)
+        self.assertTrue(sink.compress)
+        sink.write_many({"id": i} for i in range(100))
+        sink.flush()
+        # Flushed lines can be read while the stream is still open.
+        self.assertEqual(len(read_jsonl(path)), 100)
+        sink.write({"id": 100})
+        sink.close()
+        with JsonlSink(path) as sink:
+            sink.write({"id": 101})
+        self.assertEqual([r["id"] for r in read_jsonl(path)], list(range(102)))
+        with gzip.open(path) as f:
+            self.assertEqual(len(f.read().splitlines()), 102)
+
+    def test_rotation(self):
+        with JsonlSink(self.path, max_bytes=1000, buffer_size=200) as sink:
+            sink.write_many({"id": i, "padding": "x" * 80} for i in range(50))
+        self.assertGreater(len(sink.files), 1)
+        self.assertFalse(self.path.exists())
+        self.assertEqual(sink.files[0].name, "out.00000.jsonl")
+        for path in sink.files:
+            self.assertLess(os.path.getsize(path), 1000 + 200)
+        records = [r for path in sink.files for r in read_jsonl(path)]
+        self.assertEqual([r["id"] for r in records], list(range(50)))
+        # A new sink carries on with the last part.
+        with JsonlSink(self.path, max_bytes=1000) as reopened:
+            reopened.write({"id": 50})
+        self.assertEqual(reopened.files, [sink.files[-1]])
+        with self.assertRaises(ValueError):
+            JsonlSink(self.path, max_bytes=0)
+
+    def test_truncated(self):
+        with JsonlSink(self.path) as sink:
+            sink.write({"id": 1})
+        with open(self.path, "ab") as f:
+            f.write(b'{"id":')
+        self.assertEqual(read_jsonl(self.path), [{"id": 1}])
+        # Appending after a crash starts on a fresh line.
+        with JsonlSink(self.path) as sink:
+            sink.write({"id": 2})
+        self.assertEqual(read_jsonl(self.path), [{"id": 1}, {"id": 2}])
+        with open(self.path, "wb") as f:
+            f.write(b'{"id":')
+        repair(self.path)
+        self.assertEqual(os.path.getsize(self.path), 0)
+
+    def test_truncated_gzip(self):
+        path = self.path.with_suffix(".jsonl.gz")
+        with JsonlSink(path) as sink:
+            sink.write({"id": 0})
+        sink = JsonlSink(path)
+        sink.write_many({"id": i} for i in range(1, 100))
+        sink.flush()
+        # A crash leaves the second gzip member unfinished, its last block torn.
+        with open(path, "rb") as f:
+            crashed = f.read()[:-3]
+        sink.close()
+        with open(path, "wb") as f:
+            f.write(crashed)
+        with JsonlSink(path) as sink:
+            sink.write({"id": 100})
+        ids = [r["id"] for r in read_jsonl(path)]
+        self.assertEqual(ids[0], 0)
+        self.assertEqual(ids[-1], 100)
+        self.assertEqual(ids[:-1], list(range(len(ids) - 1)))
+        with gzip.open(path) as f:
+            self.assertEqual(len(f.read().splitlines()), len(ids))
+
+
+if __name__ == "__main__":
+    unittest.main()
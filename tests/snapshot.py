@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+from payload import user_result
+
+from tweet_crawler.model import TwitterUser
+from tweet_crawler.snapshot import FollowerSnapshot
+
+
+def users(start: int, count: int):
+    return [
+        TwitterUser.from_result(user_result(i)) for i in range(start, start + count)
+    ]
+
+
+class SnapshotCase(unittest.IsolatedAsyncioTestCase):
+    directory: tempfile.TemporaryDirectory
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    async def test_roundtrip(self):
+        async def batches():
+            yield users(1, 50)
+            yield users(51, 50)
+
+        snapshot = await FollowerSnapshot().collect(batches())
+        self.assertEqual(len(snapshot), 100)
+        row = snapshot[9]
+        user = TwitterUser.from_result(user_result(10))
+        self.assertEqual(row.id, user.id)
+        self.assertEqual(row.screen_name, user.screen_name)
+        self.assertEqual(row.followers_count, user.followers_count)
+        self.assertEqual(row.created_at, int(user.created_at.timestamp()))
+        self.assertEqual(row.protected, user.protected)
+
+        path = os.path.join(self.directory.name, "followers.snapshot")
+        snapshot.save(path)
+        with FollowerSnapshot.load(path) as mapped:
+            self.assertTrue(mapped.readonly)
+            self.assertEqual(list(mapped), list(snapshot))
+            with self.assertRaises(TypeError):
+                mapped.append(user)
+        copied = FollowerSnapshot.load(path, mmapped=False)
+        self.assertEqual(list(copied), list(snapshot))
+        copied.append(user)
+        self.assertEqual(len(copied), 101)
+
+    def test_diff(self):
+        previous, current = FollowerSnapshot(), FollowerSnapshot()
+        previous.extend(users(1, 10))
+        current.extend(users(5, 10))
+        path = os.path.join(self.directory.name, "previous.snapshot")
+        previous.save(path)
+        with FollowerSnapshot.load(path) as mapped:
+            added, removed = current.diff(mapped)
+        self.assertEqual(added, set(range(11, 15)))
+        self.assertEqual(removed, set(range(1, 5)))
+
+    def test_invalid(self):
+        path = os.path.join(self.directory.name, "invalid.snapshot")
+        with open(path, "wb") as f:
+            f.write(b"\0" * 64)
+        with self.assertRaises(ValueError):
+            FollowerSnapshot.load(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
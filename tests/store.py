@@ -0,0 +1,104 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from payload import tweet_detail, user_result
+
+from tweet_crawler.model import Tweet, TweetTombstone, TwitterUser
+from tweet_crawler.store import TweetStore
+
+
+def parse(content: dict) -> Tweet:
+    instructions = content["data"]["threaded_conversation_with_injections_v2"]
+    return Tweet.from_instructions(instructions["instructions"])
+
+
+class StoreCase(unittest.TestCase):
+    directory: tempfile.TemporaryDirectory
+    path: str
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "tweets.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_roundtrip(self):
+        tweet = parse(
+            tweet_detail(1, threads=10, depth=3, tombstones=True, media="video")
+        )
+        user = TwitterUser.from_result(user_result(99))
+        with TweetStore(self.path) as store:
+            store.write_many([tweet, user])
+            self.assertEqual(store.get_tweet(1), tweet)
+            self.assertEqual(store.get_user(99), user)
+            self.assertIsNone(store.get_tweet(2))
+            self.assertIsNone(store.get_user(100))
+            journal = store.connection.execute("PRAGMA journal_mode").fetchone()[0]
+            self.assertEqual(journal, "wal")
+        self.assertIsInstance(tweet.conversation_threads[0][0], TweetTombstone)
+        with TweetStore(self.path) as reopened:
+            self.assertEqual(reopened.get_tweet(1), tweet)
+
+    def test_upsert(self):
+        with TweetStore(self.path) as store:
+            store.write(parse(tweet_detail(1, threads=5)))
+            updated = parse(tweet_detail(1, threads=2))
+            updated.favorite_count += 1
+            updated.entities.hashtags = []
+            store.write(updated)
+            self.assertEqual(store.get_tweet(1), updated)
+            counts = {
+                table: store.connection.execute(
+                    f"SELECT COUNT(*) FROM {table}"
+                ).fetchone()[0]
+                for table in ("tweets", "threads")
+            }
+        # The replies of the first crawl are kept, only no longer threaded.
+        self.assertEqual(counts, {"tweets": 6, "threads": 2})
+
+    def test_batches(self):
+        with TweetStore(self.path, batch_size=3) as store:
+            with mock.patch.object(store, "flush", wraps=store.flush) as flush:
+                store.write_many(
+                    TwitterUser.from_result(user_result(i)) for i in range(1, 8)
+                )
+                self.assertEqual(flush.call_count, 2)
+            reader = sqlite3.connect(self.path)
+            self.assertEqual(
+                reader.execute("SELECT COUNT(*) FROM users").fetchone()[0], 6
+            )
+            store.flush()
+            self.assertEqual(
+                reader.execute("SELECT COUNT(*) FROM users").fetchone()[0], 7
+            )
+            reader.close()
+            with self.assertRaises(TypeError):
+                store.write("1")
+
+    def test_freshness(self):
+        with TweetStore(self.path, max_age=60) as store:
+            tweet = parse(tweet_detail(1, threads=2))
+            reply = tweet.conversation_threads[0][0]
+            store.write(tweet)
+            self.assertEqual(store.fresh_ids([1, reply.id, 3]), {1})
+            self.assertEqual(store.fresh_tweet(1), tweet)
+            self.assertIsNone(store.fresh_tweet(reply.id))
+            self.assertEqual(store.fresh_ids([1], max_age=-1), set())
+            # Crawled on its own, the reply stays fresh when it is seen as a
+            # reply again.
+            store.write(parse(tweet_detail(reply.id)))
+            store.write(tweet)
+            self.assertEqual(store.fresh_ids([1, reply.id]), {1, reply.id})
+            crawled_at = store.connection.execute(
+                "SELECT crawled_at FROM tweets WHERE id = 1"
+            ).fetchone()[0]
+            with mock.patch("time.time", return_value=crawled_at + 61):
+                self.assertIsNone(store.fresh_tweet(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
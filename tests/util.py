@@ -1,30 +1,71 @@
+import json
 import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List
+from urllib.parse import parse_qs, urlsplit
 
 from playwright.async_api import BrowserContext
 
 
+def cookies() -> List[dict]:
+    return [
+        {
+            "name": "auth_token",
+            "value": os.environ["AUTH_TOKEN"],
+            "domain": ".x.com",
+            "path": "/",
+            "expires": float(os.environ["AUTH_TOKEN_EXPIRES"]),
+            "httpOnly": True,
+            "sameSite": "None",
+            "secure": True,
+        },
+        {
+            "name": "ct0",
+            "value": os.environ["CT0"],
+            "domain": ".x.com",
+            "path": "/",
+            "expires": float(os.environ["CT0_EXPIRES"]),
+            "httpOnly": False,
+            "sameSite": "Lax",
+            "secure": True,
+        },
+    ]
+
+
 async def add_cookies(context: BrowserContext):
-    await context.add_cookies(
-        [
-            {
-                "name": "auth_token",
-                "value": os.environ["AUTH_TOKEN"],
-                "domain": ".x.com",
-                "path": "/",
-                "expires": float(os.environ["AUTH_TOKEN_EXPIRES"]),
-                "httpOnly": True,
-                "sameSite": "None",
-                "secure": True,
-            },
-            {
-                "name": "ct0",
-                "value": os.environ["CT0"],
-                "domain": ".x.com",
-                "path": "/",
-                "expires": float(os.environ["CT0_EXPIRES"]),
-                "httpOnly": False,
-                "sameSite": "Lax",
-                "secure": True,
-            },
-        ]
-    )
+    await context.add_cookies(cookies())  # type: ignore
+
+
+class StubServer:
+    """Serves canned GraphQL payloads from a local thread, standing in for x.com."""
+
+    def __init__(self, respond: Callable[[str, Dict[str, Any]], Any]):
+        def _respond(handler: BaseHTTPRequestHandler):
+            split = urlsplit(handler.path)
+            variables = parse_qs(split.query).get("variables", ["{}"])[0]
+            body = json.dumps(respond(split.path, json.loads(variables))).encode()
+            handler.send_response(200)
+            handler.send_header("content-type", "application/json")
+            handler.end_headers()
+            handler.wfile.write(body)
+
+        handler = type(
+            "Handler",
+            (BaseHTTPRequestHandler,),
+            {"do_GET": _respond, "log_message": lambda *_: None},
+        )
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,99 @@
+import asyncio
+import unittest
+from typing import Dict, List
+
+from payload import tombstone_result, tweet_detail, tweet_result_by_rest_id, unavailable
+
+from tweet_crawler.crawler.counters import COUNTERS, extract_counters
+from tweet_crawler.exception import TweetUnavailable
+from tweet_crawler.model import Tweet
+from tweet_crawler.watch import CounterDelta, TweetWatcher
+
+
+def instructions(content: dict) -> list:
+    return content["data"]["threaded_conversation_with_injections_v2"]["instructions"]
+
+
+class ScriptedWatcher(TweetWatcher):
+    """Polls counters from a function of the tweet id and poll count."""
+
+    calls: Dict[int, int]
+
+    def __init__(self, tweet_ids, counters, **kwargs):
+        super().__init__(None, tweet_ids, concurrency=2, **kwargs)  # type: ignore
+        self.counters = counters
+        self.calls = {}
+
+    async def poll(self, tweet_id: int) -> Dict[str, int]:
+        self.calls[tweet_id] = self.calls.get(tweet_id, 0) + 1
+        await asyncio.sleep(0)
+        return self.counters(tweet_id, self.calls[tweet_id])
+
+
+class WatchCase(unittest.IsolatedAsyncioTestCase):
+    def test_extract_counters(self):
+        content = tweet_detail(1, threads=3)
+        counters = extract_counters(content, 1)
+        tweet = Tweet.from_instructions(instructions(content))
+        self.assertEqual(counters, {name: getattr(tweet, name) for name in COUNTERS})
+        self.assertEqual(extract_counters(tweet_result_by_rest_id(1), 1), counters)
+        self.assertIsInstance(extract_counters(unavailable(), 1), TweetUnavailable)
+        deleted = tweet_detail(1)
+        entry = instructions(deleted)[1]["entries"][0]
+        entry["content"]["itemContent"]["tweet_results"]["result"] = tombstone_result()
+        self.assertIsInstance(extract_counters(deleted, 1), TweetUnavailable)
+
+    def test_update(self):
+        watcher = ScriptedWatcher([1], None, min_interval=1, max_interval=8)
+        tweet = watcher.tweets[1]
+        counters = dict.fromkeys(COUNTERS, 0)
+        self.assertTrue(watcher.update(tweet, counters).initial)
+        for interval in (2, 4, 8, 8):
+            self.assertIsNone(watcher.update(tweet, dict(counters)))
+            self.assertEqual(tweet.interval, interval)
+        delta = watcher.update(tweet, counters | {"favorite_count": 3})
+        self.assertEqual(delta.changes, {"favorite_count": 3})
+        self.assertEqual(tweet.interval, 4)
+        self.assertEqual(
+            delta._replace(time=0).as_dict(), {"id": 1, "t": 0, "favorite_count": 3}
+        )
+        with self.assertRaises(ValueError):
+            ScriptedWatcher([], None, min_interval=2, max_interval=1)
+
+    async def test_run(self):
+        def counters(tweet_id: int, calls: int) -> Dict[str, int]:
+            if tweet_id == 3:
+                raise TweetUnavailable("Suspended")
+            if tweet_id == 4 and calls == 1:
+                raise RuntimeError("Flaky")
+            hot = calls if tweet_id == 1 else 0
+            return dict.fromkeys(COUNTERS, 10) | {"favorite_count": 10 + hot}
+
+        watcher = ScriptedWatcher(
+            [1, 2, 3, 4], counters, min_interval=0.01, max_interval=0.04
+        )
+        deltas: List[CounterDelta] = []
+        async for delta in watcher.run():
+            deltas.append(delta)
+            if sum(d.tweet_id == 1 for d in deltas) == 8:
+                watcher.stop()
+        records = {}
+        for delta in deltas:
+            records.setdefault(delta.tweet_id, []).append(delta)
+        self.assertTrue(all(d[0].initial for d in records.values() if d[0].changes))
+        self.assertEqual(
+            [d.changes for d in records[1][1:]], [{"favorite_count": 1}] * 7
+        )
+        self.assertEqual(len(records[2]), 1)
+        self.assertEqual(records[3][0].unavailable, "Suspended")
+        self.assertNotIn(3, watcher.tweets)
+        self.assertEqual(watcher.calls[3], 1)
+        self.assertEqual(watcher.tweets[4].errors, 1)
+        self.assertEqual(len(records[4]), 1)
+        self.assertEqual(watcher.tweets[1].interval, 0.01)
+        self.assertEqual(watcher.tweets[2].interval, 0.04)
+        self.assertGreater(watcher.calls[1], watcher.calls[2])
+
+
+if __name__ == "__main__":
+    unittest.main()